@@ -1,12 +1,19 @@
 """Admin/telemetry API key auth for protected endpoints."""
+import hmac
 import os
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Header, HTTPException, status
 
 
+@lru_cache(maxsize=1)
 def _get_expected_key() -> Optional[str]:
-    """Expected admin API key from env. Empty string is treated as unset."""
+    """
+    Expected admin API key from env. Empty string is treated as unset.
+
+    Read once per process; call _get_expected_key.cache_clear() after rotating the key.
+    """
     v = os.getenv("ADMIN_API_KEY", "").strip()
     return v or None
 
@@ -35,7 +42,8 @@ def require_admin_key(
     elif authorization and authorization.startswith("Bearer "):
         provided = authorization[7:].strip()
 
-    if not provided or provided != expected:
+    # Constant-time comparison; bytes so non-ASCII input cannot raise TypeError
+    if not provided or not hmac.compare_digest(provided.encode(), expected.encode()):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing or invalid admin API key. Set X-Admin-Key or Authorization: Bearer <key>.",
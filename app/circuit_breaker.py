@@ -4,7 +4,9 @@ Enables: "Can you pause a misbehaving domain/source quickly?"
 """
 import logging
 import time
-from typing import Dict, Any, Optional, Set
+from array import array
+from collections import OrderedDict
+from typing import Collection, Dict, Any, List, Optional, Set
 from threading import Lock
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,13 @@ logger = logging.getLogger(__name__)
 DEFAULT_FAILURE_THRESHOLD = 5
 DEFAULT_WINDOW_SECONDS = 60
 DEFAULT_RECOVERY_SECONDS = 30
+# Max circuits kept per kind (domain / source) before LRU eviction
+DEFAULT_MAX_CIRCUITS = 10_000
+
+
+def _ns_to_seconds(ns: Optional[int]) -> Optional[float]:
+    """Convert a monotonic_ns timestamp to float seconds for status reporting."""
+    return ns / 1_000_000_000 if ns is not None else None
 
 
 class CircuitState:
@@ -21,6 +30,12 @@ class CircuitState:
     OPEN = "open"       # Failing, reject calls
     HALF_OPEN = "half_open"  # Testing recovery
 
+    __slots__ = (
+        "key", "failure_threshold", "window_seconds", "recovery_seconds",
+        "window_ns", "recovery_ns", "state", "_failures", "_head", "_count",
+        "last_failure_at", "opened_at", "_lock",
+    )
+
     def __init__(
         self,
         key: str,
@@ -32,30 +47,60 @@ class CircuitState:
         self.failure_threshold = failure_threshold
         self.window_seconds = window_seconds
         self.recovery_seconds = recovery_seconds
+        # Timestamps are time.monotonic_ns() ints; compare against ns windows
+        self.window_ns = int(window_seconds * 1_000_000_000)
+        self.recovery_ns = int(recovery_seconds * 1_000_000_000)
         self.state = self.CLOSED
-        self.failures: list = []  # timestamps of recent failures
-        self.last_failure_at: Optional[float] = None
-        self.opened_at: Optional[float] = None  # when circuit was opened
+        # Ring buffer of the most recent failure timestamps, packed as int64.
+        # Only the last failure_threshold failures can affect the open decision,
+        # so older ones are overwritten.
+        self._failures = array("q", bytes(8 * max(1, failure_threshold)))
+        self._head = 0  # next slot to write
+        self._count = 0  # valid (in-window) entries ending at _head
+        self.last_failure_at: Optional[int] = None
+        self.opened_at: Optional[int] = None  # when circuit was opened
         self._lock = Lock()
 
+    @property
+    def failures(self) -> List[int]:
+        """Recent failure timestamps (monotonic ns), oldest first."""
+        capacity = len(self._failures)
+        start = self._head - self._count
+        return [self._failures[(start + i) % capacity] for i in range(self._count)]
+
+    def _oldest_failure(self) -> int:
+        return self._failures[(self._head - self._count) % len(self._failures)]
+
+    def _evict_expired(self, now: int) -> None:
+        """Drop failures outside the window (caller holds the lock)."""
+        while self._count and now - self._oldest_failure() >= self.window_ns:
+            self._count -= 1
+
     def record_success(self) -> None:
+        # Healthy path: closed with no failures to age out, nothing to do
+        if self.state == self.CLOSED and not self._count:
+            return
         with self._lock:
             if self.state == self.HALF_OPEN:
                 self.state = self.CLOSED
-                self.failures.clear()
+                self._count = 0
                 logger.info(f"Circuit {self.key}: half_open -> closed (recovery success)")
-            elif self.state == self.CLOSED:
-                # Optionally clear old failures on success
-                now = time.monotonic()
-                self.failures = [t for t in self.failures if now - t < self.window_seconds]
+            elif self.state == self.CLOSED and self._count:
+                # Optionally clear old failures on success (only if the oldest has aged out)
+                now = time.monotonic_ns()
+                if now - self._oldest_failure() >= self.window_ns:
+                    self._evict_expired(now)
 
     def record_failure(self) -> None:
-        now = time.monotonic()
+        now = time.monotonic_ns()
         with self._lock:
             self.last_failure_at = now
-            self.failures.append(now)
-            # Drop failures outside window
-            self.failures = [t for t in self.failures if now - t < self.window_seconds]
+            capacity = len(self._failures)
+            self._failures[self._head] = now
+            self._head = (self._head + 1) % capacity
+            if self._count < capacity:
+                self._count += 1
+            self._evict_expired(now)
 
             if self.state == self.HALF_OPEN:
                 self.state = self.OPEN
@@ -63,22 +108,29 @@ class CircuitState:
                 logger.warning(f"Circuit {self.key}: half_open -> open (recovery failed)")
                 return
 
-            if self.state == self.CLOSED and len(self.failures) >= self.failure_threshold:
+            if self.state == self.CLOSED and self._count >= self.failure_threshold:
                 self.state = self.OPEN
                 self.opened_at = now
                 logger.warning(
                     f"Circuit {self.key}: closed -> open "
-                    f"(failures={len(self.failures)} in {self.window_seconds}s)"
+                    f"(failures={self._count} in {self.window_seconds}s)"
                 )
 
     def allow_request(self) -> bool:
-        """Return True if a request is allowed (circuit closed or half-open)."""
-        now = time.monotonic()
+        """Return True if a request is allowed (circuit closed or half-open).
+
+        The CLOSED check is done without the lock: state is a single attribute
+        read, and a stale value can at worst let one extra request through
+        while another thread is opening the circuit.
+        """
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic_ns()
         with self._lock:
             if self.state == self.CLOSED:
                 return True
             if self.state == self.OPEN:
-                if self.opened_at is not None and (now - self.opened_at) >= self.recovery_seconds:
+                if self.opened_at is not None and (now - self.opened_at) >= self.recovery_ns:
                     self.state = self.HALF_OPEN
                     self.opened_at = None
                     logger.info(f"Circuit {self.key}: open -> half_open (retry)")
@@ -88,48 +140,128 @@ class CircuitState:
             return True
 
     def get_status(self) -> Dict[str, Any]:
-        with self._lock:
-            return {
-                "key": self.key,
-                "state": self.state,
-                "failure_count": len(self.failures),
-                "last_failure_at": self.last_failure_at,
-                "opened_at": self.opened_at,
-            }
+        """Snapshot for telemetry. Lock-free: fields are read individually, so a
+        concurrent transition may yield a slightly torn (but never invalid) view."""
+        return {
+            "key": self.key,
+            "state": self.state,
+            "failure_count": self._count,
+            "last_failure_at": _ns_to_seconds(self.last_failure_at),
+            "opened_at": _ns_to_seconds(self.opened_at),
+        }
 
     def force_open(self) -> None:
         with self._lock:
             self.state = self.OPEN
-            self.opened_at = time.monotonic()
+            self.opened_at = time.monotonic_ns()
             logger.info(f"Circuit {self.key}: forced open")
 
     def force_close(self) -> None:
         with self._lock:
             self.state = self.CLOSED
-            self.failures.clear()
+            self._count = 0
             self.opened_at = None
             logger.info(f"Circuit {self.key}: forced closed")
 
 
 class CircuitBreakerRegistry:
-    """Registry of circuit breakers per domain and per source."""
-    _lock = Lock()
-    _by_domain: Dict[str, CircuitState] = {}
-    _by_source: Dict[str, CircuitState] = {}
+    """Registry of circuit breakers per domain and per source.
+
+    Lookups of existing circuits never block: the per-kind lock is taken to
+    create a circuit the first time a key is seen, and only tried (non-blocking)
+    to refresh LRU order on a hit. Each kind is an LRU bounded by max_circuits
+    so unbounded key churn cannot leak memory.
+    """
+    max_circuits = DEFAULT_MAX_CIRCUITS
+    _domain_lock = Lock()
+    _source_lock = Lock()
+    _by_domain: "OrderedDict[str, CircuitState]" = OrderedDict()
+    _by_source: "OrderedDict[str, CircuitState]" = OrderedDict()
+
+    @classmethod
+    def _touch(cls, circuits: "OrderedDict[str, CircuitState]", lock: Lock, key: str) -> None:
+        """Mark key most recently used, if the lock is free.
+
+        The reorder happens under the lock so it cannot interleave with an
+        insert or eviction; when another thread holds the lock the touch is
+        skipped, accepting a slightly stale LRU order instead of blocking a hit.
+        """
+        if not lock.acquire(blocking=False):
+            return
+        try:
+            if key in circuits:
+                circuits.move_to_end(key)
+        finally:
+            lock.release()
+
+    @classmethod
+    def _evict_lru(cls, circuits: "OrderedDict[str, CircuitState]", keep: Collection[str] = ()) -> None:
+        """Drop least recently used closed circuits over the cap (caller holds the lock).
+
+        Open/half-open circuits are kept so eviction never silently undoes a pause,
+        and keys in keep (circuits being handed to the caller) are never evicted.
+        """
+        checked = 0
+        while len(circuits) > cls.max_circuits and checked < len(circuits):
+            key, circuit = circuits.popitem(last=False)
+            if circuit.state != CircuitState.CLOSED or key in keep:
+                circuits[key] = circuit
+            checked += 1
+
+    @classmethod
+    def _get_or_create(
+        cls,
+        circuits: "OrderedDict[str, CircuitState]",
+        lock: Lock,
+        kind: str,
+        key: str,
+        kwargs: Dict[str, Any],
+    ) -> CircuitState:
+        circuit = circuits.get(key)
+        if circuit is not None:
+            cls._touch(circuits, lock, key)
+            return circuit
+        with lock:
+            circuit = circuits.get(key)
+            if circuit is None:
+                circuit = circuits[key] = CircuitState(f"{kind}:{key}", **kwargs)
+                cls._evict_lru(circuits, keep=(key,))
+            return circuit
+
+    @classmethod
+    def _get_or_create_many(
+        cls,
+        circuits: "OrderedDict[str, CircuitState]",
+        lock: Lock,
+        kind: str,
+        keys: List[str],
+    ) -> Dict[str, CircuitState]:
+        found: Dict[str, Optional[CircuitState]] = {}
+        missing = []
+        for key in keys:
+            circuit = circuits.get(key)
+            if circuit is None:
+                missing.append(key)
+            else:
+                cls._touch(circuits, lock, key)
+            found[key] = circuit
+        if missing:
+            with lock:
+                for key in missing:
+                    circuit = circuits.get(key)
+                    if circuit is None:
+                        circuit = circuits[key] = CircuitState(f"{kind}:{key}")
+                    found[key] = circuit
+                cls._evict_lru(circuits, keep=found)
+        return found
 
     @classmethod
     def get_domain_circuit(cls, domain: str, **kwargs: Any) -> CircuitState:
-        with cls._lock:
-            if domain not in cls._by_domain:
-                cls._by_domain[domain] = CircuitState(f"domain:{domain}", **kwargs)
-            return cls._by_domain[domain]
+        return cls._get_or_create(cls._by_domain, cls._domain_lock, "domain", domain, kwargs)
 
     @classmethod
     def get_source_circuit(cls, source: str, **kwargs: Any) -> CircuitState:
-        with cls._lock:
-            if source not in cls._by_source:
-                cls._by_source[source] = CircuitState(f"source:{source}", **kwargs)
-            return cls._by_source[source]
+        return cls._get_or_create(cls._by_source, cls._source_lock, "source", source, kwargs)
 
     @classmethod
     def allow_domain(cls, domain: str) -> bool:
@@ -139,6 +271,18 @@ class CircuitBreakerRegistry:
     def allow_source(cls, source: str) -> bool:
         return cls.get_source_circuit(source).allow_request()
 
+    @classmethod
+    def allow_domains(cls, domains: List[str]) -> Dict[str, bool]:
+        """Batch allow_domain: creates any missing circuits under one lock acquisition."""
+        circuits = cls._get_or_create_many(cls._by_domain, cls._domain_lock, "domain", domains)
+        return {d: c.allow_request() for d, c in circuits.items()}
+
+    @classmethod
+    def allow_sources(cls, sources: List[str]) -> Dict[str, bool]:
+        """Batch allow_source: creates any missing circuits under one lock acquisition."""
+        circuits = cls._get_or_create_many(cls._by_source, cls._source_lock, "source", sources)
+        return {s: c.allow_request() for s, c in circuits.items()}
+
     @classmethod
     def record_domain_success(cls, domain: str) -> None:
         cls.get_domain_circuit(domain).record_success()
@@ -175,11 +319,15 @@ class CircuitBreakerRegistry:
 
     @classmethod
     def list_status(cls) -> Dict[str, Any]:
-        with cls._lock:
-            return {
-                "domains": {k: v.get_status() for k, v in cls._by_domain.items()},
-                "sources": {k: v.get_status() for k, v in cls._by_source.items()},
-            }
+        # Snapshot under the registry locks, then read each circuit outside them
+        with cls._domain_lock:
+            domains = list(cls._by_domain.items())
+        with cls._source_lock:
+            sources = list(cls._by_source.items())
+        return {
+            "domains": {k: v.get_status() for k, v in domains},
+            "sources": {k: v.get_status() for k, v in sources},
+        }
 
 
 def check_domain_allowed(domain: str) -> bool:
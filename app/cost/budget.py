@@ -4,10 +4,11 @@ Enables: "Can you cap spend per domain/queue/day?"
 """
 import logging
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from datetime import date
+from functools import lru_cache
 from threading import Lock
-from app.cost.tracker import get_cost_tracker
+from app.cost.tracker import cached_today, get_cost_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,43 @@ class BudgetExceededError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def _parse_env_budgets() -> Tuple[Optional[float], Dict[str, float]]:
+    """
+    Parse budget limits from environment variables.
+    
+    Cached so constructing several BudgetManagers does not rescan os.environ;
+    call _parse_env_budgets.cache_clear() after changing the environment.
+    
+    Returns:
+        (global_daily_limit, {domain: limit_usd})
+    """
+    global_daily_limit: Optional[float] = None
+    domain_limits: Dict[str, float] = {}
+    
+    # Global daily limit
+    global_limit = os.getenv("LLM_DAILY_BUDGET_USD")
+    if global_limit:
+        try:
+            global_daily_limit = float(global_limit)
+            logger.info(f"Global daily budget: ${global_daily_limit:.2f}")
+        except ValueError:
+            logger.warning(f"Invalid LLM_DAILY_BUDGET_USD: {global_limit}")
+    
+    # Domain-specific limits (format: DOMAIN_BUDGET_<DOMAIN>=<amount>)
+    # Example: DOMAIN_BUDGET_Algebra=1.00
+    for key, value in os.environ.items():
+        if key.startswith("DOMAIN_BUDGET_"):
+            domain = key.replace("DOMAIN_BUDGET_", "").replace("_", " ")
+            try:
+                domain_limits[domain] = float(value)
+                logger.info(f"Domain budget for '{domain}': ${domain_limits[domain]:.2f}")
+            except ValueError:
+                logger.warning(f"Invalid budget for {key}: {value}")
+    
+    return global_daily_limit, domain_limits
+
+
 class BudgetManager:
     """
     Manages budget caps per domain, queue, and day.
@@ -33,32 +71,17 @@ class BudgetManager:
         self._queue_limits: Dict[str, float] = {}
         # Global daily limit
         self._global_daily_limit: Optional[float] = None
+        # Cached limits section of get_status(); None when a set_* call invalidated it
+        self._limits_snapshot: Optional[Dict[str, Any]] = None
         
         # Load from environment variables
         self._load_from_env()
     
     def _load_from_env(self):
-        """Load budget limits from environment variables."""
-        # Global daily limit
-        global_limit = os.getenv("LLM_DAILY_BUDGET_USD")
-        if global_limit:
-            try:
-                self._global_daily_limit = float(global_limit)
-                logger.info(f"Global daily budget: ${self._global_daily_limit:.2f}")
-            except ValueError:
-                logger.warning(f"Invalid LLM_DAILY_BUDGET_USD: {global_limit}")
-        
-        # Domain-specific limits (format: DOMAIN_BUDGET_<DOMAIN>=<amount>)
-        # Example: DOMAIN_BUDGET_Algebra=1.00
-        for key, value in os.environ.items():
-            if key.startswith("DOMAIN_BUDGET_"):
-                domain = key.replace("DOMAIN_BUDGET_", "").replace("_", " ")
-                try:
-                    limit = float(value)
-                    self.set_domain_limit(domain, limit)
-                    logger.info(f"Domain budget for '{domain}': ${limit:.2f}")
-                except ValueError:
-                    logger.warning(f"Invalid budget for {key}: {value}")
+        """Load budget limits from environment variables (parsed once per process)."""
+        global_limit, domain_limits = _parse_env_budgets()
+        self._global_daily_limit = global_limit
+        self._domain_limits.update(domain_limits)
     
     def set_daily_limit(
         self,
@@ -77,11 +100,12 @@ class BudgetManager:
             target_date: Date to apply limit (None = today)
         """
         if target_date is None:
-            target_date = date.today()
+            target_date = cached_today()
         
         with self._lock:
             key = (target_date, domain or "global", queue or "default")
             self._daily_limits[key] = limit_usd
+            self._limits_snapshot = None
             logger.info(
                 f"Set daily limit: ${limit_usd:.2f} for "
                 f"date={target_date}, domain={domain or 'all'}, queue={queue or 'all'}"
@@ -91,12 +115,14 @@ class BudgetManager:
         """Set a budget limit for a domain (all time)."""
         with self._lock:
             self._domain_limits[domain] = limit_usd
+            self._limits_snapshot = None
             logger.info(f"Set domain limit for '{domain}': ${limit_usd:.2f}")
     
     def set_queue_limit(self, queue: str, limit_usd: float):
         """Set a budget limit for a queue (all time)."""
         with self._lock:
             self._queue_limits[queue] = limit_usd
+            self._limits_snapshot = None
             logger.info(f"Set queue limit for '{queue}': ${limit_usd:.2f}")
     
     def set_global_daily_limit(self, limit_usd: float):
@@ -119,49 +145,50 @@ class BudgetManager:
             reason=error message if not allowed
         """
         tracker = get_cost_tracker()
-        today = date.today()
+        today = cached_today()
         
+        # Snapshot limits under the lock; query the tracker outside it
         with self._lock:
-            # Check global daily limit
-            if self._global_daily_limit is not None:
-                global_daily_cost = tracker.get_daily_cost(target_date=today)
-                if global_daily_cost + additional_cost > self._global_daily_limit:
-                    return (
-                        False,
-                        f"Global daily budget exceeded: ${global_daily_cost:.4f} + ${additional_cost:.4f} > ${self._global_daily_limit:.2f}"
-                    )
-            
-            # Check domain-specific daily limit
-            if domain:
-                key = (today, domain, queue or "default")
-                if key in self._daily_limits:
-                    limit = self._daily_limits[key]
-                    current_cost = tracker.get_daily_cost(target_date=today, domain=domain, queue=queue)
-                    if current_cost + additional_cost > limit:
-                        return (
-                            False,
-                            f"Daily budget for domain '{domain}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${limit:.2f}"
-                        )
-            
-            # Check domain limit (all time)
-            if domain and domain in self._domain_limits:
-                limit = self._domain_limits[domain]
-                current_cost = tracker.get_domain_cost(domain)
-                if current_cost + additional_cost > limit:
-                    return (
-                        False,
-                        f"Domain budget for '{domain}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${limit:.2f}"
-                    )
-            
-            # Check queue limit (all time)
-            if queue and queue in self._queue_limits:
-                limit = self._queue_limits[queue]
-                current_cost = tracker.get_queue_cost(queue)
-                if current_cost + additional_cost > limit:
-                    return (
-                        False,
-                        f"Queue budget for '{queue}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${limit:.2f}"
-                    )
+            global_limit = self._global_daily_limit
+            daily_limit = self._daily_limits.get((today, domain, queue or "default")) if domain else None
+            domain_limit = self._domain_limits.get(domain) if domain else None
+            queue_limit = self._queue_limits.get(queue) if queue else None
+        
+        # Check global daily limit
+        if global_limit is not None:
+            global_daily_cost = tracker.get_daily_cost(target_date=today)
+            if global_daily_cost + additional_cost > global_limit:
+                return (
+                    False,
+                    f"Global daily budget exceeded: ${global_daily_cost:.4f} + ${additional_cost:.4f} > ${global_limit:.2f}"
+                )
+        
+        # Check domain-specific daily limit
+        if daily_limit is not None:
+            current_cost = tracker.get_daily_cost(target_date=today, domain=domain, queue=queue)
+            if current_cost + additional_cost > daily_limit:
+                return (
+                    False,
+                    f"Daily budget for domain '{domain}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${daily_limit:.2f}"
+                )
+        
+        # Check domain limit (all time)
+        if domain_limit is not None:
+            current_cost = tracker.get_domain_cost(domain)
+            if current_cost + additional_cost > domain_limit:
+                return (
+                    False,
+                    f"Domain budget for '{domain}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${domain_limit:.2f}"
+                )
+        
+        # Check queue limit (all time)
+        if queue_limit is not None:
+            current_cost = tracker.get_queue_cost(queue)
+            if current_cost + additional_cost > queue_limit:
+                return (
+                    False,
+                    f"Queue budget for '{queue}' exceeded: ${current_cost:.4f} + ${additional_cost:.4f} > ${queue_limit:.2f}"
+                )
         
         return (True, None)
     
@@ -195,53 +222,42 @@ class BudgetManager:
             Remaining budget in USD, or None if no limit set
         """
         if target_date is None:
-            target_date = date.today()
+            target_date = cached_today()
         
         tracker = get_cost_tracker()
         
         with self._lock:
-            # Check global daily limit
-            if self._global_daily_limit is not None:
-                current = tracker.get_daily_cost(target_date=target_date)
-                return max(0.0, self._global_daily_limit - current)
-            
-            # Check domain-specific daily limit
-            if domain:
-                key = (target_date, domain, queue or "default")
-                if key in self._daily_limits:
-                    limit = self._daily_limits[key]
-                    current = tracker.get_daily_cost(target_date=target_date, domain=domain, queue=queue)
-                    return max(0.0, limit - current)
-            
-            # Check domain limit (all time)
-            if domain and domain in self._domain_limits:
-                limit = self._domain_limits[domain]
-                current = tracker.get_domain_cost(domain)
-                return max(0.0, limit - current)
-            
-            # Check queue limit (all time)
-            if queue and queue in self._queue_limits:
-                limit = self._queue_limits[queue]
-                current = tracker.get_queue_cost(queue)
-                return max(0.0, limit - current)
+            global_limit = self._global_daily_limit
+            daily_limit = self._daily_limits.get((target_date, domain, queue or "default")) if domain else None
+            domain_limit = self._domain_limits.get(domain) if domain else None
+            queue_limit = self._queue_limits.get(queue) if queue else None
+        
+        # Check global daily limit
+        if global_limit is not None:
+            current = tracker.get_daily_cost(target_date=target_date)
+            return max(0.0, global_limit - current)
+        
+        # Check domain-specific daily limit
+        if daily_limit is not None:
+            current = tracker.get_daily_cost(target_date=target_date, domain=domain, queue=queue)
+            return max(0.0, daily_limit - current)
+        
+        # Check domain limit (all time)
+        if domain_limit is not None:
+            current = tracker.get_domain_cost(domain)
+            return max(0.0, domain_limit - current)
+        
+        # Check queue limit (all time)
+        if queue_limit is not None:
+            current = tracker.get_queue_cost(queue)
+            return max(0.0, queue_limit - current)
         
         return None  # No limit set
     
-    def get_status(self) -> Dict[str, Any]:
-        """Get budget status summary."""
-        tracker = get_cost_tracker()
-        today = date.today()
-        
-        with self._lock:
-            global_daily_cost = tracker.get_daily_cost(target_date=today)
-            
-            status = {
-                "global_daily_limit": self._global_daily_limit,
-                "global_daily_spent": global_daily_cost,
-                "global_daily_remaining": (
-                    max(0.0, self._global_daily_limit - global_daily_cost)
-                    if self._global_daily_limit else None
-                ),
+    def _get_limits_snapshot(self) -> Dict[str, Any]:
+        """Return cached copies of the configured limits (caller holds the lock)."""
+        if self._limits_snapshot is None:
+            self._limits_snapshot = {
                 "domain_limits": dict(self._domain_limits),
                 "queue_limits": dict(self._queue_limits),
                 "daily_limits": {
@@ -249,8 +265,26 @@ class BudgetManager:
                     for (d, dom, q), limit in self._daily_limits.items()
                 },
             }
+        return self._limits_snapshot
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get budget status summary. Limit dicts are shared snapshots; do not mutate."""
+        tracker = get_cost_tracker()
+        global_daily_cost = tracker.get_daily_cost(target_date=cached_today())
+        
+        with self._lock:
+            global_daily_limit = self._global_daily_limit
+            limits = self._get_limits_snapshot()
         
-        return status
+        return {
+            "global_daily_limit": global_daily_limit,
+            "global_daily_spent": global_daily_cost,
+            "global_daily_remaining": (
+                max(0.0, global_daily_limit - global_daily_cost)
+                if global_daily_limit else None
+            ),
+            **limits,
+        }
 
 
 # Global budget manager instance
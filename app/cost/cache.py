@@ -1,30 +1,71 @@
 """
 Caching and memoization for cost reduction.
-Caches: fetched docs, embeddings, source scores, extraction results.
+Caches: fetched docs, embeddings, source scores, extraction results, generated code changes.
 """
 import logging
-import hashlib
+import inspect
 import json
-from typing import Dict, Any, Optional, Callable
+import time
+from collections import defaultdict
+from enum import IntEnum
+from itertools import islice
+from typing import Dict, Any, Optional, Callable, Union
 from functools import wraps
-from datetime import datetime, timedelta
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
+# Entries checked for expiry on each set() (oldest first, Redis-style active expiry)
+EXPIRY_SWEEP_SAMPLE = 8
+
+
+class CacheType(IntEnum):
+    """Known cache types. Ints hash to themselves, keeping partition lookups cheap."""
+    FETCHED_DOC = 0
+    CLEANED_TEXT = 1
+    EMBEDDING = 2
+    SOURCE_SCORE = 3
+    EXTRACTION_RESULT = 4
+    CODE_CHANGE = 5
+    
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Default TTLs (seconds), indexed by CacheType
+_DEFAULT_TTLS = [
+    86400,  # fetched_doc: 24 hours
+    86400,  # cleaned_text
+    604800,  # embedding: 7 days
+    3600,  # source_score: 1 hour
+    86400,  # extraction_result: 24 hours
+    86400,  # code_change
+]
+# TTL for cache types not in CacheType
+_FALLBACK_TTL = 3600
+
+_CACHE_TYPE_BY_NAME: Dict[str, CacheType] = {str(t): t for t in CacheType}
+
+
+def _resolve_cache_type(cache_type: Union[CacheType, str]) -> Union[CacheType, str]:
+    """Map legacy string names (e.g. "fetched_doc") to CacheType; other strings pass through."""
+    return _CACHE_TYPE_BY_NAME.get(cache_type, cache_type)
+
 
 class CacheEntry:
     """A single cache entry with TTL."""
     
+    __slots__ = ("value", "ttl_seconds", "expires_at")
+    
     def __init__(self, value: Any, ttl_seconds: int = 3600):
         self.value = value
-        self.created_at = datetime.utcnow()
         self.ttl_seconds = ttl_seconds
+        # Absolute deadline on the monotonic clock (immune to wall-clock jumps)
+        self.expires_at = time.monotonic() + ttl_seconds
     
     def is_expired(self) -> bool:
         """Check if entry is expired."""
-        age = (datetime.utcnow() - self.created_at).total_seconds()
-        return age > self.ttl_seconds
+        return time.monotonic() > self.expires_at
 
 
 class CostCache:
@@ -35,34 +76,38 @@ class CostCache:
     
     def __init__(self):
         self._lock = Lock()
-        # key -> CacheEntry
-        self._cache: Dict[str, CacheEntry] = {}
-        # Default TTLs (seconds)
-        self._default_ttls = {
-            "fetched_doc": 86400,  # 24 hours
-            "cleaned_text": 86400,
-            "embedding": 604800,  # 7 days
-            "source_score": 3600,  # 1 hour
-            "extraction_result": 86400,  # 24 hours
-        }
+        # cache_type -> key -> CacheEntry (partitioned so invalidate is O(1) per type)
+        self._cache: Dict[Union[CacheType, str], Dict[tuple, CacheEntry]] = defaultdict(dict)
+        # Running counts so get_stats does not scan the cache
+        self._size = 0
+        self._expired_evictions = 0
     
-    def _make_key(self, cache_type: str, *args, **kwargs) -> str:
-        """Generate cache key from type and arguments."""
-        # Hash args and kwargs
-        key_parts = [cache_type]
-        if args:
-            key_parts.append(str(args))
-        if kwargs:
-            # Sort kwargs for consistent hashing
-            sorted_kwargs = json.dumps(kwargs, sort_keys=True)
-            key_parts.append(sorted_kwargs)
+    def _make_key(self, *args, **kwargs) -> tuple:
+        """Generate cache key (within a cache_type partition) from arguments.
         
-        key_str = "|".join(key_parts)
-        return hashlib.sha256(key_str.encode()).hexdigest()
+        The key is a plain tuple so dict hashing does the work; arguments that
+        are not hashable (dicts, lists) fall back to a JSON string.
+        """
+        if not kwargs:
+            kwargs_key = ()
+        elif len(kwargs) == 1:
+            # Nothing to order; skip the sort
+            kwargs_key = tuple(kwargs.items())
+        else:
+            kwargs_key = tuple(sorted(kwargs.items()))
+        key = (args, kwargs_key)
+        try:
+            hash(key)
+        except TypeError:
+            key = (
+                json.dumps(args, sort_keys=True, default=str),
+                json.dumps(kwargs, sort_keys=True, default=str),
+            )
+        return key
     
     def get(
         self,
-        cache_type: str,
+        cache_type: Union[CacheType, str],
         *args,
         **kwargs,
     ) -> Optional[Any]:
@@ -70,29 +115,33 @@ class CostCache:
         Get cached value.
         
         Args:
-            cache_type: Type of cache (e.g., "fetched_doc", "extraction_result")
+            cache_type: Type of cache (CacheType, or legacy name e.g. "fetched_doc")
             *args, **kwargs: Arguments used to generate cache key
         
         Returns:
             Cached value or None if not found/expired
         """
-        key = self._make_key(cache_type, *args, **kwargs)
+        cache_type = _resolve_cache_type(cache_type)
+        key = self._make_key(*args, **kwargs)
         
         with self._lock:
-            entry = self._cache.get(key)
+            bucket = self._cache.get(cache_type)
+            entry = bucket.get(key) if bucket else None
             if not entry:
                 return None
             
             if entry.is_expired():
-                del self._cache[key]
+                del bucket[key]
+                self._size -= 1
+                self._expired_evictions += 1
                 return None
             
-            logger.debug(f"Cache hit: {cache_type} (key: {key[:8]}...)")
+            logger.debug(f"Cache hit: {cache_type}")
             return entry.value
     
     def set(
         self,
-        cache_type: str,
+        cache_type: Union[CacheType, str],
         value: Any,
         ttl_seconds: Optional[int] = None,
         *args,
@@ -107,40 +156,63 @@ class CostCache:
             ttl_seconds: TTL in seconds (None = use default for cache_type)
             *args, **kwargs: Arguments used to generate cache key
         """
+        cache_type = _resolve_cache_type(cache_type)
         if ttl_seconds is None:
-            ttl_seconds = self._default_ttls.get(cache_type, 3600)
+            ttl_seconds = (
+                _DEFAULT_TTLS[cache_type] if isinstance(cache_type, CacheType) else _FALLBACK_TTL
+            )
         
-        key = self._make_key(cache_type, *args, **kwargs)
+        key = self._make_key(*args, **kwargs)
         
         with self._lock:
-            self._cache[key] = CacheEntry(value, ttl_seconds=ttl_seconds)
-            logger.debug(f"Cached: {cache_type} (key: {key[:8]}..., ttl: {ttl_seconds}s)")
+            bucket = self._cache[cache_type]
+            if key not in bucket:
+                self._size += 1
+            bucket[key] = CacheEntry(value, ttl_seconds=ttl_seconds)
+            self._sweep_expired(bucket)
+            logger.debug(f"Cached: {cache_type} (ttl: {ttl_seconds}s)")
     
-    def invalidate(self, cache_type: Optional[str] = None) -> None:
+    def invalidate(self, cache_type: Optional[Union[CacheType, str]] = None) -> None:
         """Invalidate cache entries (all or by type)."""
         with self._lock:
-            if cache_type:
-                # Remove entries matching cache_type prefix
-                keys_to_remove = [
-                    k for k in self._cache.keys()
-                    if k.startswith(self._make_key(cache_type, "").rsplit("|", 1)[0])
-                ]
-                for k in keys_to_remove:
-                    del self._cache[k]
-                logger.info(f"Invalidated {len(keys_to_remove)} entries for {cache_type}")
+            if cache_type is not None:
+                cache_type = _resolve_cache_type(cache_type)
+                removed = self._cache.pop(cache_type, None)
+                if removed:
+                    self._size -= len(removed)
+                logger.info(f"Invalidated {len(removed) if removed else 0} entries for {cache_type}")
             else:
                 self._cache.clear()
+                self._size = 0
                 logger.info("Cache cleared")
     
+    def _sweep_expired(self, bucket: Dict[tuple, CacheEntry]) -> None:
+        """Evict expired entries among the oldest few in a bucket (caller holds the lock).
+        
+        Entries in a bucket share a TTL unless overridden, so insertion order is
+        close to expiry order and checking the head keeps memory bounded without
+        a background thread.
+        """
+        expired = [
+            k for k, e in islice(bucket.items(), EXPIRY_SWEEP_SAMPLE) if e.is_expired()
+        ]
+        for k in expired:
+            del bucket[k]
+        self._size -= len(expired)
+        self._expired_evictions += len(expired)
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics.
+        
+        Counts are maintained incrementally; expired entries are evicted lazily
+        (on access or by the sweep in set), so active_entries may briefly
+        include entries past their TTL.
+        """
         with self._lock:
-            total = len(self._cache)
-            expired = sum(1 for e in self._cache.values() if e.is_expired())
             return {
-                "total_entries": total,
-                "expired_entries": expired,
-                "active_entries": total - expired,
+                "total_entries": self._size,
+                "active_entries": self._size,
+                "expired_evictions": self._expired_evictions,
             }
 
 
@@ -153,8 +225,17 @@ def get_cache() -> CostCache:
     return _cache
 
 
+def _split_cache_key(cache_key: Any) -> tuple:
+    """Turn a key_func result into (args, kwargs) for CostCache.get/set."""
+    if isinstance(cache_key, dict):
+        return (), cache_key
+    if isinstance(cache_key, tuple):
+        return cache_key, {}
+    return (cache_key,), {}
+
+
 def cached(
-    cache_type: str,
+    cache_type: Union[CacheType, str],
     ttl_seconds: Optional[int] = None,
     key_func: Optional[Callable] = None,
 ):
@@ -164,62 +245,60 @@ def cached(
     Args:
         cache_type: Type of cache
         ttl_seconds: TTL in seconds
-        key_func: Optional function to generate cache key from args/kwargs
+        key_func: Optional function to generate cache key from args/kwargs;
+            a tuple is used as positional key args, a dict as keyword key args,
+            anything else as a single key arg
+    
+    The wrapper is specialized once at decoration time (sync/async, with or
+    without key_func) so calls do not re-check those flags.
     """
+    cache_type = _resolve_cache_type(cache_type)
+    
     def decorator(func):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            # Generate cache key
+        _get = _cache.get
+        _set = _cache.set
+        
+        if inspect.iscoroutinefunction(func):
             if key_func:
-                cache_key = key_func(*args, **kwargs)
-                cache_args = cache_key[0] if isinstance(cache_key, tuple) else ()
-                cache_kwargs = cache_key[1] if isinstance(cache_key, tuple) and len(cache_key) > 1 else cache_key if isinstance(cache_key, dict) else {}
+                @wraps(func)
+                async def wrapper(*args, **kwargs):
+                    cache_args, cache_kwargs = _split_cache_key(key_func(*args, **kwargs))
+                    cached_value = _get(cache_type, *cache_args, **cache_kwargs)
+                    if cached_value is not None:
+                        return cached_value
+                    result = await func(*args, **kwargs)
+                    _set(cache_type, result, ttl_seconds, *cache_args, **cache_kwargs)
+                    return result
             else:
-                cache_args = args
-                cache_kwargs = kwargs
-            
-            # Check cache
-            cached_value = _cache.get(cache_type, *cache_args, **cache_kwargs)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function
-            result = await func(*args, **kwargs)
-            
-            # Cache result
-            _cache.set(cache_type, result, ttl_seconds=ttl_seconds, *cache_args, **cache_kwargs)
-            
-            return result
-        
-        @wraps(func)
-        def sync_wrapper(*args, **kwargs):
-            # Generate cache key
+                @wraps(func)
+                async def wrapper(*args, **kwargs):
+                    cached_value = _get(cache_type, *args, **kwargs)
+                    if cached_value is not None:
+                        return cached_value
+                    result = await func(*args, **kwargs)
+                    _set(cache_type, result, ttl_seconds, *args, **kwargs)
+                    return result
+        else:
             if key_func:
-                cache_key = key_func(*args, **kwargs)
-                cache_args = cache_key[0] if isinstance(cache_key, tuple) else ()
-                cache_kwargs = cache_key[1] if isinstance(cache_key, tuple) and len(cache_key) > 1 else cache_key if isinstance(cache_key, dict) else {}
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    cache_args, cache_kwargs = _split_cache_key(key_func(*args, **kwargs))
+                    cached_value = _get(cache_type, *cache_args, **cache_kwargs)
+                    if cached_value is not None:
+                        return cached_value
+                    result = func(*args, **kwargs)
+                    _set(cache_type, result, ttl_seconds, *cache_args, **cache_kwargs)
+                    return result
             else:
-                cache_args = args
-                cache_kwargs = kwargs
-            
-            # Check cache
-            cached_value = _cache.get(cache_type, *cache_args, **cache_kwargs)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function
-            result = func(*args, **kwargs)
-            
-            # Cache result
-            _cache.set(cache_type, result, ttl_seconds=ttl_seconds, *cache_args, **cache_kwargs)
-            
-            return result
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    cached_value = _get(cache_type, *args, **kwargs)
+                    if cached_value is not None:
+                        return cached_value
+                    result = func(*args, **kwargs)
+                    _set(cache_type, result, ttl_seconds, *args, **kwargs)
+                    return result
         
-        # Return appropriate wrapper
-        import inspect
-        if inspect.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return wrapper
     
     return decorator
@@ -2,32 +2,95 @@
 Cheap verification before expensive reasoning.
 Run regex/NER/statistical extraction first, only send uncertain cases to LLMs.
 """
+import heapq
 import logging
+import os
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import Executor
+from functools import lru_cache
+from itertools import compress
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# statistical_extraction ignores words of this length or shorter
+_MIN_WORD_LENGTH = 3
+
+# All NER entity classes in one alternation so simple_ner scans the text once.
+# Alternation is left-biased: URLs and emails come first so their digits and
+# capitalized parts are not also reported as numbers/proper nouns, and dates
+# come before bare numbers.
+_NER_RE = re.compile(
+    r'(?P<url>https?://\S+)'
+    r'|(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<date>\d{4}-\d{2}-\d{2}'  # YYYY-MM-DD
+    r'|\d{1,2}/\d{1,2}/\d{4}'  # MM/DD/YYYY
+    r'|\d{1,2}-\d{1,2}-\d{4})'  # MM-DD-YYYY
+    # Proper nouns: consecutive capitalized words
+    r'|(?P<proper>\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b)'
+    r'|(?P<num>\d+\.?\d*)'
+)
+_NER_BUCKETS = {
+    "url": "urls",
+    "email": "emails",
+    "date": "dates",
+    "proper": "proper_nouns",
+    "num": "numbers",
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int) -> re.Pattern:
+    """Compile a caller-supplied pattern once per (pattern, flags)."""
+    return re.compile(pattern, flags)
+
+
+def compile_patterns(
+    patterns: Dict[str, Union[str, re.Pattern]],
+) -> List[Tuple[str, re.Pattern]]:
+    """
+    Compile extraction patterns once for reuse across many texts.
+    
+    String patterns are compiled case-insensitively; compiled patterns are
+    kept as-is. Callers extracting from many texts (chunks, batch ingestion)
+    should hoist this out of the loop and call extract_with_compiled.
+    """
+    return [
+        (entity_type, _compile_pattern(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern)
+        for entity_type, pattern in patterns.items()
+    ]
+
+
+def extract_with_compiled(
+    text: str,
+    compiled: List[Tuple[str, re.Pattern]],
+) -> Dict[str, List[str]]:
+    """
+    Extract entities using patterns from compile_patterns.
+    
+    Returns:
+        Dict of {entity_type: [matches]}
+    """
+    return {entity_type: pattern.findall(text) for entity_type, pattern in compiled}
+
 
 def extract_with_regex(
     text: str,
-    patterns: Dict[str, str],
+    patterns: Dict[str, Union[str, re.Pattern]],
 ) -> Dict[str, List[str]]:
     """
     Extract entities using regex patterns.
     
     Args:
         text: Text to extract from
-        patterns: Dict of {entity_type: regex_pattern}
+        patterns: Dict of {entity_type: regex_pattern}; string patterns are
+            compiled case-insensitively and cached, compiled patterns are used as-is
     
     Returns:
         Dict of {entity_type: [matches]}
     """
-    results = {}
-    for entity_type, pattern in patterns.items():
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        results[entity_type] = matches
-    return results
+    return extract_with_compiled(text, compile_patterns(patterns))
 
 
 def simple_ner(text: str) -> Dict[str, List[str]]:
@@ -40,41 +103,40 @@ def simple_ner(text: str) -> Dict[str, List[str]]:
     - URLs
     - Email addresses
     - Capitalized phrases (potential proper nouns)
+    
+    Each span of text is assigned to a single entity type (e.g. the digits in
+    a date or URL are not also counted as numbers).
     """
-    results = {
+    results: Dict[str, List[str]] = {
         "dates": [],
         "numbers": [],
         "urls": [],
         "emails": [],
         "proper_nouns": [],
     }
-    
-    # Dates
-    date_patterns = [
-        r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-        r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-        r'\d{1,2}-\d{1,2}-\d{4}',  # MM-DD-YYYY
-    ]
-    for pattern in date_patterns:
-        results["dates"].extend(re.findall(pattern, text))
-    
-    # Numbers
-    results["numbers"] = re.findall(r'\d+\.?\d*', text)
-    
-    # URLs
-    results["urls"] = re.findall(r'https?://[^\s]+', text)
-    
-    # Emails
-    results["emails"] = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    
-    # Proper nouns (capitalized words, 2+ chars, not at start of sentence)
-    # Simple heuristic: consecutive capitalized words
-    proper_noun_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b'
-    results["proper_nouns"] = re.findall(proper_noun_pattern, text)
-    
+    # Bind each bucket's append once so the per-match work is one dict lookup
+    append = {group: results[key].append for group, key in _NER_BUCKETS.items()}
+    for match in _NER_RE.finditer(text):
+        append[match.lastgroup](match.group())
     return results
 
 
+def simple_ner_batch(
+    texts: Iterable[str],
+    executor: Optional[Executor] = None,
+) -> List[Dict[str, List[str]]]:
+    """
+    simple_ner over many texts (e.g. the output of chunk_text).
+    
+    CPython's re holds the GIL while matching, so a thread pool cannot run
+    these scans in parallel; pass a ProcessPoolExecutor to spread large
+    batches across cores. Without an executor the texts are scanned in-process.
+    """
+    if executor is None:
+        return [simple_ner(text) for text in texts]
+    return list(executor.map(simple_ner, texts))
+
+
 def statistical_extraction(
     text: str,
     min_frequency: int = 2,
@@ -91,44 +153,26 @@ def statistical_extraction(
     """
     words = text.lower().split()
     
-    # Word frequency
-    word_freq: Dict[str, int] = {}
-    for word in words:
-        # Filter out common stop words
-        if len(word) > 3:  # Ignore very short words
-            word_freq[word] = word_freq.get(word, 0) + 1
+    # Word frequency, ignoring very short words. The length filter is built from
+    # C-level iterators (map/compress) so no Python bytecode runs per token.
+    word_freq = Counter(compress(words, map(_MIN_WORD_LENGTH.__lt__, map(len, words))))
     
-    # Filter by frequency
-    frequent_words = {
+    # Top 20 by frequency (heap-based), filtered by minimum frequency
+    frequent_terms = {
         word: freq
-        for word, freq in word_freq.items()
+        for word, freq in word_freq.most_common(20)
         if freq >= min_frequency
     }
     
-    # Sort by frequency
-    sorted_words = sorted(frequent_words.items(), key=lambda x: x[1], reverse=True)
-    
     return {
-        "frequent_terms": dict(sorted_words[:20]),  # Top 20
+        "frequent_terms": frequent_terms,
         "total_words": len(words),
         "unique_words": len(word_freq),
     }
 
 
-def should_use_llm(
-    text: str,
-    confidence_threshold: float = 0.7,
-) -> Tuple[bool, float, Dict[str, Any]]:
-    """
-    Decide if LLM extraction is needed based on cheap verification.
-    
-    Returns:
-        (use_llm, confidence, extraction_results)
-        - use_llm: True if LLM needed, False if cheap extraction sufficient
-        - confidence: Confidence in cheap extraction (0.0-1.0)
-        - extraction_results: Results from cheap extraction
-    """
-    # Run cheap extraction
+def _cheap_extraction(text: str) -> Tuple[float, Dict[str, Any]]:
+    """Run NER + statistics and score confidence (independent of the threshold)."""
     ner_results = simple_ner(text)
     stats = statistical_extraction(text)
     
@@ -140,18 +184,54 @@ def should_use_llm(
     # Simple confidence heuristic
     confidence = min(1.0, (entity_count * 0.1) + (frequent_term_count * 0.05))
     
-    # Use LLM if confidence is low or text is very short/long
-    use_llm = (
-        confidence < confidence_threshold or
-        len(text) < 50 or  # Too short, might need context
-        len(text) > 10000  # Too long, needs chunking/LLM
-    )
-    
     extraction_results = {
         "ner": ner_results,
         "statistics": stats,
         "confidence": confidence,
     }
+    return confidence, extraction_results
+
+
+# Retries/replays re-route the same text; memoize by text (str hashes are cached
+# on the object). Cached results are shared between callers: treat as read-only.
+_cheap_extraction_cached = lru_cache(
+    maxsize=int(os.getenv("CHEAP_VERIFY_CACHE", "4096"))
+)(_cheap_extraction)
+
+# Below this length recomputing is cheaper than holding a cache slot
+_CACHE_MIN_TEXT_LENGTH = 256
+
+
+def should_use_llm(
+    text: str,
+    confidence_threshold: float = 0.7,
+) -> Tuple[bool, float, Dict[str, Any]]:
+    """
+    Decide if LLM extraction is needed based on cheap verification.
+    
+    Returns:
+        (use_llm, confidence, extraction_results)
+        - use_llm: True if LLM needed, False if cheap extraction sufficient
+        - confidence: Confidence in cheap extraction (0.0-1.0)
+        - extraction_results: Results from cheap extraction (may be shared; do not mutate).
+          Texts under 50 or over 10000 chars always use the LLM and get empty
+          results with "skipped": True.
+    """
+    text_len = len(text)
+    # Too short (might need context) or too long (needs chunking/LLM): the LLM
+    # is used regardless, so skip the cheap extraction entirely
+    if text_len < 50 or text_len > 10000:
+        logger.debug(f"LLM extraction needed (text length: {text_len})")
+        return (True, 0.0, {"ner": {}, "statistics": {}, "confidence": 0.0, "skipped": True})
+    
+    # Run cheap extraction
+    if text_len >= _CACHE_MIN_TEXT_LENGTH:
+        confidence, extraction_results = _cheap_extraction_cached(text)
+    else:
+        confidence, extraction_results = _cheap_extraction(text)
+    
+    # Use LLM if confidence is low
+    use_llm = confidence < confidence_threshold
     
     if not use_llm:
         logger.debug(f"Cheap extraction sufficient (confidence: {confidence:.2f})")
@@ -202,8 +282,6 @@ def filter_high_impact_candidates(
         
         scored.append((score, candidate))
     
-    # Sort by score (descending)
-    scored.sort(reverse=True)
-    
-    # Return top-k
-    return [candidate for _, candidate in scored[:max_candidates]]
+    # Top-k by score (O(n log k)); keyed on score only so ties never compare dicts
+    top = heapq.nlargest(max_candidates, scored, key=lambda item: item[0])
+    return [candidate for _, candidate in top]
@@ -2,8 +2,11 @@
 Context compression: chunk documents, retrieve relevant chunks, domain briefs.
 Reduces token usage by only sending relevant context to LLMs.
 """
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from app.cost.cache import get_cache
 
@@ -14,6 +17,39 @@ DEFAULT_CHUNK_SIZE = 2000
 DEFAULT_CHUNK_OVERLAP = 200
 
 
+def chunk_spans(
+    text: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_CHUNK_OVERLAP,
+) -> List[Tuple[int, int]]:
+    """
+    Compute (start, end) offsets of overlapping chunks without copying text.
+    
+    A chunk is only started if it extends past the previous chunk's overlap,
+    so no chunk lies entirely inside its predecessor.
+    
+    Args:
+        text: Text to chunk
+        chunk_size: Size of each chunk (characters)
+        overlap: Overlap between chunks (characters)
+    
+    Returns:
+        List of (start, end) offsets into text
+    """
+    text_len = len(text)
+    if text_len <= chunk_size:
+        return [(0, text_len)]
+    
+    step = chunk_size - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than chunk_size")
+    
+    return [
+        (start, min(start + chunk_size, text_len))
+        for start in range(0, text_len - overlap, step)
+    ]
+
+
 def chunk_text(
     text: str,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
@@ -30,23 +66,63 @@ def chunk_text(
     Returns:
         List of text chunks
     """
-    if len(text) <= chunk_size:
-        return [text]
+    return [text[start:end] for start, end in chunk_spans(text, chunk_size, overlap)]
+
+
+@lru_cache(maxsize=8192)
+def _chunk_tokens(chunk: str) -> frozenset:
+    """Distinct lowercase words of a chunk, cached per chunk text.
+    
+    Keyed by the string itself (its hash is cached on the object), so the
+    same chunk appearing in different chunk lists is only tokenized once.
+    """
+    return frozenset(chunk.lower().split())
+
+
+class ChunkIndex:
+    """
+    Inverted keyword index over a fixed list of chunks.
     
-    chunks = []
-    start = 0
+    Chunks are tokenized once; a query then only touches the posting lists of
+    its own words instead of re-tokenizing every chunk.
+    """
     
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        chunks.append(chunk)
-        
-        # Move start forward (with overlap)
-        start = end - overlap
-        if start >= len(text):
-            break
+    def __init__(self, chunks: List[str]):
+        self.chunks = list(chunks)
+        # word -> ids of chunks containing it (ascending)
+        self.postings: Dict[str, List[int]] = {}
+        for i, chunk in enumerate(self.chunks):
+            for word in _chunk_tokens(chunk):
+                self.postings.setdefault(word, []).append(i)
     
-    return chunks
+    def query(self, query: str, top_k: int = 3) -> List[str]:
+        """
+        Return the top_k chunks by keyword overlap with query.
+        
+        Ties (including zero overlap) go to the later chunk, matching the
+        original sort on (overlap, index) descending.
+        """
+        scores: Counter = Counter()
+        for word in set(query.lower().split()):
+            scores.update(self.postings.get(word, ()))
+        
+        ranked = [
+            i for i, _ in heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], item[0]))
+        ]
+        if len(ranked) < top_k:
+            # Pad with unmatched chunks, latest first
+            for i in range(len(self.chunks) - 1, -1, -1):
+                if len(ranked) >= top_k:
+                    break
+                if i not in scores:
+                    ranked.append(i)
+        return [self.chunks[i] for i in ranked]
+
+
+@lru_cache(maxsize=32)
+def _get_chunk_index(chunks: Tuple[str, ...]) -> ChunkIndex:
+    """Reuse the index when the same chunk list is queried repeatedly."""
+    return ChunkIndex(list(chunks))
 
 
 def retrieve_relevant_chunks(
@@ -68,24 +144,7 @@ def retrieve_relevant_chunks(
     Returns:
         Top-k most relevant chunks
     """
-    query_lower = query.lower()
-    query_words = set(query_lower.split())
-    
-    # Score chunks by keyword overlap
-    scored = []
-    for i, chunk in enumerate(chunks):
-        chunk_lower = chunk.lower()
-        chunk_words = set(chunk_lower.split())
-        
-        # Simple overlap score
-        overlap = len(query_words & chunk_words)
-        scored.append((overlap, i, chunk))
-    
-    # Sort by score (descending)
-    scored.sort(reverse=True)
-    
-    # Return top-k
-    return [chunk for _, _, chunk in scored[:top_k]]
+    return _get_chunk_index(tuple(chunks)).query(query, top_k=top_k)
 
 
 class DomainBrief:
@@ -98,12 +157,15 @@ class DomainBrief:
         self.summary: Optional[str] = None
         self.key_concepts: List[str] = []
         self.last_updated: Optional[datetime] = None
+        # Rendered get_context strings by max_length; briefs are read-mostly
+        self._render_cache: Dict[int, str] = {}
     
     def update(self, summary: str, key_concepts: List[str]) -> None:
         """Update domain brief."""
         self.summary = summary
         self.key_concepts = key_concepts
         self.last_updated = datetime.utcnow()
+        self._render_cache = {}
         logger.debug(f"Updated domain brief for '{self.domain}'")
     
     def get_context(self, max_length: int = 500) -> str:
@@ -116,6 +178,10 @@ class DomainBrief:
         Returns:
             Compressed context string
         """
+        cached = self._render_cache.get(max_length)
+        if cached is not None:
+            return cached
+        
         parts = []
         
         if self.summary:
@@ -129,6 +195,7 @@ class DomainBrief:
         if len(context) > max_length:
             context = context[:max_length] + "..."
         
+        self._render_cache[max_length] = context
         return context
 
 
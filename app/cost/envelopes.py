@@ -4,15 +4,49 @@ Enables layered cost defenses.
 """
 import logging
 import os
-from typing import Dict, Optional, Any
+import threading
+from itertools import count
+from typing import Dict, Optional, Any, Tuple
 from datetime import date
 from threading import Lock
-from collections import defaultdict
-from app.cost.tracker import get_cost_tracker
+from app.cost.tracker import cached_today, get_cost_tracker
 from app.cost.budget import BudgetExceededError
 
 logger = logging.getLogger(__name__)
 
+# Shared result for allowed checks (avoids a tuple allocation per call)
+_ALLOWED: Tuple[bool, Optional[str]] = (True, None)
+
+# Spend counters are sharded per thread so concurrent agents recording into
+# one envelope do not serialize on a single lock. Must be a power of two.
+_SPEND_SHARDS = 16
+_shard_ids = count()
+_thread_shard = threading.local()
+
+
+def _current_shard() -> int:
+    """Shard index for the calling thread (assigned round-robin on first use).
+
+    Thread idents are pointer-aligned, so their low bits cannot be used directly.
+    """
+    try:
+        return _thread_shard.index
+    except AttributeError:
+        _thread_shard.index = next(_shard_ids) & (_SPEND_SHARDS - 1)
+        return _thread_shard.index
+
+
+class _SpendShard:
+    """One shard of an envelope's spend counters."""
+
+    __slots__ = ("lock", "total", "daily", "calls")
+
+    def __init__(self):
+        self.lock = Lock()
+        self.total = 0.0
+        self.daily: Dict[date, float] = {}
+        self.calls = 0
+
 
 class BudgetEnvelope:
     """
@@ -29,62 +63,69 @@ class BudgetEnvelope:
         self.scope = scope
         self.cap_usd = cap_usd
         self.window = window
-        self.spent_usd = 0.0
-        self._lock = Lock()
-        self._daily_spent: Dict[date, float] = defaultdict(float)
-        self._call_count = 0
+        self._shards = [_SpendShard() for _ in range(_SPEND_SHARDS)]
+    
+    @property
+    def spent_usd(self) -> float:
+        """Total spend across all shards."""
+        return sum(shard.total for shard in self._shards)
+    
+    def _daily_spent(self, day: date) -> float:
+        """Spend on day across all shards."""
+        return sum(shard.daily.get(day, 0.0) for shard in self._shards)
     
     def check_cap(self, additional_cost: float = 0.0) -> tuple[bool, Optional[str]]:
         """
         Check if spending additional_cost would exceed cap.
         
+        Lock-free: shard totals are summed without taking the shard locks
+        (each read is atomic under the GIL). A concurrent record_spend can at
+        worst let one call through by its own cost margin.
+        
         Returns:
             (allowed, reason)
         """
-        with self._lock:
-            if self.window == "all_time":
-                if self.spent_usd + additional_cost > self.cap_usd:
-                    return (
-                        False,
-                        f"Budget envelope '{self.scope}' exceeded: ${self.spent_usd:.4f} + ${additional_cost:.4f} > ${self.cap_usd:.2f}"
-                    )
-            elif self.window == "daily":
-                today = date.today()
-                daily_spent = self._daily_spent[today]
-                if daily_spent + additional_cost > self.cap_usd:
-                    return (
-                        False,
-                        f"Daily budget envelope '{self.scope}' exceeded: ${daily_spent:.4f} + ${additional_cost:.4f} > ${self.cap_usd:.2f}"
-                    )
-            elif self.window == "per_call":
-                if additional_cost > self.cap_usd:
-                    return (
-                        False,
-                        f"Per-call budget envelope '{self.scope}' exceeded: ${additional_cost:.4f} > ${self.cap_usd:.2f}"
-                    )
+        if self.window == "all_time":
+            spent = self.spent_usd
+            if spent + additional_cost > self.cap_usd:
+                return (
+                    False,
+                    f"Budget envelope '{self.scope}' exceeded: ${spent:.4f} + ${additional_cost:.4f} > ${self.cap_usd:.2f}"
+                )
+        elif self.window == "daily":
+            daily_spent = self._daily_spent(cached_today())
+            if daily_spent + additional_cost > self.cap_usd:
+                return (
+                    False,
+                    f"Daily budget envelope '{self.scope}' exceeded: ${daily_spent:.4f} + ${additional_cost:.4f} > ${self.cap_usd:.2f}"
+                )
+        elif self.window == "per_call":
+            if additional_cost > self.cap_usd:
+                return (
+                    False,
+                    f"Per-call budget envelope '{self.scope}' exceeded: ${additional_cost:.4f} > ${self.cap_usd:.2f}"
+                )
         
-        return (True, None)
+        return _ALLOWED
     
     def record_spend(self, cost_usd: float) -> None:
-        """Record spending."""
-        with self._lock:
-            self.spent_usd += cost_usd
+        """Record spending (only the calling thread's shard is locked)."""
+        shard = self._shards[_current_shard()]
+        with shard.lock:
+            shard.total += cost_usd
             if self.window == "daily":
-                today = date.today()
-                self._daily_spent[today] += cost_usd
-            self._call_count += 1
+                today = cached_today()
+                shard.daily[today] = shard.daily.get(today, 0.0) + cost_usd
+            shard.calls += 1
     
     def get_remaining(self) -> float:
         """Get remaining budget."""
-        with self._lock:
-            if self.window == "all_time":
-                return max(0.0, self.cap_usd - self.spent_usd)
-            elif self.window == "daily":
-                today = date.today()
-                daily_spent = self._daily_spent[today]
-                return max(0.0, self.cap_usd - daily_spent)
-            else:  # per_call
-                return self.cap_usd  # Always available for next call
+        if self.window == "all_time":
+            return max(0.0, self.cap_usd - self.spent_usd)
+        elif self.window == "daily":
+            return max(0.0, self.cap_usd - self._daily_spent(cached_today()))
+        else:  # per_call
+            return self.cap_usd  # Always available for next call
 
 
 class EnvelopeManager:
@@ -173,7 +214,7 @@ class EnvelopeManager:
         
         # Check agent-specific daily spending
         tracker = get_cost_tracker()
-        today = date.today()
+        today = cached_today()
         agent_daily_cost = tracker.get_daily_cost(target_date=today, agent=agent)
         
         cap = envelope.cap_usd
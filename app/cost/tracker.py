@@ -2,15 +2,23 @@
 Cost tracking middleware for LLM API calls.
 Tracks costs per domain, queue, and day for budget enforcement.
 """
+import heapq
 import logging
+import os
 import time
-from typing import Dict, Any, Optional, List
-from datetime import datetime, date
+from array import array
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, date, timedelta
 from dataclasses import dataclass, field
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
+# Max LLMCall records kept for get_recent_calls; aggregates cover all calls
+DEFAULT_COST_HISTORY_MAX = 10000
+# Days of per-day cost breakdowns kept (older days are dropped on rollover)
+DEFAULT_COST_RETENTION_DAYS = 30
+
 # Model pricing (per 1M tokens) - update as needed
 MODEL_PRICING = {
     # OpenAI
@@ -26,6 +34,39 @@ MODEL_PRICING = {
     "default": {"input": 1.000, "output": 3.000},
 }
 
+# Per-token (input, output) prices derived from MODEL_PRICING for _calculate_cost
+_MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    model: (pricing["input"] / 1_000_000, pricing["output"] / 1_000_000)
+    for model, pricing in MODEL_PRICING.items()
+}
+_DEFAULT_PRICE = _MODEL_PRICES["default"]
+
+# (expires_at epoch seconds, date) for cached_today()
+_today_cache: Tuple[float, date] = (0.0, date.min)
+
+
+def cached_today() -> date:
+    """
+    date.today(), recomputed only once the local date can have changed.
+    
+    Budget checks run on every LLM call; this turns the per-call date lookup
+    into a float compare until the next local midnight.
+    """
+    global _today_cache
+    expires_at, today = _today_cache
+    if time.time() < expires_at:
+        return today
+    today = date.today()
+    next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+    _today_cache = (next_midnight, today)
+    return today
+
+
+def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Calculate cost in USD for a model call (unknown models use the default price)."""
+    input_price, output_price = _MODEL_PRICES.get(model, _DEFAULT_PRICE)
+    return input_tokens * input_price + output_tokens * output_price
+
 
 @dataclass
 class LLMCall:
@@ -44,17 +85,111 @@ class LLMCall:
     error: Optional[str] = None
 
 
+# Naive UTC epoch; call timestamps are stored as integer microseconds from it
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _CallHistory:
+    """
+    Ring buffer of recent LLM calls stored column-wise.
+    
+    Numeric fields are packed into arrays and string fields kept in parallel
+    lists, so retaining a long history costs a few slots per call instead of
+    one LLMCall object each. LLMCall records are rebuilt on read.
+    """
+    
+    __slots__ = (
+        "capacity", "_head", "_count", "_timestamp_us", "_input_tokens",
+        "_output_tokens", "_cost_usd", "_duration_ms", "_success", "_model",
+        "_provider", "_domain", "_queue", "_agent", "_error",
+    )
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(0, capacity)
+        self._head = 0  # next slot to write
+        self._count = 0
+        self._timestamp_us = array("q", bytes(8 * self.capacity))
+        self._input_tokens = array("q", bytes(8 * self.capacity))
+        self._output_tokens = array("q", bytes(8 * self.capacity))
+        self._cost_usd = array("d", bytes(8 * self.capacity))
+        self._duration_ms = array("d", bytes(8 * self.capacity))
+        self._success = array("b", bytes(self.capacity))
+        self._model: List[Optional[str]] = [None] * self.capacity
+        self._provider: List[Optional[str]] = [None] * self.capacity
+        self._domain: List[Optional[str]] = [None] * self.capacity
+        self._queue: List[Optional[str]] = [None] * self.capacity
+        self._agent: List[Optional[str]] = [None] * self.capacity
+        self._error: List[Optional[str]] = [None] * self.capacity
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, call: LLMCall) -> None:
+        """Store call, overwriting the oldest once full (caller holds the lock)."""
+        if not self.capacity:
+            return
+        i = self._head
+        self._timestamp_us[i] = (call.timestamp - _EPOCH) // _MICROSECOND
+        self._input_tokens[i] = call.input_tokens
+        self._output_tokens[i] = call.output_tokens
+        self._cost_usd[i] = call.cost_usd
+        self._duration_ms[i] = call.duration_ms
+        self._success[i] = call.success
+        self._model[i] = call.model
+        self._provider[i] = call.provider
+        self._domain[i] = call.domain
+        self._queue[i] = call.queue
+        self._agent[i] = call.agent
+        self._error[i] = call.error
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+    
+    def _record(self, i: int) -> LLMCall:
+        return LLMCall(
+            timestamp=_EPOCH + self._timestamp_us[i] * _MICROSECOND,
+            model=self._model[i],
+            provider=self._provider[i],
+            input_tokens=self._input_tokens[i],
+            output_tokens=self._output_tokens[i],
+            cost_usd=self._cost_usd[i],
+            domain=self._domain[i],
+            queue=self._queue[i],
+            agent=self._agent[i],
+            duration_ms=self._duration_ms[i],
+            success=bool(self._success[i]),
+            error=self._error[i],
+        )
+    
+    def recent(self, limit: int) -> List[LLMCall]:
+        """Last limit calls, oldest first (caller holds the lock)."""
+        n = max(0, min(limit, self._count))
+        start = self._head - n
+        return [self._record((start + k) % self.capacity) for k in range(n)]
+
+
 class CostTracker:
     """
     Tracks LLM API costs per domain, queue, and day.
     Thread-safe for concurrent agent execution.
     """
     
-    def __init__(self):
+    def __init__(self, max_history: Optional[int] = None):
         self._lock = Lock()
-        self._calls: List[LLMCall] = []
-        # Indexed by (date, domain, queue) for fast lookups
-        self._daily_costs: Dict[tuple, float] = {}  # (date, domain, queue) -> cost
+        if max_history is None:
+            max_history = int(os.getenv("COST_HISTORY_MAX", DEFAULT_COST_HISTORY_MAX))
+        # Bounded history of recent calls; running totals below cover all calls
+        self._calls = _CallHistory(max_history)
+        self._total_calls = 0
+        self._successful_calls = 0
+        self._total_tokens = 0
+        # Daily costs indexed by date first: date -> (domain, queue) -> cost
+        self._by_date: Dict[date, Dict[tuple, float]] = {}
+        self._by_date_total: Dict[date, float] = {}  # date -> cost across domains/queues
+        self._by_date_agent: Dict[date, Dict[str, float]] = {}  # date -> agent -> cost
+        self._retention_days = int(os.getenv("COST_RETENTION_DAYS", DEFAULT_COST_RETENTION_DAYS))
+        self._total_cost = 0.0  # all time, unaffected by retention
         self._domain_costs: Dict[str, float] = {}  # domain -> total cost
         self._queue_costs: Dict[str, float] = {}  # queue -> total cost
     
@@ -96,11 +231,24 @@ class CostTracker:
         
         with self._lock:
             self._calls.append(call)
+            self._total_calls += 1
+            if success:
+                self._successful_calls += 1
+            self._total_tokens += input_tokens + output_tokens
             
             # Update daily cost (by date, domain, queue)
-            today = date.today()
-            key = (today, domain or "global", queue or "default")
-            self._daily_costs[key] = self._daily_costs.get(key, 0.0) + cost
+            today = cached_today()
+            day_costs = self._by_date.get(today)
+            if day_costs is None:
+                day_costs = self._by_date[today] = {}
+                self._evict_old_days(today)
+            key = (domain or "global", queue or "default")
+            day_costs[key] = day_costs.get(key, 0.0) + cost
+            self._by_date_total[today] = self._by_date_total.get(today, 0.0) + cost
+            if agent:
+                agent_costs = self._by_date_agent.setdefault(today, {})
+                agent_costs[agent] = agent_costs.get(agent, 0.0) + cost
+            self._total_cost += cost
             
             # Update domain cost
             if domain:
@@ -119,43 +267,49 @@ class CostTracker:
         
         return call
     
+    def _evict_old_days(self, today: date) -> None:
+        """Drop per-day breakdowns older than the retention window (caller holds the lock)."""
+        cutoff = today - timedelta(days=self._retention_days)
+        for d in [d for d in self._by_date if d < cutoff]:
+            del self._by_date[d]
+            self._by_date_total.pop(d, None)
+            self._by_date_agent.pop(d, None)
+    
     def _calculate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Calculate cost in USD for a model call."""
-        pricing = MODEL_PRICING.get(model, MODEL_PRICING["default"])
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output"]
-        return input_cost + output_cost
+        return calculate_cost(model, input_tokens, output_tokens)
     
     def get_daily_cost(
         self,
         target_date: Optional[date] = None,
         domain: Optional[str] = None,
         queue: Optional[str] = None,
+        agent: Optional[str] = None,
     ) -> float:
         """
-        Get total cost for a specific day, optionally filtered by domain/queue.
+        Get total cost for a specific day, optionally filtered by domain/queue or agent.
         
         Args:
             target_date: Date to check (default: today)
             domain: Filter by domain (None = all domains)
             queue: Filter by queue (None = all queues)
+            agent: Cost of a single agent that day (takes precedence over domain/queue)
         
         Returns:
             Total cost in USD
         """
         if target_date is None:
-            target_date = date.today()
+            target_date = cached_today()
         
         with self._lock:
+            if agent is not None:
+                return self._by_date_agent.get(target_date, {}).get(agent, 0.0)
             if domain is None and queue is None:
-                # Sum all costs for this date
-                return sum(
-                    cost for (d, dom, q), cost in self._daily_costs.items()
-                    if d == target_date
-                )
-            else:
-                key = (target_date, domain or "global", queue or "default")
-                return self._daily_costs.get(key, 0.0)
+                return self._by_date_total.get(target_date, 0.0)
+            day_costs = self._by_date.get(target_date)
+            if not day_costs:
+                return 0.0
+            return day_costs.get((domain or "global", queue or "default"), 0.0)
     
     def get_domain_cost(self, domain: str) -> float:
         """Get total cost for a domain (all time)."""
@@ -170,38 +324,30 @@ class CostTracker:
     def get_total_cost(self) -> float:
         """Get total cost across all domains/queues/days."""
         with self._lock:
-            return sum(self._daily_costs.values())
+            return self._total_cost
     
     def get_recent_calls(self, limit: int = 100) -> List[LLMCall]:
         """Get most recent LLM calls."""
         with self._lock:
-            return self._calls[-limit:]
+            return self._calls.recent(limit)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cost statistics summary."""
         with self._lock:
-            total_calls = len(self._calls)
-            successful_calls = sum(1 for c in self._calls if c.success)
-            total_tokens = sum(c.input_tokens + c.output_tokens for c in self._calls)
+            total_calls = self._total_calls
+            successful_calls = self._successful_calls
+            total_tokens = self._total_tokens
             
             return {
                 "total_calls": total_calls,
                 "successful_calls": successful_calls,
                 "failed_calls": total_calls - successful_calls,
-                "total_cost_usd": self.get_total_cost(),
+                "total_cost_usd": self._total_cost,
                 "total_tokens": total_tokens,
                 "domains_with_costs": len(self._domain_costs),
                 "queues_with_costs": len(self._queue_costs),
-                "top_domains": sorted(
-                    self._domain_costs.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10],
-                "top_queues": sorted(
-                    self._queue_costs.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10],
+                "top_domains": heapq.nlargest(10, self._domain_costs.items(), key=lambda x: x[1]),
+                "top_queues": heapq.nlargest(10, self._queue_costs.items(), key=lambda x: x[1]),
             }
 
 
@@ -0,0 +1,97 @@
+"""
+Native Tarjan SCC kernel over CSR adjacency, for large citation graphs.
+Compiled with Numba when available; tarjan_scc is None otherwise.
+"""
+from typing import Tuple
+
+# numpy/numba are optional; circular_citation falls back to pure-Python Tarjan
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _tarjan_scc(indptr, indices) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Iterative Tarjan over a CSR graph (edges of v are indices[indptr[v]:indptr[v + 1]]).
+
+    Written against plain arrays so Numba can compile it; also runs (slowly)
+    as ordinary Python.
+
+    Returns:
+        (comp_id, roots): component of each node, and the DFS root of each
+        component. Components are numbered in reverse topological order.
+    """
+    n = indptr.shape[0] - 1
+    index = np.full(n, -1, np.int64)
+    lowlink = np.zeros(n, np.int64)
+    on_stack = np.zeros(n, np.bool_)
+    stack = np.empty(n, np.int64)
+    work_node = np.empty(n, np.int64)  # explicit DFS frames: node ...
+    work_edge = np.empty(n, np.int64)  # ... and its next edge position
+    comp_id = np.full(n, -1, np.int64)
+    roots = np.empty(n, np.int64)
+    sp = 0
+    n_components = 0
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = counter
+        lowlink[root] = counter
+        counter += 1
+        stack[sp] = root
+        sp += 1
+        on_stack[root] = True
+        work_node[0] = root
+        work_edge[0] = indptr[root]
+        wp = 1
+        while wp > 0:
+            v = work_node[wp - 1]
+            e = work_edge[wp - 1]
+            if e < indptr[v + 1]:
+                work_edge[wp - 1] = e + 1
+                w = indices[e]
+                if index[w] == -1:
+                    index[w] = counter
+                    lowlink[w] = counter
+                    counter += 1
+                    stack[sp] = w
+                    sp += 1
+                    on_stack[w] = True
+                    work_node[wp] = w
+                    work_edge[wp] = indptr[w]
+                    wp += 1
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+                continue
+
+            wp -= 1
+            if wp > 0:
+                parent = work_node[wp - 1]
+                if lowlink[v] < lowlink[parent]:
+                    lowlink[parent] = lowlink[v]
+            if lowlink[v] == index[v]:
+                while True:
+                    sp -= 1
+                    w = stack[sp]
+                    on_stack[w] = False
+                    comp_id[w] = n_components
+                    if w == v:
+                        break
+                roots[n_components] = v
+                n_components += 1
+
+    return comp_id, roots[:n_components]
+
+
+if numba is not None:
+    tarjan_scc = numba.njit(cache=True, boundscheck=False)(_tarjan_scc)
+else:
+    tarjan_scc = None
@@ -3,8 +3,12 @@ Circular citation detection: "self-confirming loops" (agents cite each other).
 Detects when agents create circular references that reinforce each other.
 """
 import logging
-from typing import Dict, Any, List, Set, Optional
 from collections import defaultdict
+from itertools import chain
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, List, Sequence, Set, Optional, Tuple
+
+from app.failure_modes._scc_kernel import np, tarjan_scc
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +18,446 @@ class CircularCitationError(Exception):
     pass
 
 
+# Graphs with at least this many edges use the compiled SCC kernel (if installed)
+NATIVE_SCC_MIN_EDGES = 10_000
+
+# Cycles reported by detect_circular_citations before it stops looking
+DEFAULT_MAX_CYCLES = 16
+
+# Edge types that count as one node citing another
+CITATION_EDGE_TYPES = frozenset(("SUPPORTS", "REFUTES", "DEFINES", "RELATED_TO"))
+
+
+def _strongly_connected_components(adjacency: List[List[int]]) -> List[List[int]]:
+    """
+    Tarjan's SCC algorithm, iterative (no recursion limit on deep graphs).
+    
+    Large graphs go through the Numba kernel in _scc_kernel when available.
+    
+    Args:
+        adjacency: adjacency[v] = nodes v has edges to (nodes are 0..n-1)
+    
+    Returns:
+        Components in reverse topological order; each lists its root last
+    """
+    if tarjan_scc is not None:
+        edge_count = sum(map(len, adjacency))
+        if edge_count >= NATIVE_SCC_MIN_EDGES:
+            return _native_strongly_connected_components(adjacency, edge_count)
+    
+    n = len(adjacency)
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # Explicit DFS frames: (node, next edge position)
+        work = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            edges = adjacency[v]
+            if i < len(edges):
+                work[-1] = (v, i + 1)
+                w = edges[i]
+                if index[w] == -1:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[v] < lowlink[parent]:
+                    lowlink[parent] = lowlink[v]
+            if lowlink[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+    
+    return components
+
+
+def _native_strongly_connected_components(
+    adjacency: List[List[int]],
+    edge_count: int,
+) -> List[List[int]]:
+    """_strongly_connected_components via the compiled CSR kernel (same output contract)."""
+    indptr = np.zeros(len(adjacency) + 1, dtype=np.int32)
+    np.cumsum([len(edges) for edges in adjacency], out=indptr[1:])
+    indices = np.fromiter(chain.from_iterable(adjacency), dtype=np.int32, count=edge_count)
+    comp_id, roots = tarjan_scc(indptr, indices)
+    
+    components: List[List[int]] = [[] for _ in range(len(roots))]
+    for v, c in enumerate(comp_id.tolist()):
+        components[c].append(v)
+    # Match the pure-Python contract: root listed last
+    for component, root in zip(components, roots.tolist()):
+        if component[-1] != root:
+            i = component.index(root)
+            component[i], component[-1] = component[-1], component[i]
+    return components
+
+
+def _cycle_through(adjacency: List[List[int]], component: Set[int], start: int) -> List[int]:
+    """Shortest cycle start -> ... -> start within a strongly connected component (BFS)."""
+    parent = {start: start}
+    queue = [start]
+    for v in queue:
+        for w in adjacency[v]:
+            if w == start:
+                path = [v]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                path.append(start)
+                return path
+            if w in component and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    return []
+
+
+def _citation_pairs(edges: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """(from, to) of each citation edge."""
+    types = CITATION_EDGE_TYPES
+    for edge in edges:
+        get = edge.get
+        if get("type") in types:
+            from_id = get("from")
+            to_id = get("to")
+            if from_id and to_id:
+                yield (from_id, to_id)
+
+
+def _intern_graph(pairs: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[Set[int]]]:
+    """Citation graph over interned node ids: (node names, ids each node cites)."""
+    node_ids: Dict[str, int] = {}
+    nodes: List[str] = []
+    citations: List[Set[int]] = []
+    
+    def intern(node: str) -> int:
+        i = node_ids.get(node)
+        if i is None:
+            i = node_ids[node] = len(nodes)
+            nodes.append(node)
+            citations.append(set())
+        return i
+    
+    for from_id, to_id in pairs:
+        citations[intern(from_id)].add(intern(to_id))
+    return nodes, citations
+
+
+def _find_cycles(
+    pairs: Iterable[Tuple[str, str]],
+    max_cycles: Optional[int] = None,
+) -> List[List[str]]:
+    """One representative cycle per strongly connected component that has one
+    (at most max_cycles of them)."""
+    nodes, citations = _intern_graph(pairs)
+    
+    # Every strongly connected component with 2+ nodes (or a self-citation)
+    # contains a cycle; report one representative cycle per component
+    adjacency = [list(cited) for cited in citations]
+    cycles = []
+    for component in _strongly_connected_components(adjacency):
+        if max_cycles is not None and len(cycles) >= max_cycles:
+            break
+        if len(component) > 1 or component[0] in citations[component[0]]:
+            cycle = _cycle_through(adjacency, set(component), component[-1])
+            cycles.append([nodes[i] for i in cycle])
+    return cycles
+
+
+def _components_within(adjacency: List[List[int]], members: Set[int]) -> List[Set[int]]:
+    """Strongly connected components of the subgraph induced by members."""
+    local = sorted(members)
+    local_ids = {v: i for i, v in enumerate(local)}
+    sub_adjacency = [[local_ids[w] for w in adjacency[v] if w in local_ids] for v in local]
+    return [
+        {local[i] for i in component}
+        for component in _strongly_connected_components(sub_adjacency)
+    ]
+
+
+def _unblock(node: int, blocked: Set[int], blocked_by: Dict[int, Set[int]]) -> None:
+    pending = {node}
+    while pending:
+        v = pending.pop()
+        if v in blocked:
+            blocked.remove(v)
+            pending.update(blocked_by[v])
+            blocked_by[v].clear()
+
+
+def _simple_cycles(adjacency: List[List[int]], citations: List[Set[int]]) -> Iterator[List[int]]:
+    """
+    Every elementary cycle (Johnson's algorithm, iterative), as closed paths
+    [v0, ..., v0]. Self-citations are yielded first.
+    """
+    for v, cited in enumerate(citations):
+        if v in cited:
+            yield [v, v]
+    
+    pending = [c for c in _components_within(adjacency, set(range(len(adjacency)))) if len(c) > 1]
+    while pending:
+        component = pending.pop()
+        start = min(component)
+        component.discard(start)
+        scope = component | {start}
+        path = [start]
+        blocked = {start}
+        closed: Set[int] = set()
+        blocked_by: Dict[int, Set[int]] = defaultdict(set)
+        stack = [(start, [w for w in adjacency[start] if w in scope and w != start])]
+        while stack:
+            v, neighbors = stack[-1]
+            if neighbors:
+                w = neighbors.pop()
+                if w == start:
+                    yield path + [start]
+                    closed.update(path)
+                elif w not in blocked:
+                    path.append(w)
+                    stack.append((w, [x for x in adjacency[w] if x in scope and x != w]))
+                    closed.discard(w)
+                    blocked.add(w)
+                    continue
+            if not neighbors:
+                if v in closed:
+                    _unblock(v, blocked, blocked_by)
+                else:
+                    for w in adjacency[v]:
+                        if w in scope:
+                            blocked_by[w].add(v)
+                stack.pop()
+                path.pop()
+        # Cycles through start are done; continue in what remains without it
+        pending.extend(c for c in _components_within(adjacency, component) if len(c) > 1)
+
+
+def enumerate_all_cycles(
+    diff: Dict[str, Any],
+    existing_edges: Optional[List[Dict[str, Any]]] = None,
+    max_cycles: Optional[int] = None,
+) -> List[List[str]]:
+    """
+    List every elementary citation cycle (detect_circular_citations reports
+    only one per group of mutually citing nodes).
+    
+    The number of cycles can grow exponentially with graph density; bound it
+    with max_cycles.
+    """
+    pairs = chain(
+        _citation_pairs(existing_edges or ()),
+        _citation_pairs(diff.get("edges", {}).get("add", [])),
+    )
+    nodes, citations = _intern_graph(pairs)
+    adjacency = [list(cited) for cited in citations]
+    cycles = []
+    for cycle in _simple_cycles(adjacency, citations):
+        if max_cycles is not None and len(cycles) >= max_cycles:
+            break
+        cycles.append([nodes[i] for i in cycle])
+    return cycles
+
+
+@lru_cache(maxsize=8)
+def _analyze_existing_graph(
+    pairs: FrozenSet[Tuple[str, str]],
+) -> Tuple[Dict[str, Tuple[str, ...]], Tuple[Tuple[str, ...], ...]]:
+    """
+    Adjacency and cycles of the existing citation graph.
+    
+    Cached by edge set: consecutive diffs are usually checked against the same
+    KG edges, so only the new edges need examining. Results are shared; do not mutate.
+    """
+    # Sorted so reported cycles do not depend on set iteration order
+    ordered = sorted(pairs)
+    graph: Dict[str, List[str]] = {}
+    for from_id, to_id in ordered:
+        graph.setdefault(from_id, []).append(to_id)
+    cycles = tuple(tuple(cycle) for cycle in _find_cycles(ordered))
+    return {node: tuple(cited) for node, cited in graph.items()}, cycles
+
+
+def invalidate_scc_cache() -> None:
+    """Drop cached analyses of existing citation graphs."""
+    _analyze_existing_graph.cache_clear()
+
+
+def _closes_cycle(
+    graph: Dict[str, Sequence[str]],
+    new_pairs: List[Tuple[str, str]],
+    candidates: Optional[List[Tuple[str, str]]] = None,
+) -> bool:
+    """
+    True if any new edge (or any of candidates, if given) lies on a cycle of
+    graph plus new_pairs.
+    
+    If none does, the combined graph has exactly the cycles of graph. An edge
+    u -> v lies on a cycle iff v reaches u; the search only walks the part of
+    the graph reachable from v.
+    """
+    added: Dict[str, List[str]] = {}
+    for from_id, to_id in new_pairs:
+        added.setdefault(from_id, []).append(to_id)
+    empty: Tuple[str, ...] = ()
+    for from_id, to_id in (new_pairs if candidates is None else candidates):
+        seen = {to_id}
+        queue = [to_id]
+        for node in queue:
+            if node == from_id:
+                return True
+            for cited in chain(graph.get(node, empty), added.get(node, empty)):
+                if cited not in seen:
+                    seen.add(cited)
+                    queue.append(cited)
+    return False
+
+
+class CitationGraph:
+    """
+    Live citation graph with its strongly connected components.
+    
+    Build once from the KG and pass to detect_circular_citations for each
+    diff; call add_edges once a diff is committed. Adding an edge only
+    searches the part of the graph reachable from its target, instead of
+    re-ingesting every existing edge per diff.
+    """
+    
+    def __init__(self, edges: Optional[Iterable[Dict[str, Any]]] = None):
+        self._adjacency: Dict[str, List[str]] = {}
+        self._reverse: Dict[str, List[str]] = {}
+        self._pairs: Set[Tuple[str, str]] = set()
+        self._comp: Dict[str, int] = {}  # node -> component id
+        self._members: Dict[int, Set[str]] = {}  # component id -> nodes
+        self._cycles: Dict[int, List[str]] = {}  # cyclic component id -> representative cycle
+        self._next_comp = 0
+        if edges:
+            self._build(list(dict.fromkeys(_citation_pairs(edges))))
+    
+    def _build(self, pairs: List[Tuple[str, str]]) -> None:
+        for from_id, to_id in pairs:
+            self._link(from_id, to_id)
+        nodes, citations = _intern_graph(pairs)
+        adjacency = [list(cited) for cited in citations]
+        for component in _strongly_connected_components(adjacency):
+            comp = self._new_component({nodes[i] for i in component})
+            if len(component) > 1 or component[0] in citations[component[0]]:
+                self._cycles[comp] = [nodes[i] for i in _cycle_through(adjacency, set(component), component[-1])]
+    
+    def _link(self, from_id: str, to_id: str) -> None:
+        self._pairs.add((from_id, to_id))
+        self._adjacency.setdefault(from_id, []).append(to_id)
+        self._reverse.setdefault(to_id, []).append(from_id)
+    
+    def _new_component(self, members: Set[str]) -> int:
+        comp = self._next_comp
+        self._next_comp += 1
+        self._members[comp] = members
+        for node in members:
+            self._comp[node] = comp
+        return comp
+    
+    def _reachable(self, start: str, edges: Dict[str, List[str]], within: Optional[Set[str]] = None) -> Set[str]:
+        seen = {start}
+        queue = [start]
+        empty: List[str] = []
+        for node in queue:
+            for nxt in edges.get(node, empty):
+                if nxt not in seen and (within is None or nxt in within):
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return seen
+    
+    def add_edges(self, edges: Iterable[Dict[str, Any]]) -> None:
+        """Add committed citation edges, merging components that now form cycles."""
+        for from_id, to_id in _citation_pairs(edges):
+            if (from_id, to_id) in self._pairs:
+                continue
+            self._link(from_id, to_id)
+            for node in (from_id, to_id):
+                if node not in self._comp:
+                    self._new_component({node})
+            from_comp = self._comp[from_id]
+            if from_id == to_id:
+                self._cycles.setdefault(from_comp, [from_id, from_id])
+                continue
+            if from_comp == self._comp[to_id]:
+                continue
+            # from -> to closes a cycle iff to reaches from; the merged component
+            # is every node on such a path (reachable from `to`, reaching `from`)
+            forward = self._reachable(to_id, self._adjacency)
+            if from_id not in forward:
+                continue
+            on_cycle = self._reachable(from_id, self._reverse, within=forward)
+            merged: Set[str] = set()
+            for comp in {self._comp[node] for node in on_cycle}:
+                merged |= self._members.pop(comp)
+                self._cycles.pop(comp, None)
+            comp = self._new_component(merged)
+            self._cycles[comp] = _cycle_through(self._adjacency, merged, from_id)
+    
+    def add_diff(self, diff: Dict[str, Any]) -> None:
+        """add_edges for the edges a committed diff adds."""
+        self.add_edges(diff.get("edges", {}).get("add", []))
+    
+    def pairs(self) -> Set[Tuple[str, str]]:
+        """(from, to) of every citation edge (shared; do not mutate)."""
+        return self._pairs
+    
+    def cycles(self) -> List[List[str]]:
+        """One representative cycle per cyclic component."""
+        return [list(cycle) for cycle in self._cycles.values()]
+    
+    def changes_cycles(self, new_pairs: List[Tuple[str, str]]) -> bool:
+        """
+        True if adding new_pairs would change which components are cyclic.
+        
+        Edges inside an existing component never do; a self-citation does only
+        on an acyclic node; any other edge does iff it closes a cycle.
+        """
+        candidates = []
+        for from_id, to_id in new_pairs:
+            comp = self._comp.get(from_id)
+            if from_id == to_id:
+                if comp is None or comp not in self._cycles:
+                    return True
+            elif comp is None or comp != self._comp.get(to_id):
+                candidates.append((from_id, to_id))
+        return _closes_cycle(self._adjacency, new_pairs, candidates)
+
+
+def build_citation_graph(edges: Iterable[Dict[str, Any]]) -> CitationGraph:
+    """Build a CitationGraph from KG edges (do this once, then add_edges per commit)."""
+    return CitationGraph(edges)
+
+
 def detect_circular_citations(
     diff: Dict[str, Any],
     existing_edges: Optional[List[Dict[str, Any]]] = None,
+    max_cycles: Optional[int] = DEFAULT_MAX_CYCLES,
+    graph: Optional[CitationGraph] = None,
 ) -> Dict[str, Any]:
     """
     Detect circular citations in a diff.
@@ -27,66 +468,40 @@ def detect_circular_citations(
     Args:
         diff: Diff with nodes/edges to add
         existing_edges: Optional existing edges from KG (for full graph check)
+        max_cycles: Stop after reporting this many cycles (None = all); any
+            cycle already makes has_circular True
+        graph: Optional live CitationGraph of the KG, used instead of
+            existing_edges (not modified; call graph.add_diff after committing)
     
     Returns:
         Dict with:
         - has_circular: bool
-        - cycles: list of cycle paths (e.g., [["A", "B", "C", "A"]])
+        - cycles: list of cycle paths (e.g., [["A", "B", "C", "A"]]), one per
+          group of mutually citing nodes
         - warnings: list of warning messages
     """
-    edges_to_add = diff.get("edges", {}).get("add", [])
-    
-    # Build citation graph: node -> set of nodes it cites
-    citations: Dict[str, Set[str]] = defaultdict(set)
-    
-    # Add existing edges if provided
-    if existing_edges:
-        for edge in existing_edges:
-            etype = edge.get("type", "")
-            if etype in ("SUPPORTS", "REFUTES", "DEFINES", "RELATED_TO"):
-                from_id = edge.get("from")
-                to_id = edge.get("to")
-                if from_id and to_id:
-                    citations[from_id].add(to_id)
-    
-    # Add new edges
-    for edge in edges_to_add:
-        etype = edge.get("type", "")
-        if etype in ("SUPPORTS", "REFUTES", "DEFINES", "RELATED_TO"):
-            from_id = edge.get("from")
-            to_id = edge.get("to")
-            if from_id and to_id:
-                citations[from_id].add(to_id)
-    
-    # Detect cycles using DFS
-    cycles = []
-    visited = set()
-    rec_stack = set()
-    
-    def dfs(node: str, path: List[str]) -> None:
-        if node in rec_stack:
-            # Cycle detected
-            cycle_start = path.index(node)
-            cycle = path[cycle_start:] + [node]
-            cycles.append(cycle)
-            return
-        
-        if node in visited:
-            return
-        
-        visited.add(node)
-        rec_stack.add(node)
-        
-        for cited in citations.get(node, set()):
-            dfs(cited, path + [node])
-        
-        rec_stack.remove(node)
+    new_pairs = list(dict.fromkeys(_citation_pairs(diff.get("edges", {}).get("add", []))))
     
-    # Check all nodes
-    all_nodes = set(citations.keys()) | {cited for cites in citations.values() for cited in cites}
-    for node in all_nodes:
-        if node not in visited:
-            dfs(node, [])
+    if graph is not None:
+        if existing_edges:
+            raise ValueError("Pass either existing_edges or graph, not both")
+        graph_pairs = graph.pairs()
+        new_pairs = [pair for pair in new_pairs if pair not in graph_pairs]
+        if graph.changes_cycles(new_pairs):
+            cycles = _find_cycles(chain(sorted(graph_pairs), new_pairs), max_cycles)
+        else:
+            cycles = graph.cycles()[:max_cycles]
+    elif existing_edges:
+        existing_pairs = frozenset(_citation_pairs(existing_edges))
+        existing_graph, existing_cycles = _analyze_existing_graph(existing_pairs)
+        new_pairs = [pair for pair in new_pairs if pair not in existing_pairs]
+        if _closes_cycle(existing_graph, new_pairs):
+            cycles = _find_cycles(chain(sorted(existing_pairs), new_pairs), max_cycles)
+        else:
+            # Cycles of the combined graph are exactly the existing ones
+            cycles = [list(cycle) for cycle in existing_cycles[:max_cycles]]
+    else:
+        cycles = _find_cycles(new_pairs, max_cycles)
     
     has_circular = len(cycles) > 0
     
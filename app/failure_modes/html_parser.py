@@ -2,9 +2,24 @@
 HTML parser fallback for when source HTML changes.
 Enables graceful degradation when parser breaks.
 """
+import hashlib
+import html as html_lib
 import logging
+import os
 import re
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Dict, Any, Hashable, Tuple
+
+# selectolax is optional (C HTML parser); the regex cleaner is used without it.
+# selectolax 1.0 removed the Modest backend (selectolax.parser), so prefer Lexbor.
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
 
 logger = logging.getLogger(__name__)
 
@@ -14,32 +29,112 @@ class HTMLParserError(Exception):
     pass
 
 
-def parse_html_simple(html: str) -> str:
-    """
-    Simple HTML parser: strip tags, extract text.
-    Fallback when structured parsing fails.
-    """
-    if not html:
-        return ""
-    
+# HTML beyond this many characters is ignored by the parser and paywall check
+MAX_HTML_CHARS = int(os.getenv("MAX_HTML_CHARS", "2000000"))
+# Parsed text of pages up to this size is memoized (retries/re-fetches parse the same body)
+HTML_MEMO_MAX_CHARS = 200_000
+HTML_MEMO_MAX_ENTRIES = 64
+
+# Script and style blocks (with contents), matched in one pass
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+
+def _parse_html_regex(html: str) -> str:
+    """Regex tag stripper (no dependencies; misses edge cases a real parser handles)."""
     # Remove script/style
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = _SCRIPT_STYLE_RE.sub('', html)
     
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', ' ', html)
+    text = _TAG_RE.sub(' ', html)
     
-    # Decode entities (simple)
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    text = text.replace('&quot;', '"')
+    # Decode entities (&nbsp; becomes U+00A0, folded by the whitespace pass)
+    text = html_lib.unescape(text)
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    return _WS_RE.sub(' ', text).strip()
+
+
+def _parse_html_text(html: str) -> Tuple[str, str]:
+    """
+    Extract text from HTML with the fastest available parser.
     
-    return text
+    Returns:
+        (text, parser) where parser is "selectolax" or "regex_fallback"
+    """
+    if HTMLParser is not None:
+        try:
+            tree = HTMLParser(html)
+            tree.strip_tags(["script", "style"])
+            return _WS_RE.sub(' ', tree.text(separator=' ')).strip(), "selectolax"
+        except Exception as e:
+            logger.debug(f"selectolax parsing failed: {e}, using regex fallback")
+    return _parse_html_regex(html), "regex_fallback"
+
+
+def content_key(text: str) -> Tuple[int, bytes]:
+    """
+    Compact memo key for a page: (length, 128-bit BLAKE2b digest).
+    
+    The memo holds this instead of the page, so cached entries cost a few
+    dozen bytes of key rather than the whole document.
+    """
+    return len(text), hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class ContentMemo:
+    """Small thread-safe LRU of results keyed by content_key (plus any extra key parts)."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_parse_memo = ContentMemo(HTML_MEMO_MAX_ENTRIES)
+
+
+def _parse_html_text_memo(html: str) -> Tuple[str, str]:
+    """_parse_html_text, memoized for pages up to HTML_MEMO_MAX_CHARS."""
+    if len(html) > HTML_MEMO_MAX_CHARS:
+        return _parse_html_text(html)
+    key = content_key(html)
+    result = _parse_memo.get(key)
+    if result is None:
+        result = _parse_html_text(html)
+        _parse_memo.set(key, result)
+    return result
+
+
+def parse_html_simple(html: str) -> str:
+    """
+    Simple HTML parser: strip tags, extract text.
+    Fallback when structured parsing fails.
+    
+    Uses selectolax's single-pass C parser when installed, else regexes.
+    """
+    if not html:
+        return ""
+    return _parse_html_text_memo(html)[0]
 
 
 def parse_html_with_fallback(
@@ -66,14 +161,17 @@ def parse_html_with_fallback(
         },
     }
     
-    # Try structured parsing (if we had BeautifulSoup, etc.)
-    # For now, we always use simple fallback
+    if html and len(html) > MAX_HTML_CHARS:
+        logger.debug(f"HTML truncated from {len(html)} to {MAX_HTML_CHARS} chars before parsing")
+        html = html[:MAX_HTML_CHARS]
+        result["metadata"]["truncated"] = True
+    
+    # Structured parsing via selectolax when installed, else regex extraction
     try:
-        # Simple extraction
-        text = parse_html_simple(html)
+        text, parser = _parse_html_text_memo(html) if html else ("", "regex_fallback")
         result["content"] = text
-        result["metadata"]["parser"] = "simple"
-        result["metadata"]["fallback_used"] = True
+        result["metadata"]["parser"] = parser
+        result["metadata"]["fallback_used"] = parser != "selectolax"
         
         # Validate we got some content
         if len(text) < 10:
@@ -85,8 +183,8 @@ def parse_html_with_fallback(
     except Exception as e:
         logger.warning(f"HTML parsing failed: {e}, using minimal fallback")
         # Minimal fallback: just strip everything
-        text = re.sub(r'<[^>]+>', ' ', html)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _TAG_RE.sub(' ', html)
+        text = _WS_RE.sub(' ', text).strip()
         result["content"] = text[:1000]  # Limit to 1000 chars
         result["metadata"]["parser"] = "minimal_fallback"
         result["metadata"]["fallback_used"] = True
@@ -3,11 +3,44 @@ Model version tracking: detect model behavior shifts after upgrades.
 """
 import logging
 import os
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Env vars holding an explicit model version, per provider
+_ENV_VERSION_KEYS = {
+    "openai": "OPENAI_MODEL_VERSION",
+    "anthropic": "ANTHROPIC_MODEL_VERSION",
+}
+
+# (epoch second, ISO-8601 UTC string) for _tracked_at()
+_tracked_at_cache: Tuple[int, str] = (-1, "")
+
+
+@lru_cache(maxsize=None)
+def _env_version(provider: str) -> Optional[str]:
+    """Version from the provider's env var (read once per provider)."""
+    key = _ENV_VERSION_KEYS.get(provider)
+    return os.getenv(key) if key else None
+
+
+def clear_version_cache() -> None:
+    """Re-read model version env vars on next use (e.g. after changing them in tests)."""
+    _env_version.cache_clear()
+
+
+def _tracked_at() -> str:
+    """Current UTC time as ISO-8601 with second precision, formatted once per second."""
+    global _tracked_at_cache
+    now = int(time.time())
+    second, formatted = _tracked_at_cache
+    if now != second:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _tracked_at_cache = (now, formatted)
+    return formatted
+
 
 def track_model_version(
     model_name: str,
@@ -28,18 +61,13 @@ def track_model_version(
     # Extract version from model name or env
     if not version:
         # Try to get from env or model name
-        if provider == "openai":
-            version = os.getenv("OPENAI_MODEL_VERSION") or model_name
-        elif provider == "anthropic":
-            version = os.getenv("ANTHROPIC_MODEL_VERSION") or model_name
-        else:
-            version = model_name
+        version = _env_version(provider) or model_name
     
     record = {
         "model_name": model_name,
         "provider": provider,
         "version": version,
-        "tracked_at": datetime.utcnow().isoformat() + "Z",
+        "tracked_at": _tracked_at(),
     }
     
     logger.debug(f"Tracked model version: {model_name} ({provider}) = {version}")
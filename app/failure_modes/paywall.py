@@ -3,7 +3,16 @@ Paywall detection: detect when paywalls appear.
 """
 import logging
 import re
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from app.failure_modes.html_parser import ContentMemo, MAX_HTML_CHARS, content_key
+
+# hyperscan is optional (SIMD multi-pattern scanner); substring/regex matching is used without it
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +43,90 @@ PAYWALL_INDICATORS = [
     r"data-paywall",
 ]
 
+# Unescaped regex metacharacters; patterns without them are plain literals
+_REGEX_SYNTAX_RE = re.compile(r"(?<!\\)[.^$*+?{}\[\]|()]")
+
+
+def _compile_indicator(pattern: str):
+    """Plain literals become lowercase substrings (str `in` is a C fast search);
+    everything else is compiled once. Input is lowercased, so no IGNORECASE."""
+    if not _REGEX_SYNTAX_RE.search(pattern):
+        return re.sub(r"\\(.)", r"\1", pattern).lower()
+    return re.compile(pattern)
+
+
+# (indicator, matcher) in PAYWALL_INDICATORS order
+_INDICATOR_MATCHERS = [(pattern, _compile_indicator(pattern)) for pattern in PAYWALL_INDICATORS]
+
+
+def _indicator_matches(matcher, text: str) -> bool:
+    if isinstance(matcher, str):
+        return matcher in text
+    return matcher.search(text) is not None
+
+
+def _build_hyperscan_db():
+    """Compile all indicators into one Hyperscan database (None if unavailable)."""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.encode() for pattern in PAYWALL_INDICATORS],
+            ids=list(range(len(PAYWALL_INDICATORS))),
+            elements=len(PAYWALL_INDICATORS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(PAYWALL_INDICATORS),
+        )
+        return db
+    except Exception as e:
+        logger.warning(f"Hyperscan database compile failed: {e}, using regex matching")
+        return None
+
+
+_HS_DB = _build_hyperscan_db()
+# Hyperscan scratch space must not be shared between concurrent scans
+_hs_local = threading.local()
+
+
+def _hyperscan_hits(text: str) -> Set[int]:
+    """Indices into PAYWALL_INDICATORS of every indicator found in text (one pass)."""
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    hits: Set[int] = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(pattern_id)
+    
+    _HS_DB.scan(text.encode("utf-8", "replace"), match_event_handler=on_match, scratch=scratch)
+    return hits
+
+
+def _match_indicators(html: str, url: Optional[str]) -> Tuple[str, ...]:
+    """Indicators found in html or url, in PAYWALL_INDICATORS order."""
+    if _HS_DB is not None:
+        try:
+            # Caseless scan of the original text: no lowercased copy needed
+            hits = _hyperscan_hits(html)
+            if url:
+                hits |= _hyperscan_hits(url)
+            return tuple(PAYWALL_INDICATORS[i] for i in sorted(hits))
+        except Exception as e:
+            logger.debug(f"Hyperscan scan failed: {e}, using regex matching")
+    
+    html_lower = html.lower()
+    url_lower = (url or "").lower()
+    return tuple(
+        pattern
+        for pattern, matcher in _INDICATOR_MATCHERS
+        if _indicator_matches(matcher, html_lower)
+        or (url_lower and _indicator_matches(matcher, url_lower))
+    )
+
+
+# Matched indicators per (page digest, url); values are small tuples, so any page size is memoized
+_indicator_memo = ContentMemo(256)
+
 
 def detect_paywall(
     html: str,
@@ -52,15 +145,16 @@ def detect_paywall(
     if not html:
         return {"is_paywall": False, "confidence": 0.0, "indicators": []}
     
-    html_lower = html.lower()
-    url_lower = (url or "").lower()
-    
-    matched_indicators = []
+    # Paywall markup sits near the top of the page; don't scan huge documents in full
+    if len(html) > MAX_HTML_CHARS:
+        html = html[:MAX_HTML_CHARS]
     
-    for pattern in PAYWALL_INDICATORS:
-        if re.search(pattern, html_lower, re.IGNORECASE) or \
-           (url_lower and re.search(pattern, url_lower, re.IGNORECASE)):
-            matched_indicators.append(pattern)
+    key = (content_key(html), url)
+    hits = _indicator_memo.get(key)
+    if hits is None:
+        hits = _match_indicators(html, url)
+        _indicator_memo.set(key, hits)
+    matched_indicators = list(hits)
     
     confidence = min(1.0, len(matched_indicators) * 0.3)  # Each indicator adds 0.3
     is_paywall = len(matched_indicators) >= 2 or confidence >= 0.6
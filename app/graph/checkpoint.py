@@ -1,6 +1,8 @@
 """Postgres checkpointer setup for LangGraph persistence."""
 import os
 import logging
+import threading
+from typing import Optional
 from langgraph.checkpoint.postgres import PostgresSaver
 from langgraph.checkpoint.memory import MemorySaver
 from psycopg_pool import ConnectionPool
@@ -8,6 +10,10 @@ from psycopg.rows import dict_row
 
 logger = logging.getLogger(__name__)
 
+# Process-wide checkpointer, created on first use
+_checkpointer: Optional[MemorySaver] = None
+_checkpointer_lock = threading.Lock()
+
 
 def get_database_url() -> str:
     """Get database URL from environment variable."""
@@ -24,16 +30,32 @@ def create_checkpointer():
     Uses MemorySaver for now due to PostgresSaver NotImplementedError bug.
     TODO: Fix PostgresSaver once langgraph-checkpoint-postgres is updated.
     
+    The checkpointer is created once and reused by later calls (see
+    reset_checkpointer).
+    
     Returns:
         MemorySaver instance (in-memory persistence)
     """
-    # Temporarily use MemorySaver due to PostgresSaver NotImplementedError bug
-    # PostgresSaver has a bug where aget_tuple raises NotImplementedError
-    # Once langgraph-checkpoint-postgres is fixed, we can switch back to PostgresSaver
-    logger.info("Using MemorySaver checkpointer (in-memory persistence)")
-    logger.info("Note: PostgresSaver has NotImplementedError bug, using MemorySaver as workaround")
-    
-    checkpointer = MemorySaver()
-    logger.info("MemorySaver checkpointer created")
+    global _checkpointer
+    checkpointer = _checkpointer
+    if checkpointer is not None:
+        return checkpointer
     
-    return checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            # Temporarily use MemorySaver due to PostgresSaver NotImplementedError bug
+            # PostgresSaver has a bug where aget_tuple raises NotImplementedError
+            # Once langgraph-checkpoint-postgres is fixed, we can switch back to PostgresSaver
+            logger.info("Using MemorySaver checkpointer (in-memory persistence)")
+            logger.info("Note: PostgresSaver has NotImplementedError bug, using MemorySaver as workaround")
+            
+            _checkpointer = MemorySaver()
+            logger.info("MemorySaver checkpointer created")
+        return _checkpointer
+
+
+def reset_checkpointer() -> None:
+    """Drop the shared checkpointer so the next create_checkpointer starts fresh."""
+    global _checkpointer
+    with _checkpointer_lock:
+        _checkpointer = None
@@ -2,17 +2,36 @@
 Content Fetcher Worker Node
 Fetches actual content from discovered sources in priority order.
 """
+import asyncio
+import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
+from app.graph.formatting import RESPONSE_CHAR_BUDGET, ResponseBuilder
 from app.graph.state import AgentState
 from app.kg.source_fetcher import gather_domain_content_prioritized
 from app.kg.source_discovery import discover_sources_for_domain
 from app.llm.tiering import get_llm_for_task
 from app.security.prompt_injection import wrap_untrusted_content
-from app.validation.agent_outputs import validate_content_fetcher_parsed, ValidationError
+from app.validation.agent_outputs import extract_json_object, validate_content_fetcher_parsed, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# "for/about/on <Capitalized Name>" with up to four capitalized words, e.g. "for Linear Algebra"
+_DOMAIN_RE = re.compile(r"\b(?:for|about|on)\s+([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+){0,3})\b")
+
+# Explicit "max_sources=5" / "min_priority: 0.3" overrides in a plain-text request
+_MAX_SOURCES_RE = re.compile(r"\bmax_sources\s*[=:]\s*(\d+)")
+_MIN_PRIORITY_RE = re.compile(r"\bmin_priority\s*[=:]\s*(\d+(?:\.\d+)?)")
+
+# Requests at most this long (and without JSON) are parsed without the LLM
+SIMPLE_REQUEST_MAX_CHARS = 200
+# What may follow the domain in a simple request (whitespace, sentence punctuation)
+_TRAILING_CHARS = " \t\r\n.!?"
+
+# Upper bound on sources fetched at once across all domains of one request
+MAX_CONCURRENT_SOURCE_FETCHES = 40
+
 CONTENT_FETCHING_PROMPT = """You are helping to fetch content from sources for a domain.
 
 User request: {user_input}
@@ -30,6 +49,9 @@ Respond in JSON:
 }}
 """
 
+# CONTENT_FETCHING_PROMPT split around {user_input}, braces unescaped; concatenated per request instead of str.format
+_PROMPT_HEAD, _, _PROMPT_TAIL = CONTENT_FETCHING_PROMPT.format(user_input="\x00").partition("\x00")
+
 
 async def content_fetcher_node(state: AgentState) -> Dict[str, Any]:
     """
@@ -41,143 +63,78 @@ async def content_fetcher_node(state: AgentState) -> Dict[str, Any]:
     Output: fetched_content with source content
     """
     user_input = state.get("user_input", "")
-    logger.info(f"Content fetching request: {user_input[:100]}...")
+    logger.info("Content fetching request: %.100s...", user_input)
     
     # Check if we have discovered sources in state
-    discovered_sources = state.get("discovered_sources", {})
-    
-    # Cheap tier: classification for domain/params extraction
-    domain = (state.get("discovered_sources") or {}).get("domains", [None])[0] if isinstance(state.get("discovered_sources"), dict) else None
-    llm = get_llm_for_task("classification", domain=domain, queue="content_fetch", agent="content_fetcher")
+    discovered_sources = state.get("discovered_sources")
+    if not isinstance(discovered_sources, dict):
+        discovered_sources = {}
     
-    if not llm:
-        domains = extract_domains_from_text(user_input)
-        max_sources = 10
-        min_priority = 0.0
-    else:
-        safe_input = wrap_untrusted_content(user_input, max_length=10_000)
-        prompt = CONTENT_FETCHING_PROMPT.format(user_input=safe_input)
-    try:
+    # Short requests like "fetch content for Algebra" are parsed directly, skipping the LLM round trip
+    params = parse_simple_request(user_input)
+    if params is None:
+        # Cheap tier: classification for domain/params extraction
+        domain = (discovered_sources.get("domains") or (None,))[0]
+        llm = get_llm_for_task("classification", domain=domain, queue="content_fetch", agent="content_fetcher")
         if llm:
-            response = await llm.ainvoke(prompt)
-            if hasattr(response, 'content'):
-                content = response.content
-            else:
-                content = str(response)
-            import json
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                try:
-                    parsed = validate_content_fetcher_parsed(parsed)
-                except ValidationError as ve:
-                    logger.warning(f"Content fetcher parsed output validation: {ve}; using defaults")
-                    parsed = {"domains": [], "max_sources": 10, "min_priority": 0.0}
-                domains = parsed.get("domains", [])
-                max_sources = parsed.get("max_sources", 10)
-                min_priority = parsed.get("min_priority", 0.0)
-            else:
-                domains = extract_domains_from_text(user_input)
-                max_sources = 10
-                min_priority = 0.0
-        else:
-            pass  # domains, max_sources, min_priority set above
-    except Exception as e:
-        logger.warning(f"Failed to parse LLM response: {e}, using fallback")
-        domains = extract_domains_from_text(user_input)
-        max_sources = 10
-        min_priority = 0.0
+            params = await _llm_fetch_params(llm, user_input)
+    if params is None:
+        params = {"domains": extract_domains_from_text(user_input), "max_sources": 10, "min_priority": 0.0}
+    domains = params["domains"]
+    max_sources = params["max_sources"]
+    min_priority = params["min_priority"]
     
     if not domains:
         return {
             "final_response": f"❌ Could not identify domain(s) from: {user_input}\n\nPlease specify a domain, e.g., 'fetch content for Algebra'"
         }
     
-    # Use discovered sources if available, otherwise discover new ones
-    all_fetched = {}
-    
-    for domain in domains:
-        logger.info(f"Fetching content for domain: {domain}")
-        
-        # Get sources for this domain
-        if discovered_sources and domain in discovered_sources.get("sources_by_domain", {}):
-            sources = discovered_sources["sources_by_domain"][domain]["sources"]
-        else:
-            # Discover sources first
-            discovery_result = await discover_sources_for_domain(domain_name=domain, max_sources=max_sources * 2)
-            sources = discovery_result["sources"]
-        
-        # Fetch content in priority order
-        fetch_result = await gather_domain_content_prioritized(
-            sources=sources,
-            domain_name=domain,
-            max_sources=max_sources,
-            min_priority=min_priority
-        )
-        
-        all_fetched[domain] = fetch_result
+    # Domains are independent: run each domain's discover+fetch pipeline concurrently,
+    # admitting only as many domains as fit in the per-request source budget
+    semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_SOURCE_FETCHES // max(1, max_sources)))
     
-    # Format response
-    response_parts = []
-    response_parts.append(f"📥 Content Fetching Results\n")
-    response_parts.append(f"{'='*60}\n")
+    sources_by_domain = discovered_sources.get("sources_by_domain") or {}
     
-    for domain, result in all_fetched.items():
-        fetched_sources = result["fetched_sources"]
-        stats = result["statistics"]
-        
-        response_parts.append(f"\n🔍 Domain: {domain}")
-        response_parts.append(f"   Sources Fetched: {stats['successful_fetches']}/{stats['total_sources']}")
-        response_parts.append(f"   Free Sources: {stats['free_sources']} | Paid: {stats['paid_sources']}")
-        response_parts.append(f"   Total Content: {stats['total_content_length']:,} characters")
-        response_parts.append(f"   Average Quality: {stats['average_quality']:.3f}")
-        response_parts.append(f"   Average Priority: {stats['average_priority']:.3f}")
-        
-        # Show fetched sources
-        response_parts.append(f"\n   Fetched Sources (priority order):")
-        for i, source in enumerate(fetched_sources[:5], 1):
-            props = source.get("properties", {})
-            title = props.get("title", "Unknown")
-            quality = source.get("quality_score", 0)
-            cost_tier = source.get("cost_tier", "unknown")
-            priority = source.get("priority_score", 0)
-            fetched = source.get("fetched_content", {})
-            accessible = fetched.get("accessible", False)
-            
-            status = "✅" if accessible else "❌"
-            cost_label = "FREE" if source.get("cost_score", 1.0) == 0.0 else f"${cost_tier.upper()}"
-            
-            response_parts.append(f"   {i}. {status} {title}")
-            response_parts.append(f"      Quality: {quality:.3f} | Cost: {cost_label} | Priority: {priority:.3f}")
+    async def _fetch_one(domain: str) -> Dict[str, Any]:
+        async with semaphore:
+            logger.info("Fetching content for domain: %s", domain)
             
-            if accessible:
-                content = fetched.get("content", "")
-                content_preview = content[:200] + "..." if len(content) > 200 else content
-                response_parts.append(f"      Content preview: {content_preview}")
+            # Use discovered sources if available, otherwise discover new ones
+            if domain in sources_by_domain:
+                sources = sources_by_domain[domain]["sources"]
             else:
-                error = fetched.get("metadata", {}).get("error", "Unknown error")
-                response_parts.append(f"      Error: {error}")
-        
-        # Recommendations
-        if result.get("recommendations"):
-            response_parts.append(f"\n   ⚠️  Recommendations:")
-            for rec in result["recommendations"]:
-                response_parts.append(f"      • {rec}")
+                discovery_result = await discover_sources_for_domain(domain_name=domain, max_sources=max_sources * 2)
+                sources = discovery_result["sources"]
+            
+            # Fetch content in priority order
+            return await gather_domain_content_prioritized(
+                sources=sources,
+                domain_name=domain,
+                max_sources=max_sources,
+                min_priority=min_priority
+            )
+    
+    results = await asyncio.gather(*[_fetch_one(domain) for domain in domains], return_exceptions=True)
+    
+    all_fetched = {}
+    for domain, fetch_result in zip(domains, results):
+        if isinstance(fetch_result, BaseException):
+            # BaseException: gather returns CancelledError as a result too
+            err = str(fetch_result) or type(fetch_result).__name__
+            logger.error(f"Content fetching failed for domain {domain}: {err}")
+            all_fetched[domain] = {
+                "fetched_sources": [],
+                "statistics": {"successful_fetches": 0, "failed_fetches": 0, "free_sources": 0},
+                "error": err,
+            }
+            continue
+        all_fetched[domain] = fetch_result
     
     # Summary
     total_fetched = sum(r["statistics"]["successful_fetches"] for r in all_fetched.values())
     total_failed = sum(r["statistics"]["failed_fetches"] for r in all_fetched.values())
     total_free = sum(r["statistics"]["free_sources"] for r in all_fetched.values())
     
-    response_parts.append(f"\n{'='*60}")
-    response_parts.append(f"\n📊 Summary:")
-    response_parts.append(f"   Domains: {len(domains)}")
-    response_parts.append(f"   Successfully Fetched: {total_fetched}")
-    response_parts.append(f"   Failed: {total_failed}")
-    response_parts.append(f"   Free Sources: {total_free}")
-    response_parts.append(f"\n💡 Content is ready for extraction and ingestion into the knowledge graph")
-    
     # Store fetched content in state
     fetched_content = {
         "domains": domains,
@@ -191,14 +148,144 @@ async def content_fetcher_node(state: AgentState) -> Dict[str, Any]:
     
     return {
         "fetched_content": fetched_content,
-        "final_response": "\n".join(response_parts)
+        "final_response": _format_fetch(all_fetched, domains, fetched_content["statistics"])
     }
 
 
+def _fetched_source_row(i: int, source: Dict[str, Any]) -> List[str]:
+    get = source.get
+    title = (get("properties") or {}).get("title", "Unknown")
+    quality = get("quality_score", 0)
+    cost_tier = get("cost_tier", "unknown")
+    priority = get("priority_score", 0)
+    fetched = get("fetched_content") or {}
+    accessible = fetched.get("accessible", False)
+    
+    status = "✅" if accessible else "❌"
+    cost_label = "FREE" if get("cost_score", 1.0) == 0.0 else f"${cost_tier.upper()}"
+    
+    row = [
+        f"   {i}. {status} {title}",
+        f"      Quality: {quality:.3f} | Cost: {cost_label} | Priority: {priority:.3f}",
+    ]
+    if accessible:
+        content = fetched.get("content", "")
+        content_preview = content[:200] + "..." if len(content) > 200 else content
+        row.append(f"      Content preview: {content_preview}")
+    else:
+        error = (fetched.get("metadata") or {}).get("error", "Unknown error")
+        row.append(f"      Error: {error}")
+    return row
+
+
+def _fetch_domain_header(domain: str, result: Dict[str, Any]) -> List[str]:
+    if "error" in result:
+        return [f"\n🔍 Domain: {domain}", f"   ❌ error — {result['error'][:40]}"]
+    stats = result["statistics"]
+    return [
+        f"\n🔍 Domain: {domain}",
+        f"   Sources Fetched: {stats['successful_fetches']}/{stats['total_sources']}",
+        f"   Free Sources: {stats['free_sources']} | Paid: {stats['paid_sources']}",
+        f"   Total Content: {stats['total_content_length']:,} characters",
+        f"   Average Quality: {stats['average_quality']:.3f}",
+        f"   Average Priority: {stats['average_priority']:.3f}",
+        f"\n   Fetched Sources (priority order):",
+    ]
+
+
+def _format_fetch(
+    all_fetched: Dict[str, Dict[str, Any]],
+    domains: List[str],
+    totals: Dict[str, int],
+    budget: int = RESPONSE_CHAR_BUDGET,
+) -> str:
+    """Format fetch results for chat; domains and source rows past the budget are summarized."""
+    failed_domains = sum(1 for result in all_fetched.values() if "error" in result)
+    summary = [
+        f"\n{'='*60}",
+        f"\n📊 Summary:",
+        f"   Domains: {len(domains)}" + (f" ({failed_domains} failed)" if failed_domains else ""),
+        f"   Successfully Fetched: {totals['total_fetched']}",
+        f"   Failed: {totals['total_failed']}",
+        f"   Free Sources: {totals['total_free']}",
+        f"\n💡 Content is ready for extraction and ingestion into the knowledge graph",
+    ]
+    
+    # The summary is always shown, so domain blocks get what is left of the budget
+    out = ResponseBuilder(budget - sum(len(line) + 1 for line in summary))
+    out.add(f"📥 Content Fetching Results\n")
+    out.add(f"{'='*60}\n")
+    
+    for shown, (domain, result) in enumerate(all_fetched.items()):
+        if not out.add_block(_fetch_domain_header(domain, result)):
+            out.add(f"\n… {len(all_fetched) - shown} more domains")
+            break
+        if "error" in result:
+            continue
+        
+        # Show fetched sources
+        out.add_rows(result["fetched_sources"][:5], _fetched_source_row)
+        
+        # Recommendations
+        if result.get("recommendations"):
+            out.add(f"\n   ⚠️  Recommendations:")
+            out.add_rows(result["recommendations"], lambda i, rec: [f"      • {rec}"], indent="      ")
+    
+    for line in summary:
+        out.add(line)
+    return out.build()
+
+
+async def _llm_fetch_params(llm, user_input: str) -> Optional[Dict[str, Any]]:
+    """Ask the LLM for fetch params; None means fall back to text extraction."""
+    safe_input = wrap_untrusted_content(user_input, max_length=10_000)
+    prompt = _PROMPT_HEAD + safe_input + _PROMPT_TAIL
+    try:
+        response = await llm.ainvoke(prompt)
+        content = response.content if hasattr(response, 'content') else str(response)
+        json_text = extract_json_object(content)
+        if not json_text:
+            return None
+        parsed = json.loads(json_text)
+    except Exception as e:
+        logger.warning(f"Failed to parse LLM response: {e}, using fallback")
+        return None
+    try:
+        return validate_content_fetcher_parsed(parsed)
+    except ValidationError as ve:
+        logger.warning(f"Content fetcher parsed output validation: {ve}; using defaults")
+        return {"domains": [], "max_sources": 10, "min_priority": 0.0}
+
+
+def parse_simple_request(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a short plain-text fetch request without the LLM.
+    
+    Returns validated params (domains, max_sources, min_priority), or None if
+    the request is long, JSON-like, or is not exactly one trailing domain (e.g.
+    "for Algebra and Chemistry" goes to the LLM so no domain is dropped).
+    """
+    if len(text) >= SIMPLE_REQUEST_MAX_CHARS or "{" in text:
+        return None
+    rest = _MIN_PRIORITY_RE.sub("", _MAX_SOURCES_RE.sub("", text))
+    matches = list(_DOMAIN_RE.finditer(rest))
+    if len(matches) != 1:
+        return None
+    m = matches[0]
+    domain = m.group(1)
+    if len(domain) <= 2 or rest[m.end():].strip(_TRAILING_CHARS):
+        return None
+    parsed: Dict[str, Any] = {"domains": [domain]}
+    m = _MAX_SOURCES_RE.search(text)
+    if m:
+        parsed["max_sources"] = int(m.group(1))
+    m = _MIN_PRIORITY_RE.search(text)
+    if m:
+        parsed["min_priority"] = float(m.group(1))
+    return validate_content_fetcher_parsed(parsed)
+
+
 def extract_domains_from_text(text: str) -> list:
     """Extract domain names from text."""
     # Simple extraction - look for "for <domain>" pattern
-    import re
-    pattern = r'(?:for|about|on)\s+([A-Z][a-zA-Z\s]+?)(?:\s|$|,|and)'
-    matches = re.findall(pattern, text)
-    return [m.strip() for m in matches if len(m.strip()) > 2]
+    return [m for m in _DOMAIN_RE.findall(text) if len(m) > 2]
@@ -2,10 +2,13 @@
 Domain Scout Worker Node
 Discovers new domains not yet in the knowledge graph.
 """
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
+from app.graph.formatting import RESPONSE_CHAR_BUDGET, ResponseBuilder
+from app.cost.budget import BudgetExceededError
 from app.graph.state import AgentState
-from app.validation.agent_outputs import validate_domain_scout_output, ValidationError
+from app.validation.agent_outputs import extract_json_object, validate_domain_scout_output, ValidationError
 from app.kg.domain_scout import (
     scout_domains_from_free_sources,
     scout_social_media,
@@ -16,6 +19,15 @@ from app.llm.tiering import get_llm_for_task
 
 logger = logging.getLogger(__name__)
 
+# Bare scout commands carry no parameters; they run with defaults and skip the LLM
+SIMPLE_SCOUT_COMMANDS = frozenset({
+    "/scout",
+    "/scout domains",
+    "scout domains",
+    "scout new domains",
+    "find new domains",
+})
+
 SCOUT_PROMPT = """You are helping to scout for new educational domains.
 
 User request: {user_input}
@@ -33,6 +45,9 @@ Respond in JSON:
 }}
 """
 
+# SCOUT_PROMPT split around {user_input}, braces unescaped; concatenated per request instead of str.format
+_PROMPT_HEAD, _, _PROMPT_TAIL = SCOUT_PROMPT.format(user_input="\x00").partition("\x00")
+
 
 async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
     """
@@ -48,17 +63,20 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
     Output: discovered_domains with recommendations
     """
     user_input = state.get("user_input", "")
-    logger.info(f"Domain scouting request: {user_input[:100]}...")
+    logger.info("Domain scouting request: %.100s...", user_input)
     
-    # Mid tier: domain_scouting for intent/params
-    llm = get_llm_for_task("domain_scouting", domain=None, queue="domain_scout", agent="domain_scout")
+    if user_input.strip().lower() in SIMPLE_SCOUT_COMMANDS:
+        llm = None
+    else:
+        # Mid tier: domain_scouting for intent/params
+        llm = get_llm_for_task("domain_scouting", domain=None, queue="domain_scout", agent="domain_scout", tracked=True)
     
     if not llm:
         scout_free = True
         scout_social = True
         max_domains = 50
     else:
-        prompt = SCOUT_PROMPT.format(user_input=user_input)
+        prompt = _PROMPT_HEAD + user_input + _PROMPT_TAIL
     try:
         if llm:
             response = await llm.ainvoke(prompt)
@@ -66,11 +84,9 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
                 content = response.content
             else:
                 content = str(response)
-            import json
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
+            json_text = extract_json_object(content)
+            if json_text:
+                parsed = json.loads(json_text)
                 scout_free = parsed.get("scout_free", True)
                 scout_social = parsed.get("scout_social", True)
                 max_domains = parsed.get("max_domains", 50)
@@ -79,6 +95,9 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
                 scout_social = True
                 max_domains = 50
         # else: scout_free, scout_social, max_domains set above
+    except BudgetExceededError:
+        # Not a parse failure: the run must stop (parallel runs cancel the sibling agent)
+        raise
     except Exception as e:
         logger.warning(f"Failed to parse LLM response: {e}, using defaults")
         scout_free = True
@@ -96,11 +115,54 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
         max_domains_per_source=max_domains
     )
     
-    # Format response
-    response_parts = []
-    response_parts.append(f"🔍 Domain Scouting Results\n")
-    response_parts.append(f"{'='*60}\n")
-    response_parts.append(f"Existing domains in KG: {existing_count}\n")
+    # Store results in state
+    scouting_results = {
+        "free_educational": results.get("free_educational"),
+        "social_media": results.get("social_media"),
+        "combined": results.get("combined", {}),
+        "existing_domains_count": existing_count
+    }
+    
+    out = {
+        "scouting_results": scouting_results,
+        "final_response": _format_scout(results, existing_count)
+    }
+    try:
+        return validate_domain_scout_output(out)
+    except ValidationError as e:
+        logger.warning(f"Domain scout output validation failed: {e}")
+        return {
+            "error": str(e),
+            "final_response": f"❌ Validation error: {e}. Please try again."
+        }
+
+
+def _scout_row(i: int, domain: Dict[str, Any]) -> List[str]:
+    get = domain.get
+    name = get("domain_name", "Unknown")
+    confidence = get("confidence", 0)
+    source = get("source", "unknown")
+    return [f"   {i}. {name} (confidence: {confidence:.2f}, from: {source})"]
+
+
+def _recommended_row(i: int, domain: Dict[str, Any]) -> List[str]:
+    get = domain.get
+    name = get("domain_name", "Unknown")
+    confidence = get("confidence", 0)
+    source = get("source", "unknown")
+    context = get("context", "")
+    row = [f"   {i}. {name}", f"      Confidence: {confidence:.2f} | Source: {source}"]
+    if context:
+        row.append(f"      Context: {context[:100]}")
+    return row
+
+
+def _format_scout(results: Dict[str, Any], existing_count: int, budget: int = RESPONSE_CHAR_BUDGET) -> str:
+    """Format scouting results for chat; domain rows past the budget are summarized."""
+    out = ResponseBuilder(budget)
+    out.add(f"🔍 Domain Scouting Results\n")
+    out.add(f"{'='*60}\n")
+    out.add(f"Existing domains in KG: {existing_count}\n")
     
     # Free educational sources results
     if results.get("free_educational"):
@@ -108,26 +170,25 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
         free_stats = free_results.get("statistics", {})
         free_domains = free_results.get("discovered_domains", [])
         
-        response_parts.append(f"\n📚 Free Educational Sources:")
-        response_parts.append(f"   Sources Scouted: {free_stats.get('sources_scouted', 0)}")
-        response_parts.append(f"   Total Discovered: {free_stats.get('total_discovered', 0)}")
-        response_parts.append(f"   Unique New Domains: {free_stats.get('unique_domains', 0)}")
-        response_parts.append(f"   High Confidence: {free_stats.get('high_confidence', 0)}")
+        out.add(f"\n📚 Free Educational Sources:")
+        out.add(f"   Sources Scouted: {free_stats.get('sources_scouted', 0)}")
+        out.add(f"   Total Discovered: {free_stats.get('total_discovered', 0)}")
+        out.add(f"   Unique New Domains: {free_stats.get('unique_domains', 0)}")
+        out.add(f"   High Confidence: {free_stats.get('high_confidence', 0)}")
         
         if free_domains:
-            response_parts.append(f"\n   Top New Domains (high confidence):")
-            for i, domain in enumerate(free_domains[:10], 1):
-                name = domain.get("domain_name", "Unknown")
-                confidence = domain.get("confidence", 0)
-                source = domain.get("source", "unknown")
-                response_parts.append(f"   {i}. {name} (confidence: {confidence:.2f}, from: {source})")
+            out.add(f"\n   Top New Domains (high confidence):")
+            out.add_rows(free_domains[:10], _scout_row)
         
         # By source breakdown
         by_source = free_stats.get("by_source", {})
         if by_source:
-            response_parts.append(f"\n   Discovered by Source:")
-            for source, count in by_source.items():
-                response_parts.append(f"      {source}: {count} domains")
+            out.add(f"\n   Discovered by Source:")
+            out.add_rows(
+                list(by_source.items()),
+                lambda i, item: [f"      {item[0]}: {item[1]} domains"],
+                indent="      ",
+            )
     
     # Social media results
     if results.get("social_media"):
@@ -135,70 +196,39 @@ async def domain_scout_node(state: AgentState) -> Dict[str, Any]:
         social_stats = social_results.get("statistics", {})
         social_domains = social_results.get("discovered_domains", [])
         
-        response_parts.append(f"\n📱 Social Media:")
-        response_parts.append(f"   Sources Scouted: {social_stats.get('sources_scouted', 0)}")
-        response_parts.append(f"   Total Discovered: {social_stats.get('total_discovered', 0)}")
-        response_parts.append(f"   Unique New Domains: {social_stats.get('unique_domains', 0)}")
-        response_parts.append(f"   High Confidence: {social_stats.get('high_confidence', 0)}")
+        out.add(f"\n📱 Social Media:")
+        out.add(f"   Sources Scouted: {social_stats.get('sources_scouted', 0)}")
+        out.add(f"   Total Discovered: {social_stats.get('total_discovered', 0)}")
+        out.add(f"   Unique New Domains: {social_stats.get('unique_domains', 0)}")
+        out.add(f"   High Confidence: {social_stats.get('high_confidence', 0)}")
         
         if social_domains:
-            response_parts.append(f"\n   Top Trending Domains:")
-            for i, domain in enumerate(social_domains[:10], 1):
-                name = domain.get("domain_name", "Unknown")
-                confidence = domain.get("confidence", 0)
-                source = domain.get("source", "unknown")
-                response_parts.append(f"   {i}. {name} (confidence: {confidence:.2f}, from: {source})")
+            out.add(f"\n   Top Trending Domains:")
+            out.add_rows(social_domains[:10], _scout_row)
     
     # Combined results
     combined = results.get("combined", {})
     combined_domains = combined.get("discovered_domains", [])
     combined_stats = combined.get("statistics", {})
     
-    response_parts.append(f"\n{'='*60}")
-    response_parts.append(f"\n📊 Combined Results:")
-    response_parts.append(f"   Total Unique New Domains: {combined_stats.get('total_unique', 0)}")
-    response_parts.append(f"   From Free Sources: {combined_stats.get('from_free_sources', 0)}")
-    response_parts.append(f"   From Social Media: {combined_stats.get('from_social_media', 0)}")
+    out.add(f"\n{'='*60}")
+    out.add(f"\n📊 Combined Results:")
+    out.add(f"   Total Unique New Domains: {combined_stats.get('total_unique', 0)}")
+    out.add(f"   From Free Sources: {combined_stats.get('from_free_sources', 0)}")
+    out.add(f"   From Social Media: {combined_stats.get('from_social_media', 0)}")
     
     if combined_domains:
-        response_parts.append(f"\n   Top {min(15, len(combined_domains))} Recommended New Domains:")
-        for i, domain in enumerate(combined_domains[:15], 1):
-            name = domain.get("domain_name", "Unknown")
-            confidence = domain.get("confidence", 0)
-            source = domain.get("source", "unknown")
-            context = domain.get("context", "")
-            response_parts.append(f"   {i}. {name}")
-            response_parts.append(f"      Confidence: {confidence:.2f} | Source: {source}")
-            if context:
-                response_parts.append(f"      Context: {context[:100]}")
+        out.add(f"\n   Top {min(15, len(combined_domains))} Recommended New Domains:")
+        out.add_rows(combined_domains[:15], _recommended_row)
     
     # Recommendations
-    response_parts.append(f"\n💡 Recommendations:")
+    out.add(f"\n💡 Recommendations:")
     if combined_stats.get("total_unique", 0) > 0:
-        response_parts.append(f"   • {combined_stats['total_unique']} new domains discovered")
-        response_parts.append(f"   • Review high-confidence domains (≥0.7) for integration")
-        response_parts.append(f"   • Use '/ingest domain <name>' to add domains to taxonomy")
+        out.add(f"   • {combined_stats['total_unique']} new domains discovered")
+        out.add(f"   • Review high-confidence domains (≥0.7) for integration")
+        out.add(f"   • Use '/ingest domain <name>' to add domains to taxonomy")
     else:
-        response_parts.append(f"   • No new domains found - existing taxonomy is comprehensive")
-        response_parts.append(f"   • Try scouting different sources or social media platforms")
-    
-    # Store results in state
-    scouting_results = {
-        "free_educational": results.get("free_educational"),
-        "social_media": results.get("social_media"),
-        "combined": combined,
-        "existing_domains_count": existing_count
-    }
+        out.add(f"   • No new domains found - existing taxonomy is comprehensive")
+        out.add(f"   • Try scouting different sources or social media platforms")
     
-    out = {
-        "scouting_results": scouting_results,
-        "final_response": "\n".join(response_parts)
-    }
-    try:
-        return validate_domain_scout_output(out)
-    except ValidationError as e:
-        logger.warning(f"Domain scout output validation failed: {e}")
-        return {
-            "error": str(e),
-            "final_response": f"❌ Validation error: {e}. Please try again."
-        }
+    return out.build()
@@ -7,7 +7,9 @@ the user an update instead of requiring "gather sources for X" one by one.
 import asyncio
 import logging
 import os
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from itertools import chain, zip_longest
+from typing import Dict, Any, List, Optional, Tuple
 
 from app.graph.state import AgentState
 from app.kg.source_discovery import discover_sources_for_domain
@@ -16,6 +18,15 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_DOMAINS = 5
 DEFAULT_MAX_SOURCES_PER_DOMAIN = 10
+# Domains discovered concurrently per cycle (each fans out to several search APIs)
+DEFAULT_DISCOVERY_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=1)
+def _taxonomy_domain_names() -> Tuple[Tuple[str, ...], ...]:
+    """Domain names per taxonomy category, in taxonomy order (DOMAIN_TAXONOMY is fixed at import)."""
+    from app.kg.domains import DOMAIN_TAXONOMY
+    return tuple(tuple(DOMAIN_TAXONOMY[cat].keys()) for cat in DOMAIN_TAXONOMY)
 
 
 def get_domains_to_expand(max_domains: Optional[int] = None) -> List[str]:
@@ -27,36 +38,27 @@ def get_domains_to_expand(max_domains: Optional[int] = None) -> List[str]:
     explicit = os.getenv("EXPANSION_DOMAINS", "").strip()
     if explicit:
         domains = [d.strip() for d in explicit.split(",") if d.strip()][:max_domains]
-        logger.info(f"Expansion domains from config: {domains}")
+        logger.info("Expansion domains from config: %s", domains)
         return domains
 
     try:
-        from app.kg.domains import DOMAIN_TAXONOMY
+        names_by_category = _taxonomy_domain_names()
     except ImportError:
         logger.warning("DOMAIN_TAXONOMY not available, using fallback domains")
         return ["Algebra I", "Machine Learning", "Biology"][:max_domains]
 
     # Sample across categories (one domain per category, then fill)
     domains: List[str] = []
-    categories = list(DOMAIN_TAXONOMY.keys())
-    round_idx = 0
-    while len(domains) < max_domains:
-        added = 0
-        for cat in categories:
-            if len(domains) >= max_domains:
-                break
-            doms = list(DOMAIN_TAXONOMY[cat].keys())
-            if round_idx < len(doms):
-                name = doms[round_idx]
-                if name not in domains:
-                    domains.append(name)
-                    added += 1
-        if added == 0:
+    seen = set()
+    for name in chain.from_iterable(zip_longest(*names_by_category)):
+        if name is None or name in seen:
+            continue
+        seen.add(name)
+        domains.append(name)
+        if len(domains) >= max_domains:
             break
-        round_idx += 1
 
-    domains = domains[:max_domains]
-    logger.info(f"Expansion domains from taxonomy: {domains}")
+    logger.info("Expansion domains from taxonomy: %s", domains)
     return domains
 
 
@@ -67,7 +69,8 @@ async def run_expansion_cycle(
     """
     Run one expansion cycle: discover sources for multiple domains, aggregate stats.
     Returns dict with domains_explored, total_sources, with_primary_ids, free_sources,
-    by_domain, and update_message (text to send to user).
+    by_domain, by_domain_totals (source count per domain), and update_message
+    (text to send to user).
     """
     max_domains = max_domains or int(os.getenv("EXPANSION_MAX_DOMAINS", str(DEFAULT_MAX_DOMAINS)))
     max_sources = max_sources_per_domain or int(
@@ -76,34 +79,55 @@ async def run_expansion_cycle(
     domains = get_domains_to_expand(max_domains=max_domains)
 
     by_domain: Dict[str, Dict[str, Any]] = {}
-    all_sources: List[Dict[str, Any]] = []
+    by_domain_totals: Dict[str, int] = {}
+    total = 0
+    free = 0
     total_with_ids = 0
 
-    for domain in domains:
-        try:
-            result = await discover_sources_for_domain(
+    semaphore = asyncio.Semaphore(
+        int(os.getenv("EXPANSION_DISCOVERY_CONCURRENCY", str(DEFAULT_DISCOVERY_CONCURRENCY)))
+    )
+
+    async def discover_with_limit(domain: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await discover_sources_for_domain(
                 domain_name=domain,
                 max_sources=max_sources,
                 min_quality=0.5,
             )
-            sources = result.get("sources") or []
-            stats = result.get("statistics") or {}
-            by_domain[domain] = {
-                "sources": sources,
-                "total": len(sources),
-                "statistics": stats,
-            }
-            all_sources.extend(sources)
-            for s in sources:
-                ids = (s.get("properties") or {}).get("identifiers") or {}
-                if ids:
-                    total_with_ids += 1
-        except Exception as e:
-            logger.warning(f"Expansion failed for domain {domain}: {e}")
-            by_domain[domain] = {"sources": [], "total": 0, "statistics": {}, "error": str(e)}
 
-    total = len(all_sources)
-    free = sum(1 for s in all_sources if s.get("cost_score", 1.0) == 0.0)
+    # Domains are independent: run discovery concurrently, aggregate in domain order
+    results = await asyncio.gather(
+        *[discover_with_limit(domain) for domain in domains],
+        return_exceptions=True,
+    )
+
+    domain_lines: List[str] = []
+    for domain, result in zip(domains, results):
+        if isinstance(result, BaseException):
+            # BaseException: gather returns CancelledError as a result too
+            err = str(result) or type(result).__name__
+            logger.warning(f"Expansion failed for domain {domain}: {err}")
+            by_domain[domain] = {"sources": [], "total": 0, "statistics": {}, "error": err}
+            by_domain_totals[domain] = 0
+            domain_lines.append(f"• {domain}: error — {err[:40]}")
+            continue
+        sources = result.get("sources") or []
+        stats = result.get("statistics") or {}
+        by_domain[domain] = {
+            "sources": sources,
+            "total": len(sources),
+            "statistics": stats,
+        }
+        by_domain_totals[domain] = len(sources)
+        domain_lines.append(f"• {domain}: {len(sources)} sources")
+        total += len(sources)
+        for s in sources:
+            if s.get("cost_score", 1.0) == 0.0:
+                free += 1
+            if (s.get("properties") or {}).get("identifiers"):
+                total_with_ids += 1
+
     paid = total - free
 
     # Build update message for user
@@ -114,18 +138,10 @@ async def run_expansion_cycle(
         f"**Sources discovered:** {total} (free: {free}, paid: {paid})",
         f"**With primary IDs (DOI/arXiv/URL):** {total_with_ids}",
         "",
-    ]
-    for domain, data in by_domain.items():
-        n = data.get("total", 0)
-        err = data.get("error")
-        if err:
-            lines.append(f"• {domain}: error — {err[:40]}")
-        else:
-            lines.append(f"• {domain}: {n} sources")
-    lines.extend([
+        *domain_lines,
         "",
         "💡 **Next:** Run `/expand` again for more domains, or `/graph` for progress. Use `/fetch content for <domain>` then `/ingest` to add content.",
-    ])
+    ]
 
     update_message = "\n".join(lines)
     return {
@@ -135,7 +151,7 @@ async def run_expansion_cycle(
         "free_sources": free,
         "paid_sources": paid,
         "by_domain": by_domain,
-        "all_sources": all_sources,
+        "by_domain_totals": by_domain_totals,
         "update_message": update_message,
     }
 
@@ -145,30 +161,27 @@ async def expansion_node(state: AgentState) -> Dict[str, Any]:
     Autonomous expansion node: run one expansion cycle and return update to user.
     """
     chat_id = state.get("chat_id")
-    logger.info(f"Autonomous expansion run for chat {chat_id}")
+    logger.info("Autonomous expansion run for chat %s", chat_id)
 
     try:
         result = await run_expansion_cycle()
+        expansion_result = {
+            "domains_explored": result["domains_explored"],
+            "total_sources": result["total_sources"],
+            "with_primary_ids": result["with_primary_ids"],
+            "by_domain": {d: {"total": n} for d, n in result["by_domain_totals"].items()},
+        }
+        notes = state.get("working_notes")
         return {
             "final_response": result["update_message"],
-            "working_notes": {
-                **(state.get("working_notes") or {}),
-                "expansion_result": {
-                    "domains_explored": result["domains_explored"],
-                    "total_sources": result["total_sources"],
-                    "with_primary_ids": result["with_primary_ids"],
-                    "by_domain": {
-                        d: {"total": data["total"]}
-                        for d, data in result["by_domain"].items()
-                    },
-                },
-            },
+            "working_notes": {**notes, "expansion_result": expansion_result} if notes else {"expansion_result": expansion_result},
         }
     except Exception as e:
         logger.exception(f"Expansion cycle failed: {e}")
+        err = str(e)
         return {
-            "final_response": f"❌ Expansion run failed: {str(e)[:200]}. Try again or run `/gather sources for <domain>` for a single domain.",
-            "error": str(e)[:500],
+            "final_response": f"❌ Expansion run failed: {err[:200]}. Try again or run `/gather sources for <domain>` for a single domain.",
+            "error": err[:500],
         }
 
 
@@ -185,7 +198,7 @@ async def begin_node(state: AgentState) -> Dict[str, Any]:
     so the bot keeps iterating. User can just say "begin" or "start" to get going.
     """
     chat_id = state.get("chat_id")
-    logger.info(f"Begin flow for chat {chat_id}")
+    logger.info("Begin flow for chat %s", chat_id)
 
     try:
         result = await run_expansion_cycle()
@@ -210,7 +223,8 @@ async def begin_node(state: AgentState) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.exception(f"Begin flow failed: {e}")
+        err = str(e)
         return {
-            "final_response": BEGIN_INTRO + f"❌ First cycle failed: {str(e)[:200]}. Try again or say **continue**.",
-            "error": str(e)[:500],
+            "final_response": BEGIN_INTRO + f"❌ First cycle failed: {err[:200]}. Try again or say **continue**.",
+            "error": err[:500],
         }
@@ -0,0 +1,58 @@
+"""
+Chat response formatting for worker nodes.
+Keeps final_response within one Telegram message (4096 chars).
+"""
+from typing import Any, Callable, Iterable, List, Sequence
+
+# Room for fixed trailing sections (summary, recommendations) under Telegram's 4096-char limit
+RESPONSE_CHAR_BUDGET = 3800
+
+
+class ResponseBuilder:
+    """
+    Accumulates response lines, dropping list rows once the character budget is spent.
+
+    Headers and stats go through add() and are always kept; per-item rows go
+    through add_rows() and are rendered only while they fit, so large results
+    are never formatted just to be cut off. Repeated sections (one block per
+    domain) go through add_block(), which keeps a block only if all of it fits.
+    """
+
+    __slots__ = ("budget", "_lines", "_used")
+
+    def __init__(self, budget: int = RESPONSE_CHAR_BUDGET):
+        self.budget = budget
+        self._lines: List[str] = []
+        self._used = 0
+
+    def add(self, line: str) -> None:
+        self._lines.append(line)
+        self._used += len(line) + 1
+
+    def add_rows(
+        self,
+        items: Sequence[Any],
+        render: Callable[[int, Any], Iterable[str]],
+        indent: str = "   ",
+    ) -> None:
+        """Add render(i, item) lines for each item (1-based i); summarize the rest once over budget."""
+        for i, item in enumerate(items, 1):
+            row = list(render(i, item))
+            size = sum(len(line) + 1 for line in row)
+            if self._used + size > self.budget:
+                self.add(f"{indent}… {len(items) - i + 1} more")
+                return
+            self._lines.extend(row)
+            self._used += size
+
+    def add_block(self, lines: Sequence[str]) -> bool:
+        """Add all of lines if they fit in the budget; returns whether they were added."""
+        size = sum(len(line) + 1 for line in lines)
+        if self._used + size > self.budget:
+            return False
+        self._lines.extend(lines)
+        self._used += size
+        return True
+
+    def build(self) -> str:
+        return "\n".join(self._lines)
@@ -2,16 +2,22 @@
 Improvement Agent Node
 Handles conversational improvement requests and makes code changes.
 """
+import asyncio
+import difflib
+import hashlib
 import logging
 import os
 import subprocess
 import json
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from app.graph.state import AgentState
+from app.cost.cache import CacheType, get_cache
 from app.llm.client import get_llm_for_agent
-from app.validation.agent_outputs import validate_improvement_agent_output, ValidationError
+from app.llm.request_cache import get_plan_cache
+from app.validation.agent_outputs import extract_json_object, validate_improvement_agent_output, ValidationError
 from app.security.tools import require_tool, SecurityError
 
 logger = logging.getLogger(__name__)
@@ -19,36 +25,9 @@ logger = logging.getLogger(__name__)
 # Base directory for the project
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
-
-async def improvement_agent_node(state: AgentState) -> Dict[str, Any]:
-    """
-    Conversational agent that understands improvement requests and makes code changes.
-    
-    Capabilities:
-    - Understands natural language improvement requests
-    - Analyzes codebase to find relevant files
-    - Proposes and implements code changes
-    - Requests approval before committing
-    """
-    user_input = state.get("user_input", "")
-    chat_id = state.get("chat_id")
-    working_notes = state.get("working_notes") or {}
-    prior_context = working_notes.get("improvement_context") or working_notes.get("prior_improvement") or ""
-    
-    logger.info(f"Improvement agent processing request: {user_input[:100]}...")
-    
-    llm = get_llm_for_agent(state, agent_name="improvement_agent")
-    if not llm:
-        return {
-            "error": "No LLM configured",
-            "final_response": "❌ Improvement agent needs an LLM (set OPENAI_API_KEY or ANTHROPIC_API_KEY in Railway Variables)."
-        }
-
-    # Step 1: Understand the request and plan changes (include prior conversation if any)
-    analysis_prompt = f"""You are a code improvement agent. Analyze this user request and create a plan:
-
-User Request: {user_input}
-{f'Prior context from this conversation: {prior_context}' if prior_context else ''}
+# Static instructions go in the system message and the request in the user message,
+# so the prompt prefix is byte-identical across calls and providers can cache it.
+ANALYSIS_SYSTEM_PROMPT = """You are a code improvement agent. Analyze the user request and create a plan.
 
 Your task:
 1. Understand what improvement is being requested
@@ -63,7 +42,7 @@ Project Structure:
 - app/telegram/ - Telegram bot integration
 
 Respond in JSON format:
-{{
+{
     "understanding": "Brief summary of what the user wants",
     "files_to_modify": ["path/to/file1.py", "path/to/file2.py"],
     "files_to_read": ["path/to/file3.py"],  // Files to read for context
@@ -74,68 +53,10 @@ Respond in JSON format:
     ],
     "risk_level": "low|medium|high",  // Risk of breaking things
     "estimated_changes": "Brief description of code changes"
-}}
+}
 """
-    
-    try:
-        response = await llm.ainvoke(analysis_prompt)
-        if hasattr(response, 'content'):
-            content = response.content
-        else:
-            content = str(response)
-        
-        # Parse JSON response
-        import re
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            plan = json.loads(json_match.group())
-        else:
-            return {
-                "error": "Failed to parse improvement plan from LLM",
-                "final_response": "❌ Could not understand the improvement request. Please be more specific."
-            }
-    except Exception as e:
-        logger.error(f"Error analyzing improvement request: {e}")
-        return {
-            "error": str(e),
-            "final_response": f"❌ Error analyzing request: {str(e)[:200]}"
-        }
-    
-    # Step 2: Read relevant files for context
-    files_content = {}
-    files_to_read = plan.get("files_to_read", []) + plan.get("files_to_modify", [])
-    
-    for file_path in files_to_read:
-        full_path = PROJECT_ROOT / file_path
-        if full_path.exists() and full_path.is_file():
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    files_content[file_path] = f.read()
-            except Exception as e:
-                logger.warning(f"Could not read {file_path}: {e}")
-    
-    # Step 3: Generate code changes
-    if not plan.get("files_to_modify"):
-        return {
-            "final_response": f"✅ Analysis complete:\n\n{plan.get('understanding', 'No changes needed')}\n\nNo files need to be modified."
-        }
-    
-    # Generate changes for each file
-    proposed_changes = {}
-    
-    for file_path in plan.get("files_to_modify", []):
-        current_content = files_content.get(file_path, "")
-        
-        change_prompt = f"""Based on this improvement request and the current code, generate the modified code.
 
-User Request: {user_input}
-Improvement Plan: {json.dumps(plan, indent=2)}
-
-File to modify: {file_path}
-Current code:
-```python
-{current_content[:4000]}  # Limit to avoid token limits
-```
+CHANGE_SYSTEM_PROMPT = """Based on the improvement request and the current code, generate the modified code.
 
 Requirements:
 1. Make the requested improvement
@@ -145,39 +66,252 @@ Requirements:
 5. Preserve existing functionality
 6. Follow Python best practices
 
-Respond with ONLY the complete modified file content in a code block:
-```python
-// Complete file content here
-```
+Respond with one or more SEARCH/REPLACE blocks, not the whole file:
+<<<<<<< SEARCH
+exact existing lines to change (copied verbatim, with enough context to be unique)
+=======
+the new lines
+>>>>>>> REPLACE
+
+Each SEARCH section must match the current code exactly. To create a new file,
+use an empty SEARCH section and put the whole file in REPLACE.
 """
-        
+
+# Similarity a SEARCH section needs with the closest run of lines when it does not match exactly
+FUZZY_MATCH_THRESHOLD = 0.8
+
+# Changed hunks shown per file in the approval summary
+MAX_PREVIEW_HUNKS = 3
+MAX_PREVIEW_LINES = 4
+
+
+# Fenced code block in a change reply (```python or bare ```)
+_CODE_FENCE_RE = re.compile(r"```(?:python)?\n(.*?)\n```", re.DOTALL)
+
+
+def _model_class_name(llm) -> str:
+    """Class name of llm, or of the model behind a TrackedLLM wrapper."""
+    return type(getattr(llm, "_llm", llm)).__name__
+
+
+def _is_anthropic(llm) -> bool:
+    return _model_class_name(llm) == "ChatAnthropic"
+
+
+def _json_mode_kwargs(llm) -> Dict[str, Any]:
+    """ainvoke kwargs that make the provider return a bare JSON object (OpenAI JSON mode)."""
+    if _model_class_name(llm) == "ChatOpenAI":
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _parse_search_replace_blocks(text: str) -> List[Tuple[str, str]]:
+    """(search, replace) pairs from SEARCH/REPLACE blocks, parsed line by line."""
+    blocks: List[Tuple[str, str]] = []
+    state = "text"
+    search: List[str] = []
+    replace: List[str] = []
+    for line in text.splitlines():
+        marker = line.strip()
+        if state == "text":
+            if marker.startswith("<<<<<<<") and marker.endswith("SEARCH"):
+                search, replace = [], []
+                state = "search"
+        elif state == "search":
+            if marker == "=======":
+                state = "replace"
+            else:
+                search.append(line)
+        elif marker.startswith(">>>>>>>") and marker.endswith("REPLACE"):
+            blocks.append(("\n".join(search), "\n".join(replace)))
+            state = "text"
+        else:
+            replace.append(line)
+    return blocks
+
+
+def _fuzzy_replace(content: str, search: str, replace: str) -> Optional[str]:
+    """Replace the run of lines most similar to search, or None if nothing is close enough."""
+    lines = content.split("\n")
+    width = len(search.split("\n"))
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(search)  # seq2 is the one SequenceMatcher precomputes
+    best_ratio = FUZZY_MATCH_THRESHOLD
+    best_start = None
+    for start in range(max(1, len(lines) - width + 1)):
+        matcher.set_seq1("\n".join(lines[start:start + width]))
+        if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= best_ratio:
+            best_ratio, best_start = ratio, start
+    if best_start is None:
+        return None
+    lines[best_start:best_start + width] = replace.split("\n")
+    return "\n".join(lines)
+
+
+def _apply_search_replace(content: str, blocks: List[Tuple[str, str]], file_path: str) -> str:
+    """Apply SEARCH/REPLACE blocks in order; raises ValueError if a SEARCH section cannot be located."""
+    for search, replace in blocks:
+        if not search.strip():
+            # New file (or append to an existing one)
+            content = content.rstrip("\n") + "\n" + replace if content else replace
+        elif search in content:
+            content = content.replace(search, replace, 1)
+        else:
+            patched = _fuzzy_replace(content, search, replace)
+            if patched is None:
+                raise ValueError(f"SEARCH block not found in {file_path}: {search[:80]!r}")
+            content = patched
+    return content
+
+
+def _diff_hunks(original: str, new: str) -> List[Tuple[List[str], List[str]]]:
+    """(removed lines, added lines) for each changed region between two file versions."""
+    old_lines = original.split("\n")
+    new_lines = new.split("\n")
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [
+        (old_lines[i1:i2], new_lines[j1:j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _parse_json_reply(content: str) -> Optional[Dict[str, Any]]:
+    """
+    JSON object from an LLM reply: the whole reply in JSON mode, otherwise the
+    first top-level balanced {...} that parses (skipping prose like "{placeholders}").
+    """
+    try:
+        parsed = json.loads(content)
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+    while (candidate := extract_json_object(content)) is not None:
+        try:
+            parsed = json.loads(candidate)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        # Skip the whole failed candidate so none of its nested objects is taken for the plan
+        content = content[content.index("{") + len(candidate):]
+    return None
+
+
+def _prompt_messages(llm, system_prompt: str, request: str) -> List[BaseMessage]:
+    """
+    System + user messages for one call.
+    
+    OpenAI caches long identical prefixes automatically; Anthropic needs the
+    system block marked with cache_control.
+    """
+    if _is_anthropic(llm):
+        system = SystemMessage(content=[
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}},
+        ])
+    else:
+        system = SystemMessage(content=system_prompt)
+    return [system, HumanMessage(content=request)]
+
+
+async def improvement_agent_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Conversational agent that understands improvement requests and makes code changes.
+    
+    Capabilities:
+    - Understands natural language improvement requests
+    - Analyzes codebase to find relevant files
+    - Proposes and implements code changes
+    - Requests approval before committing
+    """
+    user_input = state.get("user_input", "")
+    chat_id = state.get("chat_id")
+    working_notes = state.get("working_notes") or {}
+    prior_context = working_notes.get("improvement_context") or working_notes.get("prior_improvement") or ""
+    
+    logger.info(f"Improvement agent processing request: {user_input[:100]}...")
+    
+    llm = get_llm_for_agent(state, agent_name="improvement_agent")
+    if not llm:
+        return {
+            "error": "No LLM configured",
+            "final_response": "❌ Improvement agent needs an LLM (set OPENAI_API_KEY or ANTHROPIC_API_KEY in Railway Variables)."
+        }
+
+    # Step 1: Understand the request and plan changes (include prior conversation if any)
+    analysis_request = f"User Request: {user_input}"
+    if prior_context:
+        analysis_request += f"\nPrior context from this conversation: {prior_context}"
+    
+    # A repeated request (same words after normalization) in the same context reuses the earlier plan
+    plan_cache = get_plan_cache()
+    plan = plan_cache.get(user_input, context=prior_context)
+    plan_from_cache = plan is not None
+    if plan_from_cache:
+        logger.info("Improvement plan served from cache")
+    else:
         try:
-            response = await llm.ainvoke(change_prompt)
+            response = await llm.ainvoke(
+                _prompt_messages(llm, ANALYSIS_SYSTEM_PROMPT, analysis_request),
+                **_json_mode_kwargs(llm),
+            )
             if hasattr(response, 'content'):
-                modified_content = response.content
+                content = response.content
             else:
-                modified_content = str(response)
+                content = str(response)
             
-            # Extract code from markdown code block
-            code_match = re.search(r'```python\n(.*?)\n```', modified_content, re.DOTALL)
-            if code_match:
-                proposed_changes[file_path] = code_match.group(1)
-            else:
-                # Try without language tag
-                code_match = re.search(r'```\n(.*?)\n```', modified_content, re.DOTALL)
-                if code_match:
-                    proposed_changes[file_path] = code_match.group(1)
-                else:
-                    # Use entire response if no code block found
-                    proposed_changes[file_path] = modified_content.strip()
-            
-            logger.info(f"Generated changes for {file_path}")
+            plan = _parse_json_reply(content)
+            if plan is None:
+                return {
+                    "error": "Failed to parse improvement plan from LLM",
+                    "final_response": "❌ Could not understand the improvement request. Please be more specific."
+                }
         except Exception as e:
-            logger.error(f"Error generating changes for {file_path}: {e}")
+            logger.error(f"Error analyzing improvement request: {e}")
+            return {
+                "error": str(e),
+                "final_response": f"❌ Error analyzing request: {str(e)[:200]}"
+            }
+    
+    # Step 2: Read relevant files for context
+    # Reads run in worker threads, concurrently and off the event loop; files listed twice are read once
+    files_to_read = dict.fromkeys(plan.get("files_to_read", []) + plan.get("files_to_modify", []))
+    read_results = await asyncio.gather(*[asyncio.to_thread(_read_file, f) for f in files_to_read])
+    files_content = {file_path: content for file_path, content in read_results if content is not None}
+    
+    # Step 3: Generate code changes
+    if not plan.get("files_to_modify"):
+        return {
+            "final_response": f"✅ Analysis complete:\n\n{plan.get('understanding', 'No changes needed')}\n\nNo files need to be modified."
+        }
+    
+    # Generate changes for all files concurrently (bounded to respect provider rate limits)
+    files_to_modify = plan.get("files_to_modify", [])
+    semaphore = asyncio.Semaphore(int(os.getenv("IMPROVE_LLM_CONCURRENCY", "4")))
+    
+    async def generate_with_limit(file_path: str) -> str:
+        async with semaphore:
+            return await _generate_change(llm, file_path, files_content.get(file_path, ""), user_input, plan)
+    
+    results = await asyncio.gather(
+        *[generate_with_limit(file_path) for file_path in files_to_modify],
+        return_exceptions=True,
+    )
+    
+    proposed_changes = {}
+    for file_path, result in zip(files_to_modify, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error generating changes for {file_path}: {result}")
             return {
-                "error": f"Failed to generate changes for {file_path}: {str(e)}",
-                "final_response": f"❌ Error generating code changes: {str(e)[:200]}"
+                "error": f"Failed to generate changes for {file_path}: {str(result)}",
+                "final_response": f"❌ Error generating code changes: {str(result)[:200]}"
             }
+        proposed_changes[file_path] = result
+        logger.info(f"Generated changes for {file_path}")
     
     # Step 4: Create diff summary
     diff_summary = create_diff_summary(files_content, proposed_changes, plan)
@@ -188,17 +322,98 @@ Respond with ONLY the complete modified file content in a code block:
         "improvement_plan": plan,
         "approval_required": True,
         "crucial_decision_type": "code_change",
-        "diff_id": f"improve_{hash(user_input) % 10000}",
+        "diff_id": make_diff_id(user_input, proposed_changes),
         "final_response": diff_summary
     }
     try:
-        return validate_improvement_agent_output(out)
+        validated = validate_improvement_agent_output(out)
     except ValidationError as e:
         logger.warning(f"Improvement agent output validation failed: {e}")
         return {
             "error": str(e),
             "final_response": f"❌ Validation error: {e}. Please try again with a clearer request."
         }
+    
+    # Only plans that produced valid changes are worth reusing
+    if not plan_from_cache:
+        plan_cache.set(user_input, plan, context=prior_context)
+    return validated
+
+
+def make_diff_id(user_input: str, proposed_changes: Dict[str, str]) -> str:
+    """
+    Stable id for a proposed change set, derived from its content.
+    
+    Same request and changes give the same id in every process (unlike the
+    salted built-in hash), and distinct proposals do not collide in practice.
+    """
+    payload = json.dumps({"u": user_input, "p": proposed_changes}, sort_keys=True).encode("utf-8")
+    return "improve_" + hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def _read_file(file_path: str) -> Tuple[str, Optional[str]]:
+    """(file_path, content) for a project file; content is None if missing or unreadable."""
+    full_path = PROJECT_ROOT / file_path
+    if not full_path.is_file():
+        return file_path, None
+    try:
+        return file_path, full_path.read_text(encoding='utf-8')
+    except Exception as e:
+        logger.warning(f"Could not read {file_path}: {e}")
+        return file_path, None
+
+
+def _change_cache_key(file_path: str, current_content: str, user_input: str, plan: Dict[str, Any]) -> str:
+    """Digest of everything the generated file depends on (content-addressed, so edits miss)."""
+    return hashlib.sha256(b"\x00".join([
+        file_path.encode("utf-8"),
+        current_content.encode("utf-8"),
+        user_input.encode("utf-8"),
+        json.dumps(plan, sort_keys=True).encode("utf-8"),
+    ])).hexdigest()
+
+
+async def _generate_change(llm, file_path: str, current_content: str, user_input: str, plan: Dict[str, Any]) -> str:
+    """
+    Ask the LLM for SEARCH/REPLACE edits to one file and apply them locally.
+    
+    Only the edits travel over the wire; a reply without blocks is taken as
+    the whole file (fenced or bare). Results are cached by (file path, current content, request, plan), so a
+    retried request regenerates nothing.
+    """
+    cache = get_cache()
+    cache_key = _change_cache_key(file_path, current_content, user_input, plan)
+    cached_change = cache.get(CacheType.CODE_CHANGE, cache_key)
+    if cached_change is not None:
+        logger.info(f"Using cached changes for {file_path}")
+        return cached_change
+    
+    change_request = f"""User Request: {user_input}
+Improvement Plan: {json.dumps(plan, indent=2)}
+
+File to modify: {file_path}
+Current code:
+```python
+{current_content[:4000]}  # Limit to avoid token limits
+```
+"""
+    
+    response = await llm.ainvoke(_prompt_messages(llm, CHANGE_SYSTEM_PROMPT, change_request))
+    if hasattr(response, 'content'):
+        modified_content = response.content
+    else:
+        modified_content = str(response)
+    
+    blocks = _parse_search_replace_blocks(modified_content)
+    if blocks:
+        change = _apply_search_replace(current_content, blocks, file_path)
+    else:
+        # Whole-file reply: extract code from markdown code block (entire response if none found)
+        code_match = _CODE_FENCE_RE.search(modified_content)
+        change = code_match.group(1) if code_match else modified_content.strip()
+    
+    cache.set(CacheType.CODE_CHANGE, change, None, cache_key)
+    return change
 
 
 def create_diff_summary(
@@ -215,23 +430,23 @@ def create_diff_summary(
     
     for file_path, new_content in proposed_changes.items():
         original_content = original_files.get(file_path, "")
-        original_lines = len(original_content.split('\n')) if original_content else 0
-        new_lines = len(new_content.split('\n'))
+        original_lines = original_content.count('\n') + 1 if original_content else 0
+        new_lines = new_content.count('\n') + 1
         
         summary_parts.append(f"\n**{file_path}**")
         summary_parts.append(f"  • Lines: {original_lines} → {new_lines}")
         
-        # Show key changes (first 10 lines of diff)
+        # Show the changed regions (what the SEARCH/REPLACE blocks did)
         if original_content:
-            original_lines_list = original_content.split('\n')[:5]
-            new_lines_list = new_content.split('\n')[:5]
-            
-            summary_parts.append(f"  • Preview:")
-            for i, (old_line, new_line) in enumerate(zip(original_lines_list, new_lines_list)):
-                if old_line != new_line:
+            hunks = _diff_hunks(original_content, new_content)
+            summary_parts.append(f"  • Changes: {len(hunks)} block(s)")
+            for removed, added in hunks[:MAX_PREVIEW_HUNKS]:
+                for old_line in removed[:MAX_PREVIEW_LINES]:
                     summary_parts.append(f"    - {old_line[:60]}")
+                for new_line in added[:MAX_PREVIEW_LINES]:
                     summary_parts.append(f"    + {new_line[:60]}")
-                    break
+            if len(hunks) > MAX_PREVIEW_HUNKS:
+                summary_parts.append(f"    … {len(hunks) - MAX_PREVIEW_HUNKS} more")
     
     summary_parts.append(f"\n\n**Plan:**")
     for step in plan.get("plan", [])[:5]:
@@ -243,6 +458,22 @@ def create_diff_summary(
     return "\n".join(summary_parts)
 
 
+# Bytes of git stderr decoded for error messages (callers show at most a couple hundred chars)
+GIT_ERROR_MAX_BYTES = 512
+
+
+def _git_env() -> Dict[str, str]:
+    """Environment for git subprocesses: fail instead of waiting on a credential prompt."""
+    return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+
+def _git_error_text(e: subprocess.CalledProcessError) -> str:
+    """Start of a failed git command's stderr (output is kept as bytes; only this prefix is decoded)."""
+    if e.stderr:
+        return e.stderr[:GIT_ERROR_MAX_BYTES].decode("utf-8", "replace")
+    return str(e)
+
+
 async def apply_improvements(state: AgentState) -> Dict[str, Any]:
     """
     Apply the approved code improvements.
@@ -278,8 +509,7 @@ async def apply_improvements(state: AgentState) -> Dict[str, Any]:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Write new content
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            full_path.write_text(new_content, encoding='utf-8')
             
             applied_files.append(file_path)
             logger.info(f"Applied changes to {file_path}")
@@ -309,7 +539,8 @@ async def apply_improvements(state: AgentState) -> Dict[str, Any]:
             ["git", "add"] + [str(PROJECT_ROOT / f) for f in applied_files],
             cwd=PROJECT_ROOT,
             check=True,
-            capture_output=True
+            capture_output=True,
+            env=_git_env()
         )
         
         # Commit
@@ -318,7 +549,8 @@ async def apply_improvements(state: AgentState) -> Dict[str, Any]:
             ["git", "commit", "-m", commit_message],
             cwd=PROJECT_ROOT,
             check=True,
-            capture_output=True
+            capture_output=True,
+            env=_git_env()
         )
         
         logger.info(f"Committed changes: {commit_message}")
@@ -327,17 +559,17 @@ async def apply_improvements(state: AgentState) -> Dict[str, Any]:
         push_success = False
         push_error = None
         try:
-            push_result = subprocess.run(
+            subprocess.run(
                 ["git", "push"],
                 cwd=PROJECT_ROOT,
                 check=True,
                 capture_output=True,
-                text=True
+                env=_git_env()
             )
             push_success = True
             logger.info("Pushed changes to GitHub successfully")
         except subprocess.CalledProcessError as e:
-            push_error = e.stderr if e.stderr else str(e)
+            push_error = _git_error_text(e)
             logger.warning(f"Git push failed: {push_error}")
         
         if push_success:
@@ -402,12 +634,12 @@ async def push_changes_node(state: AgentState) -> Dict[str, Any]:
     Push committed changes to GitHub.
     """
     try:
-        result = subprocess.run(
+        subprocess.run(
             ["git", "push"],
             cwd=PROJECT_ROOT,
             check=True,
             capture_output=True,
-            text=True
+            env=_git_env()
         )
         
         logger.info("Successfully pushed changes to GitHub")
@@ -420,7 +652,7 @@ async def push_changes_node(state: AgentState) -> Dict[str, Any]:
             )
         }
     except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
+        error_msg = _git_error_text(e)
         logger.error(f"Git push failed: {error_msg}")
         
         # Check if there are uncommitted changes
@@ -428,7 +660,7 @@ async def push_changes_node(state: AgentState) -> Dict[str, Any]:
             ["git", "status", "--porcelain"],
             cwd=PROJECT_ROOT,
             capture_output=True,
-            text=True
+            env=_git_env()
         )
         
         has_uncommitted = bool(status_result.stdout.strip())
@@ -4,30 +4,36 @@ Runs multiple agents simultaneously with progress updates.
 """
 import logging
 import asyncio
+import re
 from typing import Dict, Any, List
 from app.graph.state import AgentState
 from app.graph.source_gatherer import source_gatherer_node
 from app.graph.domain_scout_worker import domain_scout_node
+from app.cost.budget import BudgetExceededError
 from app.telegram import send_message
 from app.kg.domains import DOMAIN_TAXONOMY
 import random
 
 logger = logging.getLogger(__name__)
 
+# "... for <domain>" as a whole word (not "form", "before", "Fortune")
+_FOR_DOMAIN_RE = re.compile(r"\bfor\b\s+(.+)", re.IGNORECASE | re.DOTALL)
+
+
+# Flattened once at import (DOMAIN_TAXONOMY is fixed); fallback if the taxonomy is empty
+_ALL_DOMAINS = tuple(
+    name
+    for domains in DOMAIN_TAXONOMY.values()
+    if isinstance(domains, dict)
+    for name in domains.keys()
+) or ("Machine Learning",)
+
 
 def get_random_domain() -> str:
     """
     Pick a random domain from the taxonomy.
     """
-    all_domains = []
-    for category, domains in DOMAIN_TAXONOMY.items():
-        if isinstance(domains, dict):
-            all_domains.extend(domains.keys())
-    
-    if not all_domains:
-        return "Machine Learning"  # Fallback
-    
-    return random.choice(all_domains)
+    return random.choice(_ALL_DOMAINS)
 
 
 async def send_progress_update(chat_id: str, message: str):
@@ -43,7 +49,11 @@ async def send_progress_update(chat_id: str, message: str):
 
 async def parallel_agents_node(state: AgentState) -> Dict[str, Any]:
     """
-    Run source gatherer and domain scout agents in parallel with progress updates.
+    Run source gatherer and domain scout agents in parallel.
+    
+    The user gets one status message up front; per-agent outcomes (completed,
+    timeout, error) are reported together in the final response rather than
+    as separate Telegram messages.
     
     Args:
         state: Agent state with user_input and chat_id
@@ -54,14 +64,9 @@ async def parallel_agents_node(state: AgentState) -> Dict[str, Any]:
     user_input = state.get("user_input", "")
     chat_id = state.get("chat_id")
     
-    # Extract domain from input or pick random
-    domain = None
-    if "for" in user_input.lower():
-        # Try to extract domain from input
-        parts = user_input.lower().split("for")
-        if len(parts) > 1:
-            domain = parts[1].strip()
-    
+    # Extract domain from input ("... for <domain>") or pick random
+    match = _FOR_DOMAIN_RE.search(user_input)
+    domain = match.group(1).strip() if match else None
     if not domain:
         domain = get_random_domain()
     
@@ -113,16 +118,9 @@ async def parallel_agents_node(state: AgentState) -> Dict[str, Any]:
     scout_progress = {"status": "starting", "message": None}
     
     async def run_source_gatherer():
-        """Run source gatherer with progress updates and timeout."""
+        """Run source gatherer with timeout, recording its status for the summary."""
         try:
             source_progress["status"] = "running"
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"📚 **Source Gatherer** started\n"
-                    f"   Searching for sources: {domain}"
-                )
-            
             # Add timeout to prevent hanging
             result = await asyncio.wait_for(
                 source_gatherer_node(source_state),
@@ -130,48 +128,26 @@ async def parallel_agents_node(state: AgentState) -> Dict[str, Any]:
             )
             source_progress["status"] = "completed"
             source_progress["message"] = result.get("final_response", "Completed")
-            
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"✅ **Source Gatherer** completed\n"
-                    f"   Found sources for: {domain}"
-                )
-            
             return result
         except asyncio.TimeoutError:
             logger.error("Source gatherer timed out after 2 minutes")
             source_progress["status"] = "timeout"
             source_progress["message"] = "Timeout after 2 minutes"
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"⏱️ **Source Gatherer** timed out\n"
-                    f"   Taking too long, stopping..."
-                )
             return {"error": "Timeout", "final_response": "Source gathering timed out after 2 minutes"}
+        except BudgetExceededError:
+            # Fatal for the whole run (the sibling shares the budget): propagate so it is cancelled
+            source_progress["status"] = "error"
+            raise
         except Exception as e:
             logger.error(f"Source gatherer error: {e}", exc_info=True)
             source_progress["status"] = "error"
             source_progress["message"] = str(e)
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"❌ **Source Gatherer** error: {str(e)[:200]}"
-                )
             return {"error": str(e), "final_response": None}
     
     async def run_domain_scout():
-        """Run domain scout with progress updates and timeout."""
+        """Run domain scout with timeout, recording its status for the summary."""
         try:
             scout_progress["status"] = "running"
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"🔍 **Domain Scout** started\n"
-                    f"   Searching for new domains..."
-                )
-            
             # Add timeout to prevent hanging
             result = await asyncio.wait_for(
                 domain_scout_node(scout_state),
@@ -179,68 +155,51 @@ async def parallel_agents_node(state: AgentState) -> Dict[str, Any]:
             )
             scout_progress["status"] = "completed"
             scout_progress["message"] = result.get("final_response", "Completed")
-            
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"✅ **Domain Scout** completed\n"
-                    f"   Discovered new domains"
-                )
-            
             return result
         except asyncio.TimeoutError:
             logger.error("Domain scout timed out after 2 minutes")
             scout_progress["status"] = "timeout"
             scout_progress["message"] = "Timeout after 2 minutes"
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"⏱️ **Domain Scout** timed out\n"
-                    f"   Taking too long, stopping..."
-                )
             return {"error": "Timeout", "final_response": "Domain scouting timed out after 2 minutes"}
+        except BudgetExceededError:
+            # Fatal for the whole run (the sibling shares the budget): propagate so it is cancelled
+            scout_progress["status"] = "error"
+            raise
         except Exception as e:
             logger.error(f"Domain scout error: {e}", exc_info=True)
             scout_progress["status"] = "error"
             scout_progress["message"] = str(e)
-            if chat_id:
-                await send_progress_update(
-                    chat_id,
-                    f"❌ **Domain Scout** error: {str(e)[:200]}"
-                )
             return {"error": str(e), "final_response": None}
     
-    # Run both agents in parallel with overall timeout
-    try:
-        source_result, scout_result = await asyncio.wait_for(
-            asyncio.gather(
-                run_source_gatherer(),
-                run_domain_scout(),
-                return_exceptions=True
-            ),
-            timeout=180.0  # 3 minute overall timeout
-        )
-        
-        # Handle exceptions
-        if isinstance(source_result, Exception):
-            source_result = {"error": str(source_result), "final_response": None}
-        if isinstance(scout_result, Exception):
-            scout_result = {"error": str(scout_result), "final_response": None}
-        
-    except asyncio.TimeoutError:
+    # Run both agents in parallel with overall timeout; a fatal error in one cancels the other
+    source_task = asyncio.create_task(run_source_gatherer())
+    scout_task = asyncio.create_task(run_domain_scout())
+    done, pending = await asyncio.wait(
+        (source_task, scout_task),
+        timeout=180.0,  # 3 minute overall timeout
+        return_when=asyncio.FIRST_EXCEPTION,
+    )
+    failed = next((t for t in done if t.exception() is not None), None)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if failed is not None:
+        logger.error(f"Parallel execution aborted: {failed.exception()}")
+    elif pending:
         logger.error("Parallel execution timed out after 3 minutes")
-        if chat_id:
-            await send_progress_update(
-                chat_id,
-                f"⏱️ **Overall timeout**\n"
-                f"   Both agents exceeded 3 minute limit"
-            )
-        source_result = {"error": "Overall timeout", "final_response": "Execution timed out after 3 minutes"}
-        scout_result = {"error": "Overall timeout", "final_response": "Execution timed out after 3 minutes"}
-    except Exception as e:
-        logger.error(f"Parallel execution error: {e}", exc_info=True)
-        source_result = {"error": str(e), "final_response": None}
-        scout_result = {"error": str(e), "final_response": None}
+    
+    def collect(task: asyncio.Task, progress: Dict[str, Any]) -> Dict[str, Any]:
+        if task in pending:
+            if failed is not None:
+                progress["status"] = "cancelled"
+                return {"error": f"Cancelled: {failed.exception()}", "final_response": None}
+            return {"error": "Overall timeout", "final_response": "Execution timed out after 3 minutes"}
+        if task.exception() is not None:
+            return {"error": str(task.exception()), "final_response": None}
+        return task.result()
+    
+    source_result = collect(source_task, source_progress)
+    scout_result = collect(scout_task, scout_progress)
     
     # Compile final response
     response_parts = []
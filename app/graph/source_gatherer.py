@@ -4,6 +4,7 @@ Discovers and evaluates sources for domains.
 """
 import logging
 from typing import Dict, Any, List
+from app.cost.budget import BudgetExceededError
 from app.graph.state import AgentState
 from app.validation.agent_outputs import validate_source_gatherer_output, ValidationError
 from app.kg.source_discovery import discover_sources_for_domain
@@ -72,7 +73,7 @@ async def source_gatherer_node(state: AgentState) -> Dict[str, Any]:
     # Cheap tier: source_filtering uses smaller model
     domain = (state.get("discovered_sources") or {}).get("domains", [None])[0] if isinstance(state.get("discovered_sources"), dict) else None
     queue = state.get("queue", "source_gathering")
-    llm = get_llm_for_task("source_filtering", domain=domain, queue=queue, agent="source_gatherer")
+    llm = get_llm_for_task("source_filtering", domain=domain, queue=queue, agent="source_gatherer", tracked=True)
     
     # Get available domains for context
     available_domains = []
@@ -122,6 +123,9 @@ async def source_gatherer_node(state: AgentState) -> Dict[str, Any]:
             search_queries = [d for d in domains]
             source_types = ["academic", "educational", "general"]
             requirements = {}
+    except BudgetExceededError:
+        # Not a parse failure: the run must stop (parallel runs cancel the sibling agent)
+        raise
     except Exception as e:
         logger.warning(f"Failed to parse LLM response: {e}, using fallback")
         domains = extract_domains_from_text(user_input, available_domains)
@@ -24,7 +24,7 @@ from app.graph.improvement_agent import (
     push_changes_node
 )
 from app.graph.expansion import expansion_node, begin_node
-from app.graph.checkpoint import create_checkpointer
+from app.graph.checkpoint import create_checkpointer, reset_checkpointer
 
 
 logger = logging.getLogger(__name__)
@@ -527,6 +527,7 @@ def reset_graph():
     """Reset the cached graph (for testing/debugging)."""
     global _graph
     _graph = None
+    reset_checkpointer()
     logger.info("Graph cache reset")
 
 
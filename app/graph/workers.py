@@ -29,7 +29,7 @@ else:
         return None
 from app.llm.client import get_llm
 from app.cost.cheap_verification import should_use_llm, simple_ner, statistical_extraction
-from app.cost.cache import get_cache, cached
+from app.cost.cache import CacheType, get_cache, cached
 from app.llm.tiering import get_llm_for_task, TIER_CHEAP, TIER_MID
 from app.validation.agent_outputs import (
     validate_extractor_output,
@@ -168,7 +168,7 @@ async def extractor_node(state: AgentState) -> Dict[str, Any]:
     
     # Check cache first
     cache = get_cache()
-    cached_extraction = cache.get("extraction_result", user_input)
+    cached_extraction = cache.get(CacheType.EXTRACTION_RESULT, user_input)
     
     if cached_extraction:
         logger.info("Using cached extraction result")
@@ -208,7 +208,7 @@ async def extractor_node(state: AgentState) -> Dict[str, Any]:
             extracted = validate_extractor_output(extracted)
         except OutputValidationError as ve:
             logger.warning(f"Extractor output validation: {ve}; using as-is with truncation")
-        cache.set("extraction_result", extracted, ttl_seconds=86400, user_input=user_input)
+        cache.set(CacheType.EXTRACTION_RESULT, extracted, 86400, user_input)
     else:
         # LLM extraction needed
         logger.info(f"Using LLM extraction (confidence: {confidence:.2f})")
@@ -255,7 +255,7 @@ async def extractor_node(state: AgentState) -> Dict[str, Any]:
                 
                 # Cache LLM extraction result
                 cache = get_cache()
-                cache.set("extraction_result", extracted, ttl_seconds=86400, user_input=user_input)
+                cache.set(CacheType.EXTRACTION_RESULT, extracted, 86400, user_input)
                 
                 # Ensure all entities have proper IDs with prefixes
                 for i, entity in enumerate(extracted.get("entities", [])):
@@ -10,6 +10,7 @@ from urllib.parse import quote, urlencode
 import json
 from app.retry import with_retry
 from app.queue.rate_limiter import check_rate_limit, record_request
+from app.kg.http_session import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,7 @@ async def search_semantic_scholar(query: str, limit: int = 10, domain: Optional[
             "fields": "title,authors,year,abstract,url,doi,citationCount,venue"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -107,7 +108,7 @@ async def search_arxiv(query: str, limit: int = 10, domain: Optional[str] = None
             "sortOrder": "descending"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     content = await response.text()
@@ -186,7 +187,7 @@ async def search_openalex(query: str, limit: int = 10, domain: Optional[str] = N
             "sort": "relevance_score:desc"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -255,7 +256,7 @@ async def search_wikipedia(query: str, limit: int = 5, domain: Optional[str] = N
         search_url = "https://en.wikipedia.org/api/rest_v1/page/search"
         params = {"q": query, "limit": limit}
         
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             async with session.get(search_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     data = await response.json()
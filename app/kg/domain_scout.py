@@ -15,6 +15,7 @@ from app.llm.client import get_llm
 from app.security.network import is_url_allowed
 from app.security.sanitize import sanitize_content, sanitize_for_llm
 from app.security.prompt_injection import wrap_untrusted_content
+from app.kg.http_session import shared_session
 
 # Import re at module level
 import re
@@ -233,7 +234,7 @@ async def scout_web_source(
         return {"discovered_domains": discovered, "statistics": {"sources_scouted": 0, "total_discovered": 0, "unique_domains": 0, "high_confidence": 0, "by_source": {}}}
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             headers = {
                 "User-Agent": "Mozilla/5.0 (compatible; DomainScoutBot/1.0; +https://example.com/bot)",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
@@ -434,7 +435,7 @@ async def scout_reddit(
     ]
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             headers = {
                 "User-Agent": "DomainScoutBot/1.0 (Educational Research)"
             }
@@ -0,0 +1,51 @@
+"""
+Shared aiohttp session for source discovery, fetching and scouting.
+One pooled session per event loop, so repeated calls to the same API reuse
+keep-alive connections and cached DNS instead of a new TCP/TLS setup each time.
+"""
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import aiohttp
+
+# Connection pool limits (total, per host); per-host keeps concurrent domains polite to each API
+POOL_LIMIT = 32
+POOL_LIMIT_PER_HOST = 4
+
+# Sessions are bound to the loop they were created on (tests and worker threads run their own loops)
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _new_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+    )
+    # No cookie jar: requests stay independent as with per-call sessions (no metered-paywall cookies carried over)
+    return aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Pooled session for the running event loop, created on first use (or after close)."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _sessions[loop] = _new_session()
+    return session
+
+
+@asynccontextmanager
+async def shared_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Drop-in for `async with aiohttp.ClientSession() as session`, without closing the pool."""
+    yield await get_session()
+
+
+async def close_session() -> None:
+    """Close the running loop's session (call on shutdown)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
@@ -12,7 +12,8 @@ from app.security.network import is_url_allowed
 from app.security.sanitize import sanitize_content
 from app.failure_modes.html_parser import parse_html_with_fallback
 from app.failure_modes.paywall import detect_paywall
-from app.cost.cache import get_cache, cached
+from app.cost.cache import CacheType, get_cache
+from app.kg.http_session import shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -185,7 +186,6 @@ def get_cost_tier(cost_score: float) -> str:
         return "high"
 
 
-@cached("fetched_doc", ttl_seconds=86400, key_func=lambda source, max_length=10000: (source.get("url"), max_length))
 async def fetch_source_content(
     source: Dict[str, Any],
     max_length: int = 10000
@@ -193,6 +193,9 @@ async def fetch_source_content(
     """
     Fetch actual content from a source URL.
     
+    Successful fetches are cached for a day per (url, max_length); errors,
+    timeouts and paywalls are not cached so they are retried next time.
+    
     Args:
         source: Source node dict
         max_length: Maximum content length to fetch
@@ -203,9 +206,23 @@ async def fetch_source_content(
         - metadata: Fetch metadata (status, length, etc.)
         - accessible: Whether source is accessible
     """
-    props = source.get("properties", {})
-    url = props.get("url")
+    url = (source.get("properties") or {}).get("url")
+    if not url:
+        return await _fetch_source_content(url, max_length)
     
+    cache = get_cache()
+    cached_result = cache.get(CacheType.FETCHED_DOC, url, max_length)
+    if cached_result is not None:
+        return cached_result
+    
+    result = await _fetch_source_content(url, max_length)
+    if result.get("accessible"):
+        cache.set(CacheType.FETCHED_DOC, result, 86400, url, max_length)
+    return result
+
+
+async def _fetch_source_content(url: Optional[str], max_length: int) -> Dict[str, Any]:
+    """Fetch and extract one URL (uncached); see fetch_source_content."""
     if not url:
         return {
             "content": None,
@@ -222,7 +239,7 @@ async def fetch_source_content(
         }
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with shared_session() as session:
             # Set headers to avoid blocking
             headers = {
                 "User-Agent": "Mozilla/5.0 (compatible; KnowledgeGraphBot/1.0; +https://example.com/bot)",
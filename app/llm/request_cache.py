@@ -0,0 +1,87 @@
+"""
+Request cache for LLM results.
+Repeated requests (same words in the same order, ignoring case, whitespace and
+punctuation) reuse the earlier result instead of another LLM round trip.
+"""
+import copy
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("REQUEST_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_TTL_SECONDS = 86400
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_request(text: str) -> str:
+    """Lowercase words in order, with whitespace and punctuation collapsed to single spaces."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def context_digest(context: str) -> str:
+    """Bucket key for the context a result depends on (results never cross contexts)."""
+    return hashlib.sha256(context.encode("utf-8")).hexdigest() if context else ""
+
+
+class RequestCache:
+    """
+    LRU cache of LLM results keyed by (context digest, normalized request).
+
+    Matching is exact after normalization: word order and every token count,
+    so requests that differ in a file name, direction or negation never share
+    a result. Values are deep-copied in and out, so callers may mutate what
+    they get back.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        # (context digest, normalized text) -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, text: str, context: str = "") -> Optional[Any]:
+        """Cached value for text under context, or None."""
+        key = (context_digest(context), normalize_request(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            logger.debug("Request cache hit")
+            return copy.deepcopy(value)
+
+    def set(self, text: str, value: Any, context: str = "") -> None:
+        """Cache value for text under context, evicting the least recently used entry if full."""
+        key = (context_digest(context), normalize_request(text))
+        entry = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global cache for improvement plans
+_plan_cache = RequestCache()
+
+
+def get_plan_cache() -> RequestCache:
+    """Get the global improvement-plan cache."""
+    return _plan_cache
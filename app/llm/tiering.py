@@ -91,6 +91,7 @@ def get_llm_for_task(
     queue: Optional[str] = None,
     agent: Optional[str] = None,
     force_tier: Optional[str] = None,
+    tracked: bool = False,
 ) -> Optional[BaseChatModel]:
     """
     Get LLM instance appropriate for task complexity.
@@ -101,6 +102,9 @@ def get_llm_for_task(
         queue: Queue for cost tracking
         agent: Agent for cost tracking
         force_tier: Override tier selection (TIER_CHEAP, TIER_MID, TIER_EXPENSIVE)
+        tracked: Wrap the model with get_tracked_llm (budget caps, circuit
+            breaker checks and retry); the caller must let BudgetExceededError
+            propagate rather than treat it as an LLM failure
     
     Returns:
         LLM instance or None
@@ -115,6 +119,7 @@ def get_llm_for_task(
     model_name = get_model_for_tier(tier)
     
     # Create LLM instance (agents: prefer Moonshot first)
+    llm = None
     try:
         if os.getenv("MOONSHOT_API_KEY") or os.getenv("KIMI_API_KEY"):
             from langchain_openai import ChatOpenAI
@@ -128,7 +133,6 @@ def get_llm_for_task(
                 base_url=MOONSHOT_BASE_URL,
             )
             logger.debug(f"Using Kimi/Moonshot {tier} tier model '{model_name}' for task '{task_type}'")
-            return llm
         elif os.getenv("OPENAI_API_KEY"):
             from langchain_openai import ChatOpenAI
             llm = ChatOpenAI(
@@ -137,7 +141,6 @@ def get_llm_for_task(
                 api_key=os.getenv("OPENAI_API_KEY")
             )
             logger.debug(f"Using {tier} tier model '{model_name}' for task '{task_type}'")
-            return llm
         elif os.getenv("ANTHROPIC_API_KEY"):
             from langchain_anthropic import ChatAnthropic
             llm = ChatAnthropic(
@@ -146,13 +149,20 @@ def get_llm_for_task(
                 api_key=os.getenv("ANTHROPIC_API_KEY")
             )
             logger.debug(f"Using {tier} tier model '{model_name}' for task '{task_type}'")
-            return llm
     except Exception as e:
         logger.error(f"Failed to create LLM for tier {tier}: {e}")
     
-    # Fallback to base LLM
-    from app.llm.client import get_llm_base
-    return get_llm_base()
+    if llm is None:
+        # Fallback to base LLM
+        from app.llm.client import get_llm_base
+        llm = get_llm_base()
+    
+    if llm is None or not tracked:
+        return llm
+    
+    # Cost tracking and budget enforcement (raises BudgetExceededError when a cap is hit)
+    from app.llm.tracked_client import get_tracked_llm
+    return get_tracked_llm(llm=llm, domain=domain, queue=queue, agent=agent)
 
 
 def get_tier_for_task(task_type: str) -> str:
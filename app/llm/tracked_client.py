@@ -78,11 +78,8 @@ class TrackedLLM:
     
     def _estimate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """Estimate cost for a call (before making it)."""
-        from app.cost.tracker import MODEL_PRICING
-        pricing = MODEL_PRICING.get(self._model_name, MODEL_PRICING["default"])
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output"]
-        return input_cost + output_cost
+        from app.cost.tracker import calculate_cost
+        return calculate_cost(self._model_name, input_tokens, output_tokens)
     
     async def ainvoke(
         self,
@@ -21,10 +21,13 @@ import uvicorn
 from app.telegram import (
     send_message,
     answer_callback_query,
-    build_approval_keyboard
+    build_approval_keyboard,
+    close_client,
 )
+from app.graph.improvement_agent import make_diff_id
 from app.graph.supervisor import run_graph
 from app.graph.state import AgentState
+from app.kg.http_session import close_session
 from app.mission import get_crucial_decision_label
 from app.task_state import set_task_status, TaskStatus, TaskStateRegistry
 
@@ -66,6 +69,8 @@ async def lifespan(app: FastAPI):
         _worker_task = start_worker_background(task_type=None)
         logger.info("Durable queue worker started (graph_run + mission_continue)")
     yield
+    await close_session()
+    await close_client()
     if _worker_task and not _worker_task.done():
         _worker_task.cancel()
         try:
@@ -598,7 +603,7 @@ async def telegram_webhook(request: Request):
             # Check if approval is required (for both diff and improvements)
             if result.get("approval_required") and (result.get("diff_id") or result.get("proposed_changes")):
                 # Send approval message with buttons; prefix with key decision label when set
-                diff_id = result.get("diff_id") or f"improve_{hash(result.get('user_input', '')) % 10000}"
+                diff_id = result.get("diff_id") or make_diff_id(result.get("user_input", ""), result.get("proposed_changes") or {})
                 response_text = result.get("final_response", "Please approve or reject the proposed changes.")
                 crucial_type = result.get("crucial_decision_type")
                 if crucial_type:
@@ -1,11 +1,43 @@
 """Telegram Bot API utilities for sending messages and handling callbacks."""
+import asyncio
 import os
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Dict, Any, Union
+
 import httpx
-from typing import Optional, Dict, Any, Union
 
 
 TELEGRAM_API_BASE = "https://api.telegram.org/bot"
 
+# All calls go to one host: keep a small pool of warm connections (no TCP/TLS setup per message)
+_CLIENT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=60)
+
+# Clients are bound to the loop they were created on (worker threads run their own loops)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Pooled client for the running event loop, created on first use (or after close)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(limits=_CLIENT_LIMITS)
+    return client
+
+
+@asynccontextmanager
+async def _shared_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Drop-in for `async with httpx.AsyncClient() as client`, without closing the pool."""
+    yield await _get_client()
+
+
+async def close_client() -> None:
+    """Close the running loop's Telegram client (call on shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
 
 def get_bot_token() -> str:
     """Get bot token from environment variable."""
@@ -62,7 +94,7 @@ async def send_message(
     if parse_mode:
         payload["parse_mode"] = parse_mode
     
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.post(url, json=payload)
         response.raise_for_status()
         return response.json()
@@ -90,7 +122,7 @@ async def send_photo(
     url = f"{TELEGRAM_API_BASE}{token}/sendPhoto"
     
     if isinstance(photo, bytes):
-        async with httpx.AsyncClient() as client:
+        async with _shared_client() as client:
             payload: Dict[str, Any] = {"chat_id": str(chat_id)}
             if caption:
                 payload["caption"] = caption[:1024]
@@ -104,7 +136,7 @@ async def send_photo(
             payload["caption"] = caption
         if parse_mode:
             payload["parse_mode"] = parse_mode
-        async with httpx.AsyncClient() as client:
+        async with _shared_client() as client:
             response = await client.post(url, json=payload)
     
     response.raise_for_status()
@@ -140,7 +172,7 @@ async def answer_callback_query(
     if show_alert:
         payload["show_alert"] = True
     
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.post(url, json=payload)
         response.raise_for_status()
         return response.json()
@@ -185,7 +217,7 @@ async def set_webhook(url: str) -> Dict[str, Any]:
     token = get_bot_token()
     webhook_url = f"{TELEGRAM_API_BASE}{token}/setWebhook"
     
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.post(webhook_url, json={"url": url})
         response.raise_for_status()
         return response.json()
@@ -196,7 +228,7 @@ async def get_webhook_info() -> Dict[str, Any]:
     token = get_bot_token()
     url = f"{TELEGRAM_API_BASE}{token}/getWebhookInfo"
     
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.get(url)
         response.raise_for_status()
         return response.json()
@@ -206,7 +238,7 @@ async def get_file(file_id: str) -> Dict[str, Any]:
     """Get file metadata from Telegram (returns file_path for download)."""
     token = get_bot_token()
     url = f"{TELEGRAM_API_BASE}{token}/getFile"
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.post(url, json={"file_id": file_id})
         response.raise_for_status()
         return response.json().get("result", {})
@@ -219,7 +251,7 @@ async def download_telegram_file(file_path: str) -> bytes:
     """Download file from Telegram by file_path (from getFile). Uses file/bot base URL."""
     token = get_bot_token()
     url = f"{TELEGRAM_FILE_BASE}{token}/{file_path}"
-    async with httpx.AsyncClient() as client:
+    async with _shared_client() as client:
         response = await client.get(url)
         response.raise_for_status()
         return response.content
@@ -238,7 +270,7 @@ async def send_voice(
     token = get_bot_token()
     url = f"{TELEGRAM_API_BASE}{token}/sendVoice"
     if isinstance(voice, bytes):
-        async with httpx.AsyncClient() as client:
+        async with _shared_client() as client:
             payload: Dict[str, Any] = {"chat_id": str(chat_id)}
             if caption:
                 payload["caption"] = caption[:1024]
@@ -252,7 +284,7 @@ async def send_voice(
             payload["caption"] = caption
         if parse_mode:
             payload["parse_mode"] = parse_mode
-        async with httpx.AsyncClient() as client:
+        async with _shared_client() as client:
             response = await client.post(url, json=payload)
     response.raise_for_status()
     return response.json()
@@ -14,6 +14,7 @@ from app.validation.agent_outputs import (
     validate_commit_output,
     validate_query_output,
     validate_content_fetcher_parsed,
+    extract_json_object,
     ValidationError,
 )
 from app.validation.schemas import (
@@ -34,6 +35,7 @@ __all__ = [
     "validate_commit_output",
     "validate_query_output",
     "validate_content_fetcher_parsed",
+    "extract_json_object",
     "ValidationError",
     "INTENT_ALLOWLIST",
     "APPROVAL_DECISION_ALLOWLIST",
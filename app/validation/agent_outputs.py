@@ -5,6 +5,7 @@ If you do only one thing: force structured outputs and validate them in code.
 """
 import logging
 import os
+import re
 from typing import Dict, Any, List, Optional
 
 from app.validation.schemas import (
@@ -26,6 +27,45 @@ class ValidationError(Exception):
     pass
 
 
+# Characters that affect brace depth inside JSON text
+_JSON_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} object in an LLM reply, or None.
+    
+    Single forward pass that tracks brace depth and skips braces inside JSON
+    strings; unlike a greedy {.*} regex search it never backtracks, and stray
+    braces after the object are ignored.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    skip_to = 0  # position after an escaped character
+    for m in _JSON_STRUCTURAL_RE.finditer(text, start):
+        pos = m.start()
+        if pos < skip_to:
+            continue
+        ch = m.group()
+        if in_string:
+            if ch == "\\":
+                skip_to = pos + 2
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
+
+
 def _validate_string(value: Any, field: str, max_len: int = 50000) -> str:
     """Ensure value is a non-empty string within length limit."""
     if value is None:
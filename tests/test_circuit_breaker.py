@@ -0,0 +1,132 @@
+"""Unit tests for circuit breaker."""
+from collections import OrderedDict
+
+import pytest
+
+from app import circuit_breaker
+from app.circuit_breaker import CircuitBreakerRegistry, CircuitState
+
+SECOND_NS = 1_000_000_000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic_ns clock for the circuit breaker module."""
+    now = [1_000 * SECOND_NS]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic_ns", lambda: now[0])
+    return now
+
+
+class TestCircuitState:
+    """Tests for CircuitState."""
+
+    def test_opens_after_threshold(self):
+        c = CircuitState("test", failure_threshold=3, window_seconds=60)
+        for _ in range(3):
+            c.record_failure()
+        assert c.state == CircuitState.OPEN
+        assert c.allow_request() is False
+
+    def test_failures_outside_window_evicted(self, clock):
+        c = CircuitState("test", failure_threshold=3, window_seconds=60)
+        c.record_failure()
+        c.record_failure()
+        clock[0] += 120 * SECOND_NS
+        c.record_failure()
+        assert len(c.failures) == 1
+        assert c.state == CircuitState.CLOSED
+
+    def test_success_in_closed_evicts_old_failures(self, clock):
+        c = CircuitState("test", failure_threshold=3, window_seconds=60)
+        c.record_failure()
+        clock[0] += 120 * SECOND_NS
+        c.record_success()
+        assert c.get_status()["failure_count"] == 0
+
+    def test_ring_wraps_and_keeps_most_recent(self, clock):
+        c = CircuitState("test", failure_threshold=3, window_seconds=60)
+        for _ in range(2):
+            c.record_failure()
+            clock[0] += 40 * SECOND_NS
+        # First failure has aged out; ring holds the second only, then wraps
+        c.record_failure()
+        assert c.state == CircuitState.CLOSED
+        clock[0] += 1 * SECOND_NS
+        c.record_failure()
+        assert c.state == CircuitState.OPEN
+        assert c.failures == sorted(c.failures)
+
+    def test_half_open_success_closes(self):
+        c = CircuitState("test", failure_threshold=1, window_seconds=60, recovery_seconds=0)
+        c.record_failure()
+        assert c.state == CircuitState.OPEN
+        assert c.allow_request() is True
+        assert c.state == CircuitState.HALF_OPEN
+        c.record_success()
+        assert c.state == CircuitState.CLOSED
+
+    def test_open_circuit_rejects_until_recovery(self, clock):
+        c = CircuitState("test", failure_threshold=1, window_seconds=60, recovery_seconds=30)
+        c.record_failure()
+        assert c.allow_request() is False
+        clock[0] += 31 * SECOND_NS
+        assert c.allow_request() is True
+        assert c.state == CircuitState.HALF_OPEN
+
+
+class TestCircuitBreakerRegistry:
+    """Tests for CircuitBreakerRegistry."""
+
+    def test_same_circuit_returned_per_key(self):
+        a = CircuitBreakerRegistry.get_domain_circuit("test_registry_domain")
+        b = CircuitBreakerRegistry.get_domain_circuit("test_registry_domain")
+        assert a is b
+
+    def test_pause_and_resume_domain(self):
+        CircuitBreakerRegistry.pause_domain("test_registry_paused")
+        assert CircuitBreakerRegistry.allow_domain("test_registry_paused") is False
+        CircuitBreakerRegistry.resume_domain("test_registry_paused")
+        assert CircuitBreakerRegistry.allow_domain("test_registry_paused") is True
+
+    def test_list_status_includes_sources(self):
+        CircuitBreakerRegistry.record_source_failure("test_registry_source")
+        status = CircuitBreakerRegistry.list_status()
+        assert status["sources"]["test_registry_source"]["failure_count"] >= 1
+
+    def test_allow_domains_batch(self):
+        CircuitBreakerRegistry.pause_domain("test_batch_paused")
+        result = CircuitBreakerRegistry.allow_domains(["test_batch_new", "test_batch_paused"])
+        assert result == {"test_batch_new": True, "test_batch_paused": False}
+        CircuitBreakerRegistry.resume_domain("test_batch_paused")
+
+    def test_lru_eviction_keeps_paused_circuits(self, monkeypatch):
+        monkeypatch.setattr(CircuitBreakerRegistry, "max_circuits", 2)
+        monkeypatch.setattr(CircuitBreakerRegistry, "_by_domain", OrderedDict())
+        CircuitBreakerRegistry.pause_domain("lru_paused")
+        CircuitBreakerRegistry.allow_domain("lru_a")
+        CircuitBreakerRegistry.allow_domain("lru_b")
+        domains = CircuitBreakerRegistry._by_domain
+        assert len(domains) == 2
+        assert "lru_paused" in domains
+        assert "lru_a" not in domains
+        assert CircuitBreakerRegistry.allow_domain("lru_paused") is False
+
+    def test_new_circuit_not_evicted_when_others_paused(self, monkeypatch):
+        monkeypatch.setattr(CircuitBreakerRegistry, "max_circuits", 2)
+        monkeypatch.setattr(CircuitBreakerRegistry, "_by_domain", OrderedDict())
+        CircuitBreakerRegistry.pause_domain("lru_paused_1")
+        CircuitBreakerRegistry.pause_domain("lru_paused_2")
+        circuit = CircuitBreakerRegistry.get_domain_circuit("lru_new")
+        assert CircuitBreakerRegistry._by_domain.get("lru_new") is circuit
+        assert CircuitBreakerRegistry.allow_domains(["lru_new", "lru_other"])["lru_other"] is True
+        assert "lru_other" in CircuitBreakerRegistry._by_domain
+
+    def test_touch_skipped_while_lock_held(self, monkeypatch):
+        monkeypatch.setattr(CircuitBreakerRegistry, "_by_domain", OrderedDict())
+        CircuitBreakerRegistry.get_domain_circuit("lru_first")
+        CircuitBreakerRegistry.get_domain_circuit("lru_second")
+        with CircuitBreakerRegistry._domain_lock:
+            CircuitBreakerRegistry.get_domain_circuit("lru_first")
+        assert list(CircuitBreakerRegistry._by_domain) == ["lru_first", "lru_second"]
+        CircuitBreakerRegistry.get_domain_circuit("lru_first")
+        assert list(CircuitBreakerRegistry._by_domain) == ["lru_second", "lru_first"]
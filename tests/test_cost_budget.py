@@ -0,0 +1,44 @@
+"""Unit tests for budget manager."""
+from app.cost.budget import BudgetManager, _parse_env_budgets
+
+
+class TestBudgetManager:
+    """Tests for BudgetManager."""
+
+    def test_status_reflects_new_limits(self):
+        bm = BudgetManager()
+        bm.set_domain_limit("test_domain", 1.0)
+        assert bm.get_status()["domain_limits"]["test_domain"] == 1.0
+        bm.set_domain_limit("test_domain", 2.0)
+        bm.set_queue_limit("test_queue", 3.0)
+        status = bm.get_status()
+        assert status["domain_limits"]["test_domain"] == 2.0
+        assert status["queue_limits"]["test_queue"] == 3.0
+
+    def test_status_limits_cached_between_sets(self):
+        bm = BudgetManager()
+        bm.set_domain_limit("test_domain", 1.0)
+        assert bm.get_status()["domain_limits"] is bm.get_status()["domain_limits"]
+
+    def test_check_budget_denies_over_domain_limit(self):
+        bm = BudgetManager()
+        bm.set_domain_limit("test_budget_domain", 0.01)
+        allowed, reason = bm.check_budget(domain="test_budget_domain", additional_cost=0.02)
+        assert allowed is False
+        assert "test_budget_domain" in reason
+
+    def test_check_budget_allows_unlimited_queue(self):
+        bm = BudgetManager()
+        allowed, reason = bm.check_budget(queue="test_budget_queue", additional_cost=5.0)
+        assert allowed is True
+        assert reason is None
+        assert bm.get_remaining_budget(queue="test_budget_queue") is None
+
+    def test_env_domain_budget_loaded(self, monkeypatch):
+        monkeypatch.setenv("DOMAIN_BUDGET_Test_Env_Domain", "0.50")
+        _parse_env_budgets.cache_clear()
+        try:
+            bm = BudgetManager()
+            assert bm.get_status()["domain_limits"]["Test Env Domain"] == 0.50
+        finally:
+            _parse_env_budgets.cache_clear()
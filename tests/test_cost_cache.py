@@ -0,0 +1,88 @@
+"""Unit tests for cost cache."""
+from app.cost.cache import CacheType, CostCache, cached
+
+
+class TestCostCache:
+    """Tests for CostCache."""
+
+    def test_set_then_get(self):
+        cache = CostCache()
+        cache.set("source_score", 0.8, None, "https://example.com")
+        assert cache.get("source_score", "https://example.com") == 0.8
+        assert cache.get("source_score", "https://other.com") is None
+
+    def test_kwargs_order_independent(self):
+        cache = CostCache()
+        cache.set("extraction_result", {"a": 1}, url="u", max_length=10)
+        assert cache.get("extraction_result", max_length=10, url="u") == {"a": 1}
+
+    def test_unhashable_arguments(self):
+        cache = CostCache()
+        cache.set("fetched_doc", "doc", None, {"url": "u"}, tags=["x"])
+        assert cache.get("fetched_doc", {"url": "u"}, tags=["x"]) == "doc"
+
+    def test_invalidate_by_type(self):
+        cache = CostCache()
+        cache.set("source_score", 0.5, None, "a")
+        cache.set("embedding", [0.1], None, "a")
+        cache.invalidate("source_score")
+        assert cache.get("source_score", "a") is None
+        assert cache.get("embedding", "a") == [0.1]
+
+    def test_expired_entry_not_returned(self):
+        cache = CostCache()
+        cache.set("source_score", 0.5, -1, "a")
+        assert cache.get("source_score", "a") is None
+
+    def test_same_args_different_types_do_not_collide(self):
+        cache = CostCache()
+        cache.set("source_score", 0.5, None, "a")
+        cache.set("cleaned_text", "text", None, "a")
+        assert cache.get("source_score", "a") == 0.5
+        assert cache.get("cleaned_text", "a") == "text"
+        assert cache.get_stats()["total_entries"] == 2
+
+    def test_set_sweeps_expired_entries(self):
+        cache = CostCache()
+        cache.set("source_score", 0.1, -1, "old")
+        cache.set("source_score", 0.2, None, "new")
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 1
+        assert stats["expired_evictions"] == 1
+
+
+class TestCachedDecorator:
+    """Tests for the cached decorator."""
+
+    def test_sync_function_cached(self):
+        calls = []
+
+        @cached("test_sync_cached", ttl_seconds=60)
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        assert double(21) == 42
+        assert double(21) == 42
+        assert calls == [21]
+
+    async def test_async_function_with_key_func(self):
+        calls = []
+
+        @cached("test_async_cached", ttl_seconds=60, key_func=lambda source, n=1: (source["url"], n))
+        async def fetch(source, n=1):
+            calls.append(source["url"])
+            return {"url": source["url"], "n": n}
+
+        assert (await fetch({"url": "u", "extra": 1}))["url"] == "u"
+        assert (await fetch({"url": "u", "extra": 2}))["url"] == "u"
+        assert calls == ["u"]
+
+    def test_legacy_name_and_enum_share_partition(self):
+        cache = CostCache()
+        cache.set("embedding", [0.1], None, "text")
+        assert cache.get(CacheType.EMBEDDING, "text") == [0.1]
+        cache.invalidate(CacheType.FETCHED_DOC)
+        assert cache.get("embedding", "text") == [0.1]
+        cache.invalidate("embedding")
+        assert cache.get(CacheType.EMBEDDING, "text") is None
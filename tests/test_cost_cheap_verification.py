@@ -0,0 +1,124 @@
+"""Unit tests for cheap verification."""
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from app.cost.cheap_verification import (
+    compile_patterns,
+    extract_with_compiled,
+    extract_with_regex,
+    filter_high_impact_candidates,
+    should_use_llm,
+    simple_ner,
+    simple_ner_batch,
+    statistical_extraction,
+)
+
+
+class TestSimpleNer:
+    """Tests for simple_ner."""
+
+    def test_extracts_entity_types(self):
+        text = (
+            "On 2024-01-15 Marie Curie emailed marie@example.com about "
+            "https://example.com/paper and 3.14 grams."
+        )
+        ner = simple_ner(text)
+        assert ner["dates"] == ["2024-01-15"]
+        assert "3.14" in ner["numbers"]
+        assert ner["urls"] == ["https://example.com/paper"]
+        assert ner["emails"] == ["marie@example.com"]
+        assert ner["proper_nouns"] == ["Marie Curie"]
+
+    def test_slash_and_dash_dates(self):
+        ner = simple_ner("Due 1/2/2024 or 12-31-2023.")
+        assert ner["dates"] == ["1/2/2024", "12-31-2023"]
+
+    def test_spans_assigned_to_one_type(self):
+        ner = simple_ner("See https://arxiv.org/abs/2401.12345 from 2024-01-15, page 7")
+        assert ner["urls"] == ["https://arxiv.org/abs/2401.12345"]
+        assert ner["dates"] == ["2024-01-15"]
+        assert ner["numbers"] == ["7"]
+
+
+class TestSimpleNerBatch:
+    """Tests for simple_ner_batch."""
+
+    def test_matches_per_text_results(self):
+        texts = ["Marie Curie in 1903", "see https://example.org", ""]
+        expected = [simple_ner(t) for t in texts]
+        assert simple_ner_batch(texts) == expected
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert simple_ner_batch(texts, executor=executor) == expected
+
+
+class TestExtractWithRegex:
+    """Tests for extract_with_regex."""
+
+    def test_string_patterns_case_insensitive(self):
+        result = extract_with_regex("Theorem A and THEOREM B", {"theorem": r"theorem \w"})
+        assert result["theorem"] == ["Theorem A", "THEOREM B"]
+
+    def test_compiled_patterns_used_as_is(self):
+        result = extract_with_regex("Theorem A and THEOREM B", {"theorem": re.compile(r"Theorem \w")})
+        assert result["theorem"] == ["Theorem A"]
+
+    def test_precompiled_patterns_reused_across_texts(self):
+        compiled = compile_patterns({"theorem": r"theorem \w", "year": re.compile(r"\d{4}")})
+        texts = ["Theorem A (1905)", "no match", "THEOREM B"]
+        assert [extract_with_compiled(t, compiled) for t in texts] == [
+            extract_with_regex(t, {"theorem": r"theorem \w", "year": re.compile(r"\d{4}")})
+            for t in texts
+        ]
+
+
+class TestStatisticalExtraction:
+    """Tests for statistical_extraction."""
+
+    def test_frequent_terms(self):
+        stats = statistical_extraction("graph graph graph node node edge a a a")
+        assert stats["frequent_terms"] == {"graph": 3, "node": 2}
+        assert stats["total_words"] == 9
+        assert stats["unique_words"] == 3
+
+    def test_tokens_split_on_whitespace_only(self):
+        # Punctuation stays attached and case is folded, as with str.split()
+        stats = statistical_extraction("Graph, graph, GRAPH. graph")
+        assert stats["frequent_terms"] == {"graph,": 2}
+        assert stats["total_words"] == 4
+
+
+class TestShouldUseLlm:
+    """Tests for should_use_llm."""
+
+    def test_short_text_uses_llm(self):
+        use_llm, confidence, results = should_use_llm("Too short")
+        assert use_llm is True
+        assert confidence == 0.0
+        assert results["skipped"] is True
+        assert "ner" in results
+
+    def test_long_text_skips_extraction(self):
+        use_llm, _, results = should_use_llm("Marie Curie 1903 " * 1000)
+        assert use_llm is True
+        assert results["ner"] == {}
+
+    def test_repeated_long_text_reuses_result(self):
+        text = "Marie Curie studied radioactivity in Paris. " * 10
+        first = should_use_llm(text)
+        second = should_use_llm(text, confidence_threshold=0.99)
+        assert first[2] is second[2]
+        assert first[1] == second[1]
+
+
+class TestFilterHighImpactCandidates:
+    """Tests for filter_high_impact_candidates."""
+
+    def test_top_candidates_by_score(self):
+        candidates = [
+            {"id": "low", "confidence": 0.1},
+            {"id": "high", "confidence": 0.9, "sources": ["a", "b", "c"]},
+            {"id": "tie_a", "confidence": 0.5},
+            {"id": "tie_b", "confidence": 0.5},
+        ]
+        top = filter_high_impact_candidates(candidates, max_candidates=3)
+        assert [c["id"] for c in top] == ["high", "tie_a", "tie_b"]
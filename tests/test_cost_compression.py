@@ -0,0 +1,66 @@
+"""Unit tests for context compression."""
+from app.cost import compression
+from app.cost.compression import ChunkIndex, DomainBrief, chunk_spans, chunk_text, retrieve_relevant_chunks
+
+
+class TestChunkText:
+    """Tests for chunk_text."""
+
+    def test_short_text_single_chunk(self):
+        assert chunk_text("abc", chunk_size=10, overlap=2) == ["abc"]
+
+    def test_overlapping_chunks_cover_text(self):
+        text = "".join(chr(ord("a") + i % 26) for i in range(25))
+        chunks = chunk_text(text, chunk_size=10, overlap=3)
+        assert chunks[0] == text[:10]
+        assert chunks[1].startswith(text[7:10])
+        assert chunks[-1].endswith(text[-1])
+        assert all(len(c) <= 10 for c in chunks)
+
+    def test_spans_match_chunks(self):
+        text = "x" * 55
+        spans = chunk_spans(text, chunk_size=20, overlap=5)
+        assert spans == [(0, 20), (15, 35), (30, 50), (45, 55)]
+        assert chunk_text(text, chunk_size=20, overlap=5) == [text[s:e] for s, e in spans]
+
+
+class TestRetrieveRelevantChunks:
+    """Tests for retrieve_relevant_chunks."""
+
+    def test_ranks_by_keyword_overlap(self):
+        chunks = [
+            "photosynthesis converts light energy",
+            "the mitochondria is the powerhouse",
+            "light energy and photosynthesis in plants",
+        ]
+        top = retrieve_relevant_chunks("photosynthesis light energy plants", chunks, top_k=2)
+        assert top == [chunks[2], chunks[0]]
+
+    def test_pads_with_unmatched_chunks_latest_first(self):
+        chunks = ["alpha", "beta", "gamma", "delta"]
+        assert retrieve_relevant_chunks("beta", chunks, top_k=3) == ["beta", "delta", "gamma"]
+
+    def test_index_reused_across_queries(self):
+        index = ChunkIndex(["red apple", "green apple", "red car"])
+        assert index.query("red", top_k=1) == ["red car"]
+        assert index.query("apple green", top_k=1) == ["green apple"]
+
+    def test_chunk_tokens_shared_across_chunk_lists(self):
+        compression._chunk_tokens.cache_clear()
+        ChunkIndex(["shared chunk text", "first only"])
+        ChunkIndex(["shared chunk text", "second only"])
+        assert compression._chunk_tokens.cache_info().hits == 1
+
+
+class TestDomainBrief:
+    """Tests for DomainBrief."""
+
+    def test_context_rerendered_after_update(self):
+        brief = DomainBrief("physics")
+        brief.update("Study of matter", ["energy", "mass"])
+        first = brief.get_context()
+        assert "Key concepts: energy, mass" in first
+        assert brief.get_context() is first
+        brief.update("Study of matter and motion", ["force"])
+        assert "Key concepts: force" in brief.get_context()
+        assert len(brief.get_context(max_length=20)) == 23
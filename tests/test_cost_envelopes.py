@@ -1,4 +1,6 @@
 """Unit tests for budget envelopes."""
+import threading
+
 import pytest
 from app.cost.envelopes import BudgetEnvelope, EnvelopeManager, get_envelope_manager, BudgetExceededError
 
@@ -35,6 +37,30 @@ class TestBudgetEnvelope:
         env.record_spend(3.0)
         assert env.get_remaining() == 7.0
 
+    def test_daily_cap_denies_over(self):
+        env = BudgetEnvelope("agent:test", cap_usd=1.0, window="daily")
+        assert env.check_cap(additional_cost=0.5) == (True, None)
+        env.record_spend(0.8)
+        allowed, reason = env.check_cap(additional_cost=0.5)
+        assert allowed is False
+        assert "Daily" in reason
+        assert abs(env.get_remaining() - 0.2) < 1e-9
+
+    def test_concurrent_spend_summed_across_shards(self):
+        env = BudgetEnvelope("agent:test", cap_usd=100.0, window="daily")
+
+        def spend():
+            for _ in range(100):
+                env.record_spend(0.01)
+
+        threads = [threading.Thread(target=spend) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert abs(env.spent_usd - 20.0) < 1e-6
+        assert abs(env.get_remaining() - 80.0) < 1e-6
+
 
 class TestEnvelopeManager:
     """Tests for EnvelopeManager."""
@@ -58,3 +84,10 @@ class TestEnvelopeManager:
         mgr.set_envelope("per_tool_call", cap_usd=10.0, window="per_call")
         mgr.enforce_all_caps(tool_name="test_tool", additional_cost=0.01)
         # No raise
+
+    def test_agent_daily_cap_uses_tracker(self):
+        mgr = EnvelopeManager()
+        mgr.set_envelope("per_agent", cap_usd=1000.0, window="daily")
+        allowed, reason = mgr.check_agent_daily_cap("test_agent", additional_cost=0.01)
+        assert allowed is True
+        assert reason is None
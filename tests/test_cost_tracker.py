@@ -0,0 +1,79 @@
+"""Unit tests for cost tracker."""
+from datetime import date, timedelta
+
+from app.cost.tracker import MODEL_PRICING, CostTracker, cached_today, calculate_cost
+
+
+class TestCostTracker:
+    """Tests for CostTracker."""
+
+    def test_stats_top_domains(self):
+        tracker = CostTracker()
+        tracker.record_call("gpt-4o-mini", "openai", 1_000_000, 0, domain="Algebra")
+        tracker.record_call("gpt-4o-mini", "openai", 2_000_000, 0, domain="Biology")
+        tracker.record_call("gpt-4o-mini", "openai", 10, 10, success=False)
+        stats = tracker.get_stats()
+        assert stats["total_calls"] == 3
+        assert stats["failed_calls"] == 1
+        assert stats["total_tokens"] == 3_000_020
+        assert [d for d, _ in stats["top_domains"]] == ["Biology", "Algebra"]
+        assert stats["total_cost_usd"] == tracker.get_total_cost()
+
+    def test_daily_cost_filters(self):
+        tracker = CostTracker()
+        tracker.record_call("default", "openai", 1_000_000, 0, domain="Algebra", queue="q1")
+        tracker.record_call("default", "openai", 1_000_000, 0, domain="Biology")
+        assert tracker.get_daily_cost() == 2.0
+        assert tracker.get_daily_cost(domain="Algebra", queue="q1") == 1.0
+        assert tracker.get_domain_cost("Biology") == 1.0
+        assert tracker.get_queue_cost("q1") == 1.0
+
+    def test_history_bounded_but_totals_complete(self):
+        tracker = CostTracker(max_history=2)
+        for i in range(5):
+            tracker.record_call("default", "openai", i, 0, agent=f"a{i}")
+        recent = tracker.get_recent_calls(limit=10)
+        assert [c.agent for c in recent] == ["a3", "a4"]
+        assert [c.agent for c in tracker.get_recent_calls(limit=1)] == ["a4"]
+        stats = tracker.get_stats()
+        assert stats["total_calls"] == 5
+        assert stats["total_tokens"] == 10
+
+    def test_recent_calls_round_trip_all_fields(self):
+        tracker = CostTracker(max_history=3)
+        calls = [
+            tracker.record_call(
+                "gpt-4o", "openai", i, 2 * i, domain="Algebra", queue="q1", agent=f"a{i}",
+                duration_ms=1.5 * i, success=i % 2 == 0, error=None if i % 2 == 0 else "boom",
+            )
+            for i in range(4)
+        ]
+        assert tracker.get_recent_calls(limit=10) == calls[1:]
+        assert tracker.get_recent_calls(limit=0) == []
+
+    def test_old_days_evicted_but_total_kept(self):
+        tracker = CostTracker()
+        old_day = date.today() - timedelta(days=tracker._retention_days + 1)
+        tracker._by_date[old_day] = {("global", "default"): 5.0}
+        tracker._by_date_total[old_day] = 5.0
+        tracker._total_cost = 5.0
+        tracker.record_call("default", "openai", 1_000_000, 0)
+        assert tracker.get_daily_cost(target_date=old_day) == 0.0
+        assert tracker.get_total_cost() == 6.0
+
+    def test_agent_daily_cost(self):
+        tracker = CostTracker()
+        tracker.record_call("default", "openai", 1_000_000, 0, agent="scout")
+        tracker.record_call("default", "openai", 2_000_000, 0, agent="gatherer")
+        assert tracker.get_daily_cost(agent="scout") == 1.0
+        assert tracker.get_daily_cost(agent="unknown") == 0.0
+
+    def test_cached_today_matches_date_today(self):
+        assert cached_today() == date.today()
+        assert cached_today() is cached_today()
+
+    def test_calculate_cost_matches_pricing_table(self):
+        for model, pricing in MODEL_PRICING.items():
+            expected = (1234 / 1_000_000) * pricing["input"] + (567 / 1_000_000) * pricing["output"]
+            assert abs(calculate_cost(model, 1234, 567) - expected) < 1e-12
+        assert calculate_cost("unknown-model", 1_000_000, 0) == MODEL_PRICING["default"]["input"]
@@ -0,0 +1,131 @@
+"""Unit tests for circular citation detection."""
+import random
+
+import pytest
+
+from app.failure_modes import _scc_kernel, circular_citation
+from app.failure_modes.circular_citation import (
+    CitationGraph,
+    detect_circular_citations,
+    enumerate_all_cycles,
+    invalidate_scc_cache,
+)
+
+
+def _edge(from_id, to_id, etype="SUPPORTS"):
+    return {"from": from_id, "to": to_id, "type": etype}
+
+
+def _diff(*edges):
+    return {"edges": {"add": list(edges)}}
+
+
+def _rotated(cycle):
+    """Closed cycle path as a tuple starting from its smallest node."""
+    nodes = cycle[:-1]
+    i = nodes.index(min(nodes))
+    return tuple(nodes[i:] + nodes[:i])
+
+
+class TestDetectCircularCitations:
+    """Tests for detect_circular_citations."""
+
+    def test_acyclic_graph(self):
+        result = detect_circular_citations(_diff(_edge("A", "B"), _edge("B", "C"), _edge("A", "C")))
+        assert result == {"has_circular": False, "cycles": [], "warnings": []}
+
+    def test_cycle_and_self_citation_reported_once_each(self):
+        result = detect_circular_citations(_diff(
+            _edge("A", "B"), _edge("B", "C"), _edge("C", "A"), _edge("C", "A", "REFUTES"),
+            _edge("C", "D"), _edge("D", "D"),
+        ))
+        assert result["has_circular"] is True
+        assert sorted(result["cycles"]) == [["A", "B", "C", "A"], ["D", "D"]]
+        assert len(result["warnings"]) == 2
+
+    def test_non_citation_edges_ignored(self):
+        result = detect_circular_citations(_diff(_edge("A", "B"), _edge("B", "A", "PART_OF")))
+        assert result["has_circular"] is False
+
+    def test_cycle_closed_by_existing_edge(self):
+        result = detect_circular_citations(_diff(_edge("A", "B")), existing_edges=[_edge("B", "A")])
+        assert result["cycles"] == [["B", "A", "B"]]
+
+    def test_long_chain_does_not_hit_recursion_limit(self):
+        edges = [_edge(f"n{i}", f"n{i + 1}") for i in range(5000)]
+        result = detect_circular_citations(_diff(*edges, _edge("n5000", "n0")))
+        assert result["has_circular"] is True
+        assert len(result["cycles"][0]) == 5002
+
+    def test_existing_graph_analysis_reused_across_diffs(self):
+        invalidate_scc_cache()
+        existing = [_edge("A", "B"), _edge("B", "C"), _edge("X", "Y"), _edge("Y", "X")]
+        first = detect_circular_citations(_diff(_edge("C", "D")), existing_edges=existing)
+        assert first["cycles"] == [["X", "Y", "X"]]
+        second = detect_circular_citations(_diff(_edge("C", "A")), existing_edges=existing)
+        assert circular_citation._analyze_existing_graph.cache_info().hits == 1
+        assert sorted(second["cycles"]) == [["A", "B", "C", "A"], ["X", "Y", "X"]]
+
+    def test_max_cycles_bounds_report(self):
+        edges = [_edge(f"a{i}", f"b{i}") for i in range(5)] + [_edge(f"b{i}", f"a{i}") for i in range(5)]
+        result = detect_circular_citations(_diff(*edges), max_cycles=2)
+        assert result["has_circular"] is True
+        assert len(result["cycles"]) == 2
+        assert len(detect_circular_citations(_diff(*edges), max_cycles=None)["cycles"]) == 5
+
+
+class TestCitationGraph:
+    """Tests for CitationGraph."""
+
+    def test_detect_against_live_graph(self):
+        graph = CitationGraph([_edge("A", "B"), _edge("B", "C")])
+        closing = _diff(_edge("C", "A"))
+        assert detect_circular_citations(_diff(_edge("C", "D")), graph=graph)["has_circular"] is False
+        assert detect_circular_citations(closing, graph=graph)["cycles"] == [["A", "B", "C", "A"]]
+        # Checking a diff does not modify the graph
+        assert graph.cycles() == []
+
+    def test_add_edges_merges_components(self):
+        graph = CitationGraph([_edge("A", "B"), _edge("B", "C"), _edge("X", "X")])
+        assert graph.cycles() == [["X", "X"]]
+        graph.add_diff(_diff(_edge("C", "A")))
+        assert sorted(map(_rotated, graph.cycles())) == [("A", "B", "C"), ("X",)]
+        graph.add_edges([_edge("C", "X"), _edge("X", "B")])
+        assert len(graph.cycles()) == 1
+        assert len({graph._comp[node] for node in "ABCX"}) == 1
+
+    def test_rejects_graph_with_existing_edges(self):
+        with pytest.raises(ValueError):
+            detect_circular_citations(_diff(), existing_edges=[_edge("A", "B")], graph=CitationGraph())
+
+
+class TestEnumerateAllCycles:
+    """Tests for enumerate_all_cycles."""
+
+    def test_lists_every_elementary_cycle(self):
+        # A <-> B and A -> B -> C -> A share nodes: one component, two cycles
+        cycles = enumerate_all_cycles(_diff(
+            _edge("A", "B"), _edge("B", "A"), _edge("B", "C"), _edge("C", "A"), _edge("D", "D"),
+        ))
+        assert sorted(map(_rotated, cycles)) == [("A", "B"), ("A", "B", "C"), ("D",)]
+        assert all(c[0] == c[-1] for c in cycles)
+
+    def test_max_cycles(self):
+        edges = [_edge(a, b) for a in "ABCD" for b in "ABCD" if a != b]
+        assert len(enumerate_all_cycles(_diff(*edges))) == 20
+        assert len(enumerate_all_cycles(_diff(*edges), max_cycles=3)) == 3
+
+
+class TestNativeSccKernel:
+    """Tests for the CSR Tarjan kernel (run uncompiled)."""
+
+    def test_kernel_matches_python_tarjan(self, monkeypatch):
+        pytest.importorskip("numpy")
+        rng = random.Random(7)
+        adjacency = [[rng.randrange(60) for _ in range(rng.randrange(3))] for _ in range(60)]
+        expected = circular_citation._strongly_connected_components(adjacency)
+        monkeypatch.setattr(circular_citation, "tarjan_scc", _scc_kernel._tarjan_scc)
+        monkeypatch.setattr(circular_citation, "NATIVE_SCC_MIN_EDGES", 1)
+        native = circular_citation._strongly_connected_components(adjacency)
+        assert [sorted(c) for c in native] == [sorted(c) for c in expected]
+        assert [c[-1] for c in native] == [c[-1] for c in expected]
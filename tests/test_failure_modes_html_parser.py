@@ -0,0 +1,104 @@
+"""Unit tests for HTML parser fallback."""
+import pytest
+
+from app.failure_modes import html_parser
+from app.failure_modes.html_parser import parse_html_simple, parse_html_with_fallback
+
+
+class TestParseHtmlSimple:
+    """Tests for parse_html_simple."""
+
+    def test_strips_script_style_and_tags(self):
+        html = (
+            "<html><head><STYLE>p { color: red; }</style><script>var x = '<p>';</SCRIPT></head>"
+            "<body><p>Hello</p>\n<p>world</p></body></html>"
+        )
+        assert parse_html_simple(html) == "Hello world"
+
+    def test_style_block_closed_by_style_tag(self):
+        assert parse_html_simple("<style>a {}</style><p>kept</p><script></script>") == "kept"
+
+    def test_decodes_entities_once(self):
+        assert parse_html_simple("<p>A&nbsp;&amp;&nbsp;B &lt;c&gt; &quot;d&quot; &amp;lt; &#233;</p>") == (
+            'A & B <c> "d" &lt; é'
+        )
+
+
+class TestParseHtmlWithFallback:
+    """Tests for parse_html_with_fallback."""
+
+    def test_simple_parser_used(self):
+        result = parse_html_with_fallback("<p>Enough text to parse</p>")
+        assert result["content"] == "Enough text to parse"
+        assert result["metadata"]["parser"] in ("selectolax", "regex_fallback")
+
+    def test_minimal_fallback_for_short_text(self):
+        result = parse_html_with_fallback("<p>tiny</p>")
+        assert result["metadata"]["parser"] == "minimal_fallback"
+        assert result["content"] == "tiny"
+
+    def test_regex_fallback_without_selectolax(self, monkeypatch):
+        monkeypatch.setattr(html_parser, "HTMLParser", None)
+        html_parser._parse_memo.clear()
+        result = parse_html_with_fallback("<p>Enough text to parse</p>")
+        assert result["content"] == "Enough text to parse"
+        assert result["metadata"]["parser"] == "regex_fallback"
+        assert result["metadata"]["fallback_used"] is True
+
+    def test_oversized_html_truncated(self, monkeypatch):
+        monkeypatch.setattr(html_parser, "MAX_HTML_CHARS", 30)
+        result = parse_html_with_fallback("<p>Enough text to parse</p>" + "<p>dropped</p>" * 10)
+        assert result["content"] == "Enough text to parse"
+        assert result["metadata"]["truncated"] is True
+
+    def test_repeated_page_parsed_once(self, monkeypatch):
+        html_parser._parse_memo.clear()
+        calls = []
+        real_parse = html_parser._parse_html_text
+
+        def counting_parse(html):
+            calls.append(html)
+            return real_parse(html)
+
+        monkeypatch.setattr(html_parser, "_parse_html_text", counting_parse)
+        page = "<p>Same page fetched twice</p>"
+        first = parse_html_with_fallback(page)
+        first["metadata"]["parser"] = "mutated"
+        second = parse_html_with_fallback("".join(["<p>Same page ", "fetched twice</p>"]))
+        assert second["content"] == "Same page fetched twice"
+        assert second["metadata"]["parser"] != "mutated"
+        assert len(calls) == 1
+
+
+class TestContentMemo:
+    """Tests for the digest-keyed memo."""
+
+    def test_keys_are_compact_and_content_addressed(self):
+        page = "<p>x</p>" * 1000
+        key = html_parser.content_key(page)
+        assert key == html_parser.content_key("".join(["<p>x</p>"] * 1000))
+        assert key != html_parser.content_key(page + " ")
+        assert len(key[1]) == 16
+
+    def test_lru_bound(self):
+        memo = html_parser.ContentMemo(2)
+        for i in range(3):
+            memo.set(html_parser.content_key(str(i)), i)
+        assert memo.get(html_parser.content_key("0")) is None
+        assert memo.get(html_parser.content_key("2")) == 2
+
+
+class TestSelectolaxBackend:
+    """selectolax must extract the same text as the regex fallback on well-formed pages."""
+
+    PAGES = [
+        "<p>Hello</p>\n<p>world</p>",
+        "<html><head><style>p { color: red; }</style><script>var x = 1;</script></head>"
+        "<body><h1>Title</h1><p>Body &amp; more</p></body></html>",
+        "<div><p>A&nbsp;&amp;&nbsp;B &lt;c&gt;</p><ul><li>one</li><li>two</li></ul></div>",
+    ]
+
+    def test_matches_regex_backend(self):
+        pytest.importorskip("selectolax")
+        for page in self.PAGES:
+            assert html_parser._parse_html_text(page) == (html_parser._parse_html_regex(page), "selectolax")
@@ -0,0 +1,27 @@
+"""Unit tests for model version tracking."""
+from datetime import datetime, timezone
+
+from app.failure_modes.model_version import clear_version_cache, track_model_version
+
+
+class TestTrackModelVersion:
+    """Tests for track_model_version."""
+
+    def test_version_from_env(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_MODEL_VERSION", "gpt-4o-mini-2024-07-18")
+        clear_version_cache()
+        try:
+            record = track_model_version("gpt-4o-mini", "openai")
+            assert record["version"] == "gpt-4o-mini-2024-07-18"
+        finally:
+            monkeypatch.delenv("OPENAI_MODEL_VERSION")
+            clear_version_cache()
+
+    def test_version_falls_back_to_model_name(self):
+        assert track_model_version("llama-3", "local")["version"] == "llama-3"
+        assert track_model_version("gpt-4o", "openai", version="v2")["version"] == "v2"
+
+    def test_tracked_at_is_utc_iso(self):
+        tracked_at = track_model_version("gpt-4o", "openai")["tracked_at"]
+        parsed = datetime.strptime(tracked_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
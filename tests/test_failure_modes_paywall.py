@@ -0,0 +1,70 @@
+"""Unit tests for paywall detection."""
+import re
+
+import pytest
+
+from app.failure_modes import paywall
+from app.failure_modes.paywall import PAYWALL_INDICATORS, detect_paywall
+
+
+class TestDetectPaywall:
+    """Tests for detect_paywall."""
+
+    def test_empty_html(self):
+        assert detect_paywall("") == {"is_paywall": False, "confidence": 0.0, "indicators": []}
+
+    def test_paywall_indicators_matched_in_order(self):
+        html = '<div class="article-paywall">Subscribe now. Premium members only.</div>'
+        result = detect_paywall(html)
+        assert result["is_paywall"] is True
+        assert result["indicators"] == [
+            r"subscribe", r"paywall", r"premium", r"members only", r"class.*paywall",
+        ]
+
+    def test_url_indicators(self):
+        result = detect_paywall("<p>Open article</p>", url="https://cdn.PIANO.io/metered")
+        assert result["indicators"] == [r"piano\.io", r"metered"]
+
+    def test_matches_per_pattern_regex_search(self):
+        html = "Sign Up for pianoXio access; id=x data-paywall\nclass paywall"
+        expected = [p for p in PAYWALL_INDICATORS if re.search(p, html, re.IGNORECASE)]
+        assert detect_paywall(html)["indicators"] == expected
+
+    def test_oversized_html_truncated(self, monkeypatch):
+        monkeypatch.setattr(paywall, "MAX_HTML_CHARS", 20)
+        assert detect_paywall("<p>Free article</p>" + "subscribe premium" * 5)["indicators"] == []
+
+    def test_repeated_page_scanned_once(self, monkeypatch):
+        paywall._indicator_memo.clear()
+        calls = []
+        real_match = paywall._match_indicators
+
+        def counting_match(html, url):
+            calls.append(url)
+            return real_match(html, url)
+
+        monkeypatch.setattr(paywall, "_match_indicators", counting_match)
+        page = "<p>Subscribe for premium access</p>"
+        assert detect_paywall(page) == detect_paywall(page)
+        detect_paywall(page, url="https://example.com/metered")
+        assert calls == [None, "https://example.com/metered"]
+
+
+class TestHyperscanBackend:
+    """The Hyperscan scan must report the same indicators as the regex fallback."""
+
+    PAGES = [
+        ("<p>Open article</p>", None),
+        ('<div class="article-paywall">Subscribe now. Premium members only.</div>', None),
+        ("Sign Up for pianoXio access; id=x data-paywall\nclass paywall", None),
+        ("<p>Free to read</p>", "https://cdn.PIANO.io/metered"),
+        ("<p>Caf\u00e9 SUBSCRIBE \ud83d\ude00 premium</p>", "https://example.com/a"),
+    ]
+
+    def test_matches_regex_backend(self, monkeypatch):
+        pytest.importorskip("hyperscan")
+        if paywall._HS_DB is None:
+            pytest.skip("Hyperscan database failed to compile")
+        with_hyperscan = [paywall._match_indicators(html, url) for html, url in self.PAGES]
+        monkeypatch.setattr(paywall, "_HS_DB", None)
+        assert with_hyperscan == [paywall._match_indicators(html, url) for html, url in self.PAGES]
@@ -0,0 +1,12 @@
+"""Unit tests for checkpointer setup."""
+from app.graph.checkpoint import create_checkpointer, reset_checkpointer
+
+
+class TestCreateCheckpointer:
+    """Tests for create_checkpointer."""
+
+    def test_checkpointer_reused_until_reset(self):
+        first = create_checkpointer()
+        assert create_checkpointer() is first
+        reset_checkpointer()
+        assert create_checkpointer() is not first
@@ -0,0 +1,181 @@
+"""Unit tests for the content fetcher node."""
+import asyncio
+
+from app.graph import content_fetcher
+
+
+def _fetch_result(n):
+    return {
+        "fetched_sources": [],
+        "statistics": {
+            "successful_fetches": n, "failed_fetches": 0, "total_sources": n,
+            "free_sources": n, "paid_sources": 0, "total_content_length": 0,
+            "average_quality": 0.0, "average_priority": 0.0,
+        },
+    }
+
+
+class TestContentFetcherNode:
+    """Tests for content_fetcher_node."""
+
+    async def test_domains_fetched_concurrently(self, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def fake_discover(domain_name, max_sources):
+            return {"sources": [domain_name]}
+
+        async def fake_gather(sources, domain_name, max_sources, min_priority):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if domain_name == "Biology":
+                raise RuntimeError("fetch failed")
+            return _fetch_result(len(domain_name))
+
+        monkeypatch.setattr(content_fetcher, "get_llm_for_task", lambda *a, **kw: None)
+        monkeypatch.setattr(content_fetcher, "extract_domains_from_text", lambda text: ["Algebra", "Biology", "Chemistry"])
+        monkeypatch.setattr(content_fetcher, "discover_sources_for_domain", fake_discover)
+        monkeypatch.setattr(content_fetcher, "gather_domain_content_prioritized", fake_gather)
+        result = await content_fetcher.content_fetcher_node({"user_input": "fetch content"})
+        assert peak == 3
+        fetched = result["fetched_content"]
+        assert fetched["content_by_domain"]["Biology"]["error"] == "fetch failed"
+        assert fetched["statistics"]["total_fetched"] == len("Algebra") + len("Chemistry")
+
+    async def test_failed_domain_reported(self, monkeypatch):
+        async def fake_discover(domain_name, max_sources):
+            return {"sources": []}
+
+        async def fake_gather(sources, domain_name, max_sources, min_priority):
+            if domain_name == "Biology":
+                raise asyncio.CancelledError()
+            return _fetch_result(1)
+
+        monkeypatch.setattr(content_fetcher, "get_llm_for_task", lambda *a, **kw: None)
+        monkeypatch.setattr(content_fetcher, "extract_domains_from_text", lambda text: ["Algebra", "Biology"])
+        monkeypatch.setattr(content_fetcher, "discover_sources_for_domain", fake_discover)
+        monkeypatch.setattr(content_fetcher, "gather_domain_content_prioritized", fake_gather)
+        result = await content_fetcher.content_fetcher_node({"user_input": "fetch content"})
+        fetched = result["fetched_content"]
+        assert list(fetched["content_by_domain"]) == ["Algebra", "Biology"]
+        assert fetched["content_by_domain"]["Biology"]["error"] == "CancelledError"
+        assert fetched["statistics"]["total_fetched"] == 1
+        assert "❌ error — CancelledError" in result["final_response"]
+        assert "Domains: 2 (1 failed)" in result["final_response"]
+
+    async def test_reuses_discovered_sources(self, monkeypatch):
+        async def no_discover(domain_name, max_sources):
+            raise AssertionError("sources already discovered")
+
+        async def fake_gather(sources, domain_name, max_sources, min_priority):
+            assert sources == ["s1"]
+            return _fetch_result(1)
+
+        monkeypatch.setattr(content_fetcher, "discover_sources_for_domain", no_discover)
+        monkeypatch.setattr(content_fetcher, "gather_domain_content_prioritized", fake_gather)
+        state = {
+            "user_input": "fetch content for Algebra",
+            "discovered_sources": {"sources_by_domain": {"Algebra": {"sources": ["s1"]}}},
+        }
+        result = await content_fetcher.content_fetcher_node(state)
+        assert result["fetched_content"]["statistics"]["total_fetched"] == 1
+
+
+class TestFormatFetch:
+    """Tests for _format_fetch."""
+
+    def test_many_domains_fit_one_message(self):
+        source = {
+            "properties": {"title": "Intro " + "x" * 60},
+            "quality_score": 0.9, "cost_score": 0.0, "priority_score": 0.8,
+            "fetched_content": {"accessible": True, "content": "y" * 300},
+        }
+        result = dict(_fetch_result(5), fetched_sources=[source] * 5, recommendations=["Add more sources"])
+        domains = [f"Domain {i}" for i in range(40)]
+        all_fetched = {domain: result for domain in domains}
+        all_fetched["Domain 0"] = {"fetched_sources": [], "statistics": {}, "error": "timeout"}
+        totals = {"total_fetched": 195, "total_failed": 0, "total_free": 195}
+        out = content_fetcher._format_fetch(all_fetched, domains, totals)
+        assert len(out) <= 4096
+        assert "❌ error — timeout" in out
+        assert "more domains" in out
+        assert "Domains: 40 (1 failed)" in out
+        assert out.endswith("ingestion into the knowledge graph")
+
+
+class TestParseSimpleRequest:
+    """Tests for parse_simple_request."""
+
+    def test_short_request_parsed_with_overrides(self):
+        assert content_fetcher.parse_simple_request("fetch content for Algebra max_sources=5 min_priority: 0.3") == {
+            "domains": ["Algebra"], "max_sources": 5, "min_priority": 0.3,
+        }
+        assert content_fetcher.parse_simple_request("fetch content for Algebra")["max_sources"] == 10
+
+    def test_needs_llm(self):
+        assert content_fetcher.parse_simple_request("fetch some content please") is None
+        assert content_fetcher.parse_simple_request('fetch for Algebra {"max_sources": 3}') is None
+        assert content_fetcher.parse_simple_request("fetch content for Algebra " + "x" * 200) is None
+
+    def test_multi_domain_request_goes_to_llm(self):
+        assert content_fetcher.parse_simple_request("fetch content for Algebra and Chemistry") is None
+        assert content_fetcher.parse_simple_request("fetch content for Algebra, Biology and Chemistry") is None
+        assert content_fetcher.parse_simple_request("fetch content for Linear Algebra.")["domains"] == ["Linear Algebra"]
+
+    async def test_node_skips_llm(self, monkeypatch):
+        def no_llm(*args, **kwargs):
+            raise AssertionError("LLM should not be requested")
+
+        async def fake_discover(domain_name, max_sources):
+            return {"sources": []}
+
+        async def fake_gather(sources, domain_name, max_sources, min_priority):
+            assert max_sources == 3
+            return _fetch_result(0)
+
+        monkeypatch.setattr(content_fetcher, "get_llm_for_task", no_llm)
+        monkeypatch.setattr(content_fetcher, "discover_sources_for_domain", fake_discover)
+        monkeypatch.setattr(content_fetcher, "gather_domain_content_prioritized", fake_gather)
+        result = await content_fetcher.content_fetcher_node({"user_input": "fetch content for Algebra max_sources=3"})
+        assert result["fetched_content"]["domains"] == ["Algebra"]
+
+
+class TestLlmFetchParams:
+    """Tests for _llm_fetch_params."""
+
+    class _FakeLLM:
+        def __init__(self, reply):
+            self.reply = reply
+            self.prompts = []
+
+        async def ainvoke(self, prompt):
+            self.prompts.append(prompt)
+            return self.reply
+
+    async def test_parses_and_validates_reply(self):
+        llm = self._FakeLLM('Here you go: {"domains": ["Algebra"], "max_sources": 500}')
+        params = await content_fetcher._llm_fetch_params(llm, "please get me algebra material")
+        assert params["domains"] == ["Algebra"]
+        assert params["max_sources"] < 500
+        assert "please get me algebra material" in llm.prompts[0]
+
+    async def test_fallbacks(self):
+        assert await content_fetcher._llm_fetch_params(self._FakeLLM("no json"), "x") is None
+        invalid = await content_fetcher._llm_fetch_params(self._FakeLLM('{"domains": "Algebra"}'), "x")
+        assert invalid == {"domains": [], "max_sources": 10, "min_priority": 0.0}
+
+
+class TestExtractDomainsFromText:
+    """Tests for extract_domains_from_text."""
+
+    def test_multiword_domains(self):
+        assert content_fetcher.extract_domains_from_text("fetch content for Algebra") == ["Algebra"]
+        assert content_fetcher.extract_domains_from_text("lesson on Quantum Field Theory, please") == ["Quantum Field Theory"]
+        assert content_fetcher.extract_domains_from_text("for Linear Algebra and Biology") == ["Linear Algebra"]
+
+    def test_keyword_must_be_whole_word(self):
+        assert content_fetcher.extract_domains_from_text("Python Lessons") == []
+        assert content_fetcher.extract_domains_from_text("Lesson Plans") == []
@@ -0,0 +1,77 @@
+"""Unit tests for autonomous KG expansion."""
+import asyncio
+
+from app.graph import expansion
+
+
+class TestRunExpansionCycle:
+    """Tests for run_expansion_cycle."""
+
+    async def test_domains_discovered_concurrently_in_order(self, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def fake_discover(domain_name, max_sources, min_quality):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if domain_name == "Biology":
+                raise RuntimeError("search down")
+            free = {"cost_score": 0.0} if domain_name == "Chemistry" else {}
+            return {"sources": [{"properties": {"identifiers": {"doi": domain_name}}, **free}, {}], "statistics": {}}
+
+        monkeypatch.setattr(expansion, "get_domains_to_expand", lambda max_domains: ["Algebra", "Biology", "Chemistry"])
+        monkeypatch.setattr(expansion, "discover_sources_for_domain", fake_discover)
+        result = await expansion.run_expansion_cycle(max_domains=3, max_sources_per_domain=2)
+        assert peak == 3
+        assert list(result["by_domain"]) == ["Algebra", "Biology", "Chemistry"]
+        assert result["by_domain"]["Biology"]["error"] == "search down"
+        assert result["total_sources"] == 4
+        assert result["with_primary_ids"] == 2
+        assert (result["free_sources"], result["paid_sources"]) == (1, 3)
+        assert "• Algebra: 2 sources\n• Biology: error — search down\n• Chemistry: 2 sources\n" in result["update_message"]
+
+    async def test_cancelled_domain_reported_as_error(self, monkeypatch):
+        async def fake_discover(domain_name, max_sources, min_quality):
+            if domain_name == "Biology":
+                raise asyncio.CancelledError()
+            return {"sources": [{}], "statistics": {}}
+
+        monkeypatch.setattr(expansion, "get_domains_to_expand", lambda max_domains: ["Algebra", "Biology"])
+        monkeypatch.setattr(expansion, "discover_sources_for_domain", fake_discover)
+        result = await expansion.run_expansion_cycle(max_domains=2, max_sources_per_domain=1)
+        assert result["by_domain"]["Biology"]["error"] == "CancelledError"
+        assert result["total_sources"] == 1
+
+
+class TestExpansionNode:
+    """Tests for expansion_node."""
+
+    async def test_working_notes_merged(self, monkeypatch):
+        async def fake_cycle():
+            return {
+                "domains_explored": ["Algebra"], "total_sources": 3, "with_primary_ids": 1,
+                "by_domain_totals": {"Algebra": 3}, "update_message": "done",
+            }
+
+        monkeypatch.setattr(expansion, "run_expansion_cycle", fake_cycle)
+        result = await expansion.expansion_node({"chat_id": "1", "working_notes": {"keep": True}})
+        notes = result["working_notes"]
+        assert notes["keep"] is True
+        assert notes["expansion_result"]["by_domain"] == {"Algebra": {"total": 3}}
+        result = await expansion.expansion_node({"chat_id": "1"})
+        assert list(result["working_notes"]) == ["expansion_result"]
+
+
+class TestGetDomainsToExpand:
+    """Tests for get_domains_to_expand."""
+
+    def test_round_robin_across_categories(self, monkeypatch):
+        monkeypatch.delenv("EXPANSION_DOMAINS", raising=False)
+        names = expansion._taxonomy_domain_names()
+        assert expansion._taxonomy_domain_names() is names
+        domains = expansion.get_domains_to_expand(max_domains=len(names) + 1)
+        assert domains[:len(names)] == [cat[0] for cat in names]
+        assert domains[-1] == next(cat[1] for cat in names if len(cat) > 1)
@@ -0,0 +1,33 @@
+"""Unit tests for worker response formatting."""
+from app.graph.formatting import ResponseBuilder
+
+
+class TestResponseBuilder:
+    """Tests for ResponseBuilder."""
+
+    def test_rows_summarized_past_budget(self):
+        out = ResponseBuilder(budget=30)
+        out.add("Header")
+        out.add_rows(["aaaa", "bbbb", "cccc", "dddd"], lambda i, item: [f"{i}. {item}"])
+        out.add("Footer line that is always kept")
+        assert out.build().split("\n") == [
+            "Header", "1. aaaa", "2. bbbb", "   … 2 more", "Footer line that is always kept",
+        ]
+
+    def test_rows_rendered_only_while_they_fit(self):
+        rendered = []
+
+        def render(i, item):
+            rendered.append(item)
+            return [item * 10]
+
+        out = ResponseBuilder(budget=25)
+        out.add_rows(["a", "b", "c", "d"], render, indent="")
+        assert out.build() == "aaaaaaaaaa\nbbbbbbbbbb\n… 2 more"
+        assert rendered == ["a", "b", "c"]
+
+    def test_block_added_only_if_it_fits(self):
+        out = ResponseBuilder(budget=20)
+        assert out.add_block(["aaaa", "bbbb"])
+        assert not out.add_block(["cccc", "dddddddd"])
+        assert out.build() == "aaaa\nbbbb"
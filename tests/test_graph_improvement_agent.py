@@ -0,0 +1,246 @@
+"""Unit tests for the improvement agent node."""
+import asyncio
+import json
+import subprocess
+
+import pytest
+
+from app.cost.cache import CacheType, get_cache
+from app.graph import improvement_agent
+from app.llm.request_cache import get_plan_cache
+
+
+class _FakeLLM:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def ainvoke(self, prompt, **kwargs):
+        self.calls.append(prompt)
+        self.kwargs = kwargs
+        return self.replies.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def _clear_plan_cache():
+    get_plan_cache().clear()
+    get_cache().invalidate(CacheType.CODE_CHANGE)
+    yield
+    get_plan_cache().clear()
+    get_cache().invalidate(CacheType.CODE_CHANGE)
+
+
+class TestImprovementAgentNode:
+    """Tests for improvement_agent_node."""
+
+    async def test_repeated_request_reuses_plan(self, monkeypatch):
+        plan = {"understanding": "Tidy logging", "files_to_modify": ["app/x.py"], "plan": ["edit"]}
+        llm = _FakeLLM([json.dumps(plan)])
+
+        async def fake_generate(llm, file_path, current_content, user_input, plan):
+            return "x = 1\n"
+
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: llm)
+        monkeypatch.setattr(improvement_agent, "_generate_change", fake_generate)
+        first = await improvement_agent.improvement_agent_node({"user_input": "Tidy up the logging in expansion"})
+        second = await improvement_agent.improvement_agent_node({"user_input": "tidy up the logging in expansion."})
+        assert len(llm.calls) == 1
+        assert "Tidy logging" in first["final_response"]
+        assert second["final_response"] == first["final_response"]
+
+    async def test_plan_without_changes_not_cached(self, monkeypatch):
+        plan = {"understanding": "Nothing to change", "files_to_modify": [], "plan": []}
+        llm = _FakeLLM([json.dumps(plan), json.dumps(plan)])
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: llm)
+        await improvement_agent.improvement_agent_node({"user_input": "Tidy up the logging in expansion"})
+        await improvement_agent.improvement_agent_node({"user_input": "Tidy up the logging in expansion"})
+        assert len(llm.calls) == 2
+
+    async def test_different_target_file_gets_its_own_plan(self, monkeypatch):
+        request = "Add structured logging with request ids and timing around every outbound call in {}"
+        plans = [
+            {"understanding": "a", "files_to_modify": ["app/kg/api_clients.py"], "plan": ["edit"]},
+            {"understanding": "b", "files_to_modify": ["app/kg/source_fetcher.py"], "plan": ["edit"]},
+        ]
+        llm = _FakeLLM([json.dumps(p) for p in plans])
+
+        async def fake_generate(llm, file_path, current_content, user_input, plan):
+            return "pass\n"
+
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: llm)
+        monkeypatch.setattr(improvement_agent, "_generate_change", fake_generate)
+        await improvement_agent.improvement_agent_node({"user_input": request.format("app/kg/api_clients.py")})
+        second = await improvement_agent.improvement_agent_node({"user_input": request.format("app/kg/source_fetcher.py")})
+        assert len(llm.calls) == 2
+        assert list(second["proposed_changes"]) == ["app/kg/source_fetcher.py"]
+
+    async def test_files_generated_concurrently_in_order(self, monkeypatch):
+        files = ["app/a.py", "app/b.py", "app/c.py"]
+        plan = {"understanding": "Touch files", "files_to_modify": files, "plan": ["edit"], "risk_level": "low"}
+        in_flight = 0
+        peak = 0
+
+        async def fake_generate(llm, file_path, current_content, user_input, plan):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"# {file_path}"
+
+        monkeypatch.setenv("IMPROVE_LLM_CONCURRENCY", "2")
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: _FakeLLM([json.dumps(plan)]))
+        monkeypatch.setattr(improvement_agent, "_generate_change", fake_generate)
+        result = await improvement_agent.improvement_agent_node({"user_input": "touch three files"})
+        assert peak == 2
+        assert list(result["proposed_changes"].items()) == [(f, f"# {f}") for f in files]
+
+    async def test_plan_parsed_from_reply_with_leading_braces(self, monkeypatch):
+        plan = {"understanding": "Nothing to change", "files_to_modify": [], "plan": []}
+        llm = _FakeLLM([f"Use {{placeholders}} sparingly.\n{json.dumps(plan)}\nDone {{}}"])
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: llm)
+        result = await improvement_agent.improvement_agent_node({"user_input": "check placeholders"})
+        assert "Nothing to change" in result["final_response"]
+        assert llm.kwargs == {}
+
+    async def test_malformed_plan_not_replaced_by_nested_object(self, monkeypatch):
+        llm = _FakeLLM(['{"understanding": "x", "meta": {"k": 1}, "files_to_modify": ["a.py"],}'])
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: llm)
+        result = await improvement_agent.improvement_agent_node({"user_input": "edit a"})
+        assert result["error"] == "Failed to parse improvement plan from LLM"
+
+    def test_openai_uses_json_mode(self):
+        class ChatOpenAI(_FakeLLM):
+            pass
+
+        assert improvement_agent._json_mode_kwargs(ChatOpenAI([])) == {"response_format": {"type": "json_object"}}
+
+    async def test_files_read_once_for_context(self, monkeypatch, tmp_path):
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "a.py").write_text("a = 1\n", encoding="utf-8")
+        plan = {"understanding": "Edit a", "files_to_read": ["app/a.py", "app/missing.py"], "files_to_modify": ["app/a.py"], "plan": ["edit"]}
+        seen = {}
+        reads = []
+        real_read_file = improvement_agent._read_file
+
+        def counting_read_file(file_path):
+            reads.append(file_path)
+            return real_read_file(file_path)
+
+        async def fake_generate(llm, file_path, current_content, user_input, plan):
+            seen[file_path] = current_content
+            return "a = 2\n"
+
+        monkeypatch.setattr(improvement_agent, "PROJECT_ROOT", tmp_path)
+        monkeypatch.setattr(improvement_agent, "_read_file", counting_read_file)
+        monkeypatch.setattr(improvement_agent, "get_llm_for_agent", lambda state, agent_name: _FakeLLM([json.dumps(plan)]))
+        monkeypatch.setattr(improvement_agent, "_generate_change", fake_generate)
+        await improvement_agent.improvement_agent_node({"user_input": "edit a"})
+        assert sorted(reads) == ["app/a.py", "app/missing.py"]
+        assert seen == {"app/a.py": "a = 1\n"}
+
+
+class TestGenerateChange:
+    """Tests for _generate_change."""
+
+    async def test_change_cached_by_content(self):
+        plan = {"files_to_modify": ["app/x.py"]}
+        llm = _FakeLLM(["```python\nx = 2\n```", "```\nx = 3\n```"])
+        first = await improvement_agent._generate_change(llm, "app/x.py", "x = 1", "bump x", plan)
+        again = await improvement_agent._generate_change(llm, "app/x.py", "x = 1", "bump x", plan)
+        edited = await improvement_agent._generate_change(llm, "app/x.py", "x = 1  # edited", "bump x", plan)
+        assert (first, again, edited) == ("x = 2", "x = 2", "x = 3")
+        assert len(llm.calls) == 2
+
+
+class TestPromptMessages:
+    """Tests for _prompt_messages."""
+
+    def test_static_system_prefix_dynamic_request(self):
+        messages = improvement_agent._prompt_messages(_FakeLLM([]), improvement_agent.ANALYSIS_SYSTEM_PROMPT, "User Request: a")
+        other = improvement_agent._prompt_messages(_FakeLLM([]), improvement_agent.ANALYSIS_SYSTEM_PROMPT, "User Request: b")
+        assert messages[0].content == other[0].content == improvement_agent.ANALYSIS_SYSTEM_PROMPT
+        assert messages[1].content == "User Request: a"
+
+    def test_anthropic_system_block_marked_cacheable(self):
+        class ChatAnthropic(_FakeLLM):
+            pass
+
+        messages = improvement_agent._prompt_messages(ChatAnthropic([]), improvement_agent.CHANGE_SYSTEM_PROMPT, "req")
+        block = messages[0].content[0]
+        assert block["text"] == improvement_agent.CHANGE_SYSTEM_PROMPT
+        assert block["cache_control"] == {"type": "ephemeral"}
+
+
+class TestSearchReplace:
+    """Tests for SEARCH/REPLACE parsing and application."""
+
+    REPLY = (
+        "Here you go:\n"
+        "<<<<<<< SEARCH\n"
+        "def f():\n"
+        "    return 1\n"
+        "=======\n"
+        "def f():\n"
+        "    return 2\n"
+        ">>>>>>> REPLACE\n"
+    )
+
+    def test_parse_blocks(self):
+        blocks = improvement_agent._parse_search_replace_blocks(self.REPLY)
+        assert blocks == [("def f():\n    return 1", "def f():\n    return 2")]
+
+    def test_apply_exact_and_fuzzy(self):
+        content = "import os\n\ndef f():\n    return 1\n"
+        blocks = improvement_agent._parse_search_replace_blocks(self.REPLY)
+        assert improvement_agent._apply_search_replace(content, blocks, "f.py") == "import os\n\ndef f():\n    return 2\n"
+        drifted = [("def f():\n    return  1", "def f():\n    return 2")]
+        assert improvement_agent._apply_search_replace(content, drifted, "f.py") == "import os\n\ndef f():\n    return 2\n"
+
+    def test_apply_missing_search_raises(self):
+        with pytest.raises(ValueError):
+            improvement_agent._apply_search_replace("x = 1\n", [("class Unrelated:\n    pass", "")], "x.py")
+
+    def test_empty_search_creates_file(self):
+        assert improvement_agent._apply_search_replace("", [("", "x = 1")], "new.py") == "x = 1"
+
+    async def test_generate_change_applies_blocks(self):
+        llm = _FakeLLM([self.REPLY])
+        change = await improvement_agent._generate_change(llm, "app/f.py", "def f():\n    return 1\n", "return 2", {})
+        assert change == "def f():\n    return 2\n"
+
+    def test_diff_summary_shows_changed_lines(self):
+        summary = improvement_agent.create_diff_summary(
+            {"app/f.py": "a\nb\nc"}, {"app/f.py": "a\nB\nc"}, {"understanding": "u"}
+        )
+        assert "Lines: 3 → 3" in summary
+        assert "Changes: 1 block(s)" in summary
+        assert "    - b\n    + B" in summary
+
+
+class TestMakeDiffId:
+    """Tests for make_diff_id."""
+
+    def test_stable_and_content_addressed(self):
+        first = improvement_agent.make_diff_id("bump x", {"app/x.py": "x = 2"})
+        assert first == improvement_agent.make_diff_id("bump x", {"app/x.py": "x = 2"})
+        assert first != improvement_agent.make_diff_id("bump x", {"app/x.py": "x = 3"})
+        assert first.startswith("improve_") and len(first) == len("improve_") + 16
+
+
+class TestPushChangesNode:
+    """Tests for push_changes_node."""
+
+    async def test_push_failure_reports_decoded_stderr(self, monkeypatch):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(kwargs)
+            if cmd[:2] == ["git", "push"]:
+                raise subprocess.CalledProcessError(128, cmd, stderr=b"fatal: could not read Username" + b"x" * 10_000)
+            return subprocess.CompletedProcess(cmd, 0, stdout=b"", stderr=b"")
+
+        monkeypatch.setattr(improvement_agent.subprocess, "run", fake_run)
+        result = await improvement_agent.push_changes_node({})
+        assert result["error"].startswith("Push failed: fatal: could not read Username")
+        assert all(kw["env"]["GIT_TERMINAL_PROMPT"] == "0" and "text" not in kw for kw in calls)
@@ -0,0 +1,81 @@
+"""Unit tests for parallel agent execution."""
+import asyncio
+
+import pytest
+
+from app.cost.budget import BudgetExceededError
+from app.graph import domain_scout_worker, parallel_agents, source_gatherer
+
+
+class TestParallelAgentsNode:
+    """Tests for parallel_agents_node."""
+
+    async def test_single_status_message_per_run(self, monkeypatch):
+        sent = []
+
+        async def fake_send_message(chat_id, text, **kwargs):
+            sent.append(text)
+
+        async def fake_gatherer(state):
+            return {"final_response": "gathered"}
+
+        async def fake_scout(state):
+            raise RuntimeError("scout down")
+
+        monkeypatch.setattr(parallel_agents, "send_message", fake_send_message)
+        monkeypatch.setattr(parallel_agents, "source_gatherer_node", fake_gatherer)
+        monkeypatch.setattr(parallel_agents, "domain_scout_node", fake_scout)
+        result = await parallel_agents.parallel_agents_node({"user_input": "run agents for Biology", "chat_id": "42"})
+        assert len(sent) == 1
+        assert (result["source_status"], result["scout_status"]) == ("completed", "error")
+        assert "gathered" in result["final_response"]
+        assert "scout down" in result["final_response"]
+
+    async def test_domain_taken_after_whole_word_for(self, monkeypatch):
+        async def fake_node(state):
+            return {"final_response": "ok"}
+
+        monkeypatch.setattr(parallel_agents, "source_gatherer_node", fake_node)
+        monkeypatch.setattr(parallel_agents, "domain_scout_node", fake_node)
+        result = await parallel_agents.parallel_agents_node({"user_input": "Run agents FOR Organic Chemistry"})
+        assert result["test_domain"] == "Organic Chemistry"
+        monkeypatch.setattr(parallel_agents, "get_random_domain", lambda: "Biology")
+        result = await parallel_agents.parallel_agents_node({"user_input": "perform the usual run"})
+        assert result["test_domain"] == "Biology"
+
+    async def test_budget_error_cancels_sibling(self, monkeypatch):
+        scout_cancelled = asyncio.Event()
+
+        class _OverBudgetLLM:
+            async def ainvoke(self, prompt, **kwargs):
+                raise BudgetExceededError("daily cap reached")
+
+        async def slow_scout(state):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                scout_cancelled.set()
+                raise
+
+        # Real source gatherer node: its LLM call hits the budget cap
+        monkeypatch.setattr(source_gatherer, "get_llm_for_task", lambda *args, **kwargs: _OverBudgetLLM())
+        monkeypatch.setattr(parallel_agents, "domain_scout_node", slow_scout)
+        result = await asyncio.wait_for(
+            parallel_agents.parallel_agents_node({"user_input": "run for Biology"}), timeout=5
+        )
+        assert scout_cancelled.is_set()
+        assert (result["source_status"], result["scout_status"]) == ("error", "cancelled")
+        assert "daily cap reached" in result["final_response"]
+
+
+class TestDomainScoutBudget:
+    """Budget errors must escape the domain scout node rather than fall back to defaults."""
+
+    async def test_budget_error_propagates(self, monkeypatch):
+        class _OverBudgetLLM:
+            async def ainvoke(self, prompt, **kwargs):
+                raise BudgetExceededError("daily cap reached")
+
+        monkeypatch.setattr(domain_scout_worker, "get_llm_for_task", lambda *args, **kwargs: _OverBudgetLLM())
+        with pytest.raises(BudgetExceededError):
+            await domain_scout_worker.domain_scout_node({"user_input": "find new domains in robotics"})
@@ -0,0 +1,27 @@
+"""Unit tests for the shared HTTP session."""
+import asyncio
+
+from app.kg.http_session import close_session, get_session, shared_session
+
+
+class TestSharedSession:
+    """Tests for get_session / shared_session."""
+
+    async def test_session_reused_until_closed(self):
+        first = await get_session()
+        async with shared_session() as session:
+            assert session is first
+        assert not first.closed
+        await close_session()
+        assert first.closed
+        second = await get_session()
+        assert second is not first
+        await close_session()
+
+    def test_one_session_per_event_loop(self):
+        async def open_and_close():
+            session = await get_session()
+            await close_session()
+            return session
+
+        assert asyncio.run(open_and_close()) is not asyncio.run(open_and_close())
@@ -0,0 +1,51 @@
+"""Unit tests for source content fetching."""
+import pytest
+
+from app.cost.cache import CacheType, get_cache
+from app.kg import source_fetcher
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    """Replace the network fetch with one that records the URLs it is asked for."""
+    calls = []
+
+    async def fetch(url, max_length):
+        calls.append(url)
+        if not url or "paywalled" in url:
+            return {"content": None, "metadata": {"error": "Paywall detected", "url": url}, "accessible": False}
+        return {"content": f"text of {url}", "metadata": {"url": url}, "accessible": True}
+
+    get_cache().invalidate(CacheType.FETCHED_DOC)
+    monkeypatch.setattr(source_fetcher, "_fetch_source_content", fetch)
+    yield calls
+    get_cache().invalidate(CacheType.FETCHED_DOC)
+
+
+def _source(url):
+    return {"id": f"SRC:{url}", "label": "Source", "properties": {"url": url}}
+
+
+class TestFetchSourceContent:
+    """Tests for fetch_source_content caching."""
+
+    async def test_different_sources_get_their_own_content(self, fake_fetch):
+        first = await source_fetcher.fetch_source_content(_source("https://a.example/1"))
+        second = await source_fetcher.fetch_source_content(_source("https://b.example/2"))
+        assert first["content"] == "text of https://a.example/1"
+        assert second["content"] == "text of https://b.example/2"
+
+        again = await source_fetcher.fetch_source_content(_source("https://a.example/1"))
+        assert again is first
+        assert fake_fetch == ["https://a.example/1", "https://b.example/2"]
+
+    async def test_inaccessible_result_not_cached(self, fake_fetch):
+        url = "https://paywalled.example/x"
+        await source_fetcher.fetch_source_content(_source(url))
+        await source_fetcher.fetch_source_content(_source(url))
+        assert fake_fetch == [url, url]
+
+    async def test_missing_url_not_cached(self, fake_fetch):
+        result = await source_fetcher.fetch_source_content({"properties": {}})
+        assert result["accessible"] is False
+        assert get_cache().get(CacheType.FETCHED_DOC, None, 10000) is None
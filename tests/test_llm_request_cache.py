@@ -0,0 +1,50 @@
+"""Unit tests for the LLM request cache."""
+from app.llm.request_cache import RequestCache, normalize_request
+
+
+class TestRequestCache:
+    """Tests for RequestCache."""
+
+    def test_hit_after_normalization_within_context(self):
+        cache = RequestCache()
+        cache.set("Add retry logic to the telegram send_message helper", {"plan": ["a"]}, context="ctx")
+        assert cache.get("  add retry logic to the Telegram send_message helper!", context="ctx") == {"plan": ["a"]}
+        assert cache.get("add retry logic to the telegram send_message helper", context="other") is None
+        assert cache.get("Rewrite the progress dashboard in React", context="ctx") is None
+
+    def test_different_target_file_misses(self):
+        cache = RequestCache()
+        request = "Add structured logging with request ids and timing around every outbound call in {}"
+        cache.set(request.format("app/kg/api_clients.py"), {"files_to_modify": ["app/kg/api_clients.py"]})
+        assert cache.get(request.format("app/kg/source_fetcher.py")) is None
+
+    def test_word_order_matters(self):
+        cache = RequestCache()
+        cache.set("Move the retry helper from app/retry.py into app/kg/source_fetcher.py", 1)
+        assert cache.get("Move the retry helper from app/kg/source_fetcher.py into app/retry.py") is None
+        cache.set("log the domain name but do not log the api key", 2)
+        assert cache.get("log the api key but do not log the domain name") is None
+
+    def test_normalize_request(self):
+        assert normalize_request("  Fix   THE bug,\nplease! ") == "fix the bug please"
+
+    def test_values_copied(self):
+        cache = RequestCache()
+        plan = {"files": ["a.py"]}
+        cache.set("request", plan)
+        plan["files"].append("b.py")
+        hit = cache.get("request")
+        hit["files"].append("c.py")
+        assert cache.get("request") == {"files": ["a.py"]}
+
+    def test_lru_eviction_and_ttl(self):
+        cache = RequestCache(max_entries=2)
+        cache.set("alpha one", 1)
+        cache.set("beta two", 2)
+        assert cache.get("alpha one") == 1
+        cache.set("gamma three", 3)
+        assert cache.get("beta two") is None
+        assert cache.get("alpha one") == 1
+        expired = RequestCache(ttl_seconds=-1)
+        expired.set("alpha one", 1)
+        assert expired.get("alpha one") is None
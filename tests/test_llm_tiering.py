@@ -0,0 +1,47 @@
+"""Unit tests for task-tiered LLM selection."""
+import pytest
+
+from app.circuit_breaker import CircuitBreakerRegistry, check_domain_allowed
+from app.cost.budget import BudgetExceededError
+from app.llm import tracked_client
+from app.llm.tiering import get_llm_for_task
+from app.llm.tracked_client import TrackedLLM
+
+
+@pytest.fixture
+def openai_key(monkeypatch):
+    for key in ("MOONSHOT_API_KEY", "KIMI_API_KEY", "ANTHROPIC_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+
+class TestGetLlmForTask:
+    """Tests for get_llm_for_task."""
+
+    def test_untracked_by_default(self, openai_key):
+        llm = get_llm_for_task("classification", domain="Biology", queue="q", agent="content_fetcher")
+        assert type(llm).__name__ == "ChatOpenAI"
+
+    def test_tracked_on_request(self, openai_key):
+        llm = get_llm_for_task("source_filtering", domain="Biology", queue="q", agent="source_gatherer", tracked=True)
+        assert isinstance(llm, TrackedLLM)
+        assert type(llm._llm).__name__ == "ChatOpenAI"
+
+    async def test_budget_breach_raises_and_pauses_domain(self, openai_key, monkeypatch):
+        class _NoEnvelopes:
+            def enforce_all_caps(self, **kwargs):
+                pass
+
+        class _CapReached:
+            def enforce_budget(self, **kwargs):
+                raise BudgetExceededError("daily cap reached")
+
+        monkeypatch.setattr(tracked_client, "get_envelope_manager", _NoEnvelopes)
+        monkeypatch.setattr(tracked_client, "get_budget_manager", _CapReached)
+        llm = get_llm_for_task("source_filtering", domain="Tiering Test", queue="q", agent="source_gatherer", tracked=True)
+        try:
+            with pytest.raises(BudgetExceededError):
+                await llm.ainvoke("filter these sources")
+            assert not check_domain_allowed("Tiering Test")
+        finally:
+            CircuitBreakerRegistry.resume_domain("Tiering Test")
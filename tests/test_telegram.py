@@ -0,0 +1,24 @@
+"""Unit tests for the Telegram Bot API helpers."""
+import httpx
+
+from app import telegram
+
+
+class TestSendMessage:
+    """Tests for send_message connection reuse."""
+
+    async def test_calls_share_one_client(self, monkeypatch):
+        clients = []
+
+        async def fake_post(self, url, **kwargs):
+            clients.append(self)
+            return httpx.Response(200, json={"ok": True}, request=httpx.Request("POST", url))
+
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123:abc")
+        monkeypatch.setattr(httpx.AsyncClient, "post", fake_post)
+        await telegram.send_message(1, "first")
+        await telegram.send_message(1, "second")
+        assert clients[0] is clients[1]
+        assert not clients[0].is_closed
+        await telegram.close_client()
+        assert clients[0].is_closed
@@ -3,6 +3,7 @@ import os
 import pytest
 from app.validation.agent_outputs import (
     ValidationError,
+    extract_json_object,
     validate_extractor_output,
     validate_source_gatherer_output,
     validate_content_fetcher_parsed,
@@ -119,6 +120,18 @@ class TestValidateContentFetcherParsed:
         assert out["min_priority"] == 1.0
 
 
+class TestExtractJsonObject:
+    """Tests for extract_json_object."""
+
+    def test_first_balanced_object_with_braces_in_strings(self):
+        text = 'Sure! {"a": "x}\\"{", "b": {"c": 1}} and a stray } after'
+        assert extract_json_object(text) == '{"a": "x}\\"{", "b": {"c": 1}}'
+
+    def test_no_object(self):
+        assert extract_json_object("no json here") is None
+        assert extract_json_object('{"unterminated": {') is None
+
+
 class TestValidateLinkerOutput:
     """Tests for validate_linker_output."""
 